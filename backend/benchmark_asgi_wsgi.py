@@ -0,0 +1,202 @@
+"""
+Load test comparing the sync WSGI and async ASGI deployments.
+
+Starts the project under gunicorn (WSGI, threaded workers) and uvicorn
+(ASGI, which turns on the async API views) on local ports, then sends the
+same requests to each at a fixed concurrency. The default endpoints are
+the carrier list, one carrier's job list, a job detail and the job list
+with facets; ranked search is added with --search when the database is
+PostgreSQL. Requests/second, latency percentiles and errors are reported
+per endpoint.
+
+Both servers use the database of the current settings. The job detail
+and per-carrier list use ids read from the carrier list and job list
+before the run.
+
+To test servers you already run (e.g. on another host or with other
+worker settings), pass --wsgi-url and/or --asgi-url; only the servers
+without a URL are started here. Starting servers needs gunicorn and
+uvicorn installed.
+
+Usage:
+    python benchmark_asgi_wsgi.py
+    python benchmark_asgi_wsgi.py --requests 2000 --concurrency 100
+    python benchmark_asgi_wsgi.py --workers 2 --threads 8 --search truck
+    python benchmark_asgi_wsgi.py --paths /api/carriers/ "/api/jobs/?facets=1&hiring_status=open"
+    python benchmark_asgi_wsgi.py --wsgi-url http://127.0.0.1:8000 --asgi-url http://127.0.0.1:8001
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+import requests
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+STARTUP_TIMEOUT = 30
+
+
+def server_command(kind, port, workers, threads):
+    """Command line that serves the project on port, or None if the server isn't installed"""
+    if kind == 'wsgi':
+        if not shutil.which('gunicorn'):
+            return None
+        return [
+            'gunicorn', 'jobstream_backend.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+            '--worker-class', 'gthread', '--threads', str(threads),
+            '--log-level', 'warning',
+        ]
+    if not shutil.which('uvicorn'):
+        return None
+    return [
+        'uvicorn', 'jobstream_backend.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+        '--log-level', 'warning', '--no-access-log',
+    ]
+
+
+def start_server(command, url, async_views):
+    """Start a server and wait until it answers; returns the process"""
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [base_dir, os.environ.get('PYTHONPATH')])),
+        # The WSGI server must not pick up the async views
+        ASYNC_API_VIEWS='1' if async_views else '',
+    )
+    process = subprocess.Popen(command, cwd=base_dir, env=env)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{command[0]} exited with code {process.returncode}')
+        try:
+            requests.get(f'{url}/api/carriers/', timeout=2)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.3)
+    process.terminate()
+    raise RuntimeError(f'{command[0]} did not start within {STARTUP_TIMEOUT}s')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def endpoints(url, search, paths=None):
+    """(label, path) pairs to load; ids come from the running server"""
+    if paths:
+        return [(path, path) for path in paths]
+    carriers = requests.get(f'{url}/api/carriers/', timeout=60).json()
+    carrier = max(carriers, key=lambda c: c['active_jobs_count'], default=None)
+    paths = [('Carrier list', '/api/carriers/')]
+    if carrier:
+        paths.append((f"Jobs of {carrier['name'][:20]}", f"/api/jobs/?carrier={carrier['id']}"))
+        jobs = requests.get(f"{url}/api/jobs/?carrier={carrier['id']}", timeout=60).json()
+        if jobs:
+            paths.append(('Job detail', f"/api/jobs/{jobs[0]['id']}/"))
+    paths.append(('Job list + facets', '/api/jobs/?facets=1'))
+    if search:
+        paths.append((f'Search "{search}"', f'/api/jobs/search/?q={quote(search)}'))
+    return paths
+
+
+def run_load(url, path, total, concurrency):
+    """
+    Send `total` GETs for path with `concurrency` requests in flight.
+
+    Returns:
+        dict: {'rps', 'p50', 'p95', 'p99' (ms), 'errors'}
+    """
+    local = threading.local()
+    full_url = url + path
+
+    def fetch(_):
+        # One keep-alive connection per client thread
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = local.session.get(full_url, timeout=120)
+            response.content
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Warm up connections and caches
+        list(pool.map(fetch, range(concurrency)))
+        start = time.perf_counter()
+        results = list(pool.map(fetch, range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds * 1000 for seconds, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    if len(latencies) < 2:
+        return {'rps': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'errors': errors}
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': quantiles[49],
+        'p95': quantiles[94],
+        'p99': quantiles[98],
+        'errors': errors,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI throughput under concurrent load')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and server')
+    parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes per server')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker')
+    parser.add_argument('--search', help='Also load ranked search with this query (PostgreSQL only)')
+    parser.add_argument('--paths', nargs='+', help='Load these paths instead of the default endpoints')
+    parser.add_argument('--wsgi-url', help='Use a running WSGI server instead of starting gunicorn')
+    parser.add_argument('--asgi-url', help='Use a running ASGI server instead of starting uvicorn')
+    parser.add_argument('--port', type=int, default=8601, help='First port for started servers')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobstream_backend.settings')
+
+    servers = []
+    for offset, (kind, given) in enumerate((('wsgi', args.wsgi_url), ('asgi', args.asgi_url))):
+        url = given.rstrip('/') if given else f'http://127.0.0.1:{args.port + offset}'
+        command = None
+        if not given:
+            command = server_command(kind, args.port + offset, args.workers, args.threads)
+            if command is None:
+                server = 'gunicorn' if kind == 'wsgi' else 'uvicorn'
+                sys.exit(f'{server} is not installed; install it or pass --{kind}-url')
+        servers.append((kind.upper(), url, command))
+
+    print(f"{args.requests} requests per endpoint, {args.concurrency} concurrent")
+    results = {}
+    for label, url, command in servers:
+        process = start_server(command, url, label == 'ASGI') if command else None
+        try:
+            for name, path in endpoints(url, args.search, args.paths):
+                results.setdefault(name, {})[label] = run_load(url, path, args.requests, args.concurrency)
+        finally:
+            if process:
+                stop_server(process)
+
+    print(f"\n{'='*60}")
+    for name, by_server in results.items():
+        print(f"  {name}")
+        for label, r in by_server.items():
+            print(
+                f"    {label}  {r['rps']:8.1f} req/s   p50 {r['p50']:7.1f}ms   "
+                f"p95 {r['p95']:7.1f}ms   p99 {r['p99']:7.1f}ms   errors {r['errors']}"
+            )
+    print(f"{'='*60}")
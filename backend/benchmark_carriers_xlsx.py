@@ -0,0 +1,154 @@
+"""
+Benchmark for the import_carriers_xlsx command.
+
+Generates a carrier workbook (10,000 rows by default) with whole-cell bold
+and bold rich-text runs, then imports it in streaming and full-load mode.
+Each import runs inside a transaction that is rolled back, so the database
+is left untouched.
+
+openpyxl writes strings inline, but read-only mode only keeps rich-text runs
+for shared strings, so the saved workbook is rewritten with a shared string
+table (the format Excel saves) and both runs take the bold path.
+
+Usage:
+    python benchmark_carriers_xlsx.py
+    python benchmark_carriers_xlsx.py --rows 50000
+"""
+import os
+import re
+import sys
+import io
+import time
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+import django
+
+# Setup Django environment
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(base_dir)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobstream_backend.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+from openpyxl import Workbook
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.styles import Font
+
+HEADERS = [
+    'name', 'description', 'website', 'headquarters_zip', 'headquarters_city', 'headquarters_state',
+    'benefit_401k', 'benefit_medical_dental_vision', 'benefit_paid_vacation', 'presentation',
+    'pre_qualifications', 'app_process',
+]
+
+
+def generate_workbook(path, rows):
+    """Write a workbook with `rows` carriers using streaming (write-only) mode"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Carriers')
+    ws.append(HEADERS)
+    bold = InlineFont(b=True)
+
+    for i in range(rows):
+        ws.append([
+            f'Benchmark Carrier {i:06d}',
+            CellRichText(TextBlock(bold, 'Overview: '), f'Regional and OTR freight, fleet #{i}.'),
+            f'https://carrier{i}.example.com',
+            f'{10000 + i % 89999:05d}',
+            'Springfield',
+            'IL',
+            CellRichText(TextBlock(bold, '401(k):'), ' 50% match up to 6%'),
+            'Medical, dental & vision after 60 days',
+            CellRichText('Paid vacation: ', TextBlock(bold, '1 week'), ' after first year'),
+            'Lane | Home Time | Pay\nDedicated | Weekly | $1,300',
+            'Min age | Experience\n21 | 6 months',
+            'Apply online, then call the recruiter.',
+        ])
+
+    wb.save(path)
+
+    # Whole-cell bold is stored as a cell style, which write-only mode
+    # can't set per cell through append(); mark the app_process column bold.
+    from openpyxl import load_workbook
+    wb = load_workbook(path, rich_text=True)
+    ws = wb.active
+    for (cell,) in ws.iter_rows(min_row=2, min_col=len(HEADERS), max_col=len(HEADERS)):
+        cell.font = Font(bold=True)
+    wb.save(path)
+    share_strings(path)
+
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+INLINE_CELL_RE = re.compile(r'<c ([^>]*?)t="inlineStr"([^>]*)><is>(.*?)</is></c>', re.S)
+
+
+def share_strings(path):
+    """Move the inline strings of the first sheet into a shared string table, as Excel saves them"""
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name).decode('utf-8') for name in zf.namelist()}
+
+    strings = {}
+
+    def share(match):
+        index = strings.setdefault(match.group(3), len(strings))
+        return f'<c {match.group(1)}t="s"{match.group(2)}><v>{index}</v></c>'
+
+    sheet = 'xl/worksheets/sheet1.xml'
+    parts[sheet], count = INLINE_CELL_RE.subn(share, parts[sheet])
+    items = ''.join(f'<si>{content}</si>' for content in strings)
+    parts['xl/sharedStrings.xml'] = (
+        f'<sst xmlns="{MAIN_NS}" count="{count}" uniqueCount="{len(strings)}">{items}</sst>'
+    )
+    parts['[Content_Types].xml'] = parts['[Content_Types].xml'].replace('</Types>', (
+        '<Override PartName="/xl/sharedStrings.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'
+    ))
+    parts['xl/_rels/workbook.xml.rels'] = parts['xl/_rels/workbook.xml.rels'].replace('</Relationships>', (
+        '<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+        'Target="sharedStrings.xml" Id="rIdSharedStrings"/></Relationships>'
+    ))
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def import_once(path, full_load):
+    """Import the workbook inside a rolled-back transaction"""
+    with transaction.atomic():
+        args = [path, '--full-load'] if full_load else [path]
+        call_command('import_carriers_xlsx', *args, stdout=io.StringIO())
+        transaction.set_rollback(True)
+
+
+def run_import(path, full_load):
+    """Returns (seconds, peak MiB); memory is traced in a separate run so it doesn't skew the timing"""
+    start = time.perf_counter()
+    import_once(path, full_load)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    import_once(path, full_load)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark import_carriers_xlsx')
+    parser.add_argument('--rows', type=int, default=10000, help='Number of carrier rows to generate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'carriers.xlsx')
+        print(f"Generating workbook with {args.rows} rows...")
+        generate_workbook(path, args.rows)
+
+        print(f"\n{'='*60}")
+        for label, full_load in (('Streaming (read-only)', False), ('Full load', True)):
+            elapsed, peak = run_import(path, full_load)
+            print(f"  {label:<22} {elapsed:7.2f}s   peak memory {peak:7.1f} MiB")
+        print(f"{'='*60}")
@@ -1,8 +1,17 @@
 import os
 import sys
+import argparse
 import django
-from bs4 import BeautifulSoup
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:
+    etree = None
 
 # Setup Django environment
 base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,20 +19,80 @@ sys.path.append(base_dir)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobstream_backend.settings')
 django.setup()
 
+from jobs import gazetteer
 from jobs.models import Job
+from jobs.enrichment import enrich_jobs
+from jobs.import_utils import CarrierResolver, JobWriter, classify_by_hash, compute_content_hash
+
+WHITESPACE_RE = re.compile(r'\s+')
+LOCATION_RE = re.compile(r'([A-Za-z\s]+),\s*([A-Z]{2})')
+COMPANY_PREFIX_RE = re.compile(r'([^-]+)\s*-')
+
+# Listings sent to a worker per task, and tasks queued ahead per worker
+LISTING_CHUNK_SIZE = 64
+CHUNKS_PER_WORKER = 2
+
+
+def element_text(elem):
+    """Same as BeautifulSoup's get_text(strip=True) for an lxml element"""
+    return ''.join(part.strip() for part in elem.itertext())
+
+
+def labelled(label):
+    """Extractor for detail fields: only used when the label is present, label removed"""
+    def extract(text):
+        return text.replace(label, '').strip() if label in text else ''
+    return extract
+
+
+def without(label):
+    """Extractor that removes a section label from the text"""
+    def extract(text):
+        return text.replace(label, '').strip()
+    return extract
+
+
+def plain(text):
+    return text
+
+
+# Softr field id -> (field name, extractor). Listings are scanned once and
+# every element carrying a known field id is dispatched through this table.
+FIELD_TABLE = {
+    '_gicjcwgov': ('company', plain),
+    '_nr67crtk9': ('title', plain),
+    '_uxv926gfo': ('salary', plain),
+    '_v1qt13aoq': ('pay_details', labelled('Pay Details')),
+    '_ws49360zq': ('home_time', plain),
+    '_w0q9cb9mz': ('exact_home_time', labelled('Exact Home Time')),
+    '_0mezxqo33': ('experience', plain),
+    '_saga7u800': ('driver_type', plain),
+    '_fwf1wek87': ('driver_type_detailed', labelled('Driver Type')),
+    '_jeqx1ya4b': ('freight_type', plain),
+    '_cis5bvzg2': ('load_unload', labelled('Load/Unload')),
+    '_e6sd7p6ya': ('states', plain),
+    '_lksgonkue': ('lane_info', without('Lane Information')),
+    '_eceq879ao': ('additional_pay', without('Additional Pay Info')),
+    '_1xl3peqa8': ('orientation', without('Orientation')),
+    '_590iwtqgx': ('benefits', plain),
+}
+
+# Fields that appear once per value (e.g. one element per state)
+REPEATED_FIELDS = {'states'}
+
 
 def clean_text(text):
     """Clean and normalize text content"""
     if not text:
         return ""
     # Remove extra whitespace and newlines
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     return text.strip()
 
 def extract_location_and_state(location_text):
     """Extract location and state from location text"""
     # Pattern: "City, State" or "Company - City, State"
-    match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})', location_text)
+    match = LOCATION_RE.search(location_text)
     if match:
         city = match.group(1).strip()
         state = match.group(2).strip()
@@ -34,268 +103,289 @@ def extract_company_name(location_text, company_tag):
     """Extract company name from tags or location text"""
     if company_tag:
         return clean_text(company_tag)
-    
+
     # Try to extract from location text (e.g., "Walmart - Harrisonville, MO")
-    match = re.match(r'([^-]+)\s*-', location_text)
+    match = COMPANY_PREFIX_RE.match(location_text)
     if match:
         return match.group(1).strip()
-    
+
     return "Class A Recruiting"
 
-def parse_html_file(file_path):
-    """Parse the HTML file and extract job listings"""
+
+def collect_fields(pairs):
+    """Build the field dict from (field id, text) pairs in document order"""
+    fields = {}
+    for field_id, text in pairs:
+        entry = FIELD_TABLE.get(field_id)
+        if entry is None:
+            continue
+        name, extract = entry
+        if name in REPEATED_FIELDS:
+            fields.setdefault(name, []).append(text)
+        elif name not in fields:
+            fields[name] = extract(text)
+    return fields
+
+
+def extract_fields(item):
+    """Single pass over one lxml listing element"""
+    return collect_fields(
+        (elem.get('data-softr-field-id'), element_text(elem))
+        for elem in item.iter()
+        if elem.get('data-softr-field-id') in FIELD_TABLE
+    )
+
+
+def extract_fields_soup(item):
+    """Single pass over one BeautifulSoup listing element (fallback without lxml)"""
+    return collect_fields(
+        (elem['data-softr-field-id'], elem.get_text(strip=True))
+        for elem in item.find_all(attrs={'data-softr-field-id': True})
+    )
+
+
+def iter_listing_elements(file_path):
+    """
+    Stream listing elements from the saved page.
+    Each listing is cleared after use, so memory stays bounded by the
+    size of a single listing rather than the whole export.
+    """
+    for _, elem in etree.iterparse(file_path, events=('end',), tag='div', html=True, encoding='utf-8'):
+        if elem.get('role') != 'listitem' or elem.get('data-testid') != 'list-item':
+            continue
+        yield elem
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        while parent is not None and elem.getprevious() is not None:
+            del parent[0]
+
+
+def iter_listing_fields(file_path):
+    """Yield the raw field dict of every listing in the file"""
+    if etree is not None:
+        for elem in iter_listing_elements(file_path):
+            yield extract_fields(elem)
+        return
+
+    from bs4 import BeautifulSoup, SoupStrainer
     with open(file_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find all job listing items
-    job_items = soup.find_all('div', {'role': 'listitem', 'data-testid': 'list-item'})
-    
-    print(f"\nFound {len(job_items)} job items in HTML")
-    
-    jobs = []
-    
-    for idx, item in enumerate(job_items):
+        only_listings = SoupStrainer('div', attrs={'role': 'listitem', 'data-testid': 'list-item'})
+        soup = BeautifulSoup(f, 'html.parser', parse_only=only_listings)
+    for item in soup.find_all('div', attrs={'role': 'listitem', 'data-testid': 'list-item'}, recursive=False):
+        yield extract_fields_soup(item)
+
+
+def build_job(fields, idx=None):
+    """Turn the raw field dict of one listing into job data for the model"""
+    company_text = fields.get('company', '')
+    title_text = fields.get('title', '')
+
+    # Use detailed pay info if available, otherwise use basic salary
+    salary_text = fields.get('pay_details') or fields.get('salary', '')
+    home_time_text = fields.get('exact_home_time') or fields.get('home_time', '')
+    experience_text = fields.get('experience', '')
+    driver_type_text = fields.get('driver_type_detailed') or fields.get('driver_type', '')
+    freight_type_text = fields.get('load_unload') or fields.get('freight_type', '')
+    lane_info = fields.get('lane_info', '')
+    additional_pay = fields.get('additional_pay', '')
+    orientation = fields.get('orientation', '')
+    benefits_text = fields.get('benefits', '')
+
+    # Split combined states like "ALGA" into ["AL", "GA"]
+    expanded_states = []
+    for state in fields.get('states', []):
+        if len(state) > 2:
+            # Split into 2-character chunks
+            expanded_states.extend([state[i:i+2] for i in range(0, len(state), 2)])
+        else:
+            expanded_states.append(state)
+
+    # Debug output for first 3 jobs
+    if idx is not None and idx < 3:
+        print(f"\n--- Job {idx + 1} Debug ---")
+        print(f"Company: '{company_text}'")
+        print(f"Title: '{title_text}'")
+        print(f"Salary: '{salary_text}'")
+        print(f"Home Time: '{home_time_text}'")
+        print(f"Experience: '{experience_text}'")
+        print(f"Driver Type: '{driver_type_text}'")
+        print(f"Freight Type: '{freight_type_text}'")
+        print(f"States: {expanded_states}")
+        print(f"Lane Info: '{lane_info[:100]}'...")
+        print(f"Benefits: '{benefits_text[:100]}'...")
+
+    # Parse location and extract state
+    location, state = extract_location_and_state(title_text)
+    company = extract_company_name(title_text, company_text)
+
+    # Lane information is the primary description
+    description_parts = [lane_info] if lane_info else []
+    if home_time_text:
+        description_parts.append(f"**Home Time:** {home_time_text}")
+    if freight_type_text:
+        description_parts.append(f"**Freight Type:** {freight_type_text}")
+    if orientation:
+        description_parts.append(f"**Orientation:** {orientation}")
+    if benefits_text:
+        description_parts.append(f"**Benefits:** {benefits_text}")
+
+    pay_parts = []
+    if salary_text:
+        pay_parts.append(f"**Pay:** {salary_text}")
+    if additional_pay:
+        pay_parts.append(f"**Additional Pay Info:** {additional_pay}")
+
+    requirement_parts = []
+    if experience_text:
+        requirement_parts.append(f"**Experience Required:** {experience_text}")
+    if driver_type_text:
+        requirement_parts.append(f"**Driver Type:** {driver_type_text}")
+    if expanded_states:
+        requirement_parts.append(f"**States:** {', '.join(expanded_states)}")
+
+    # Determine equipment type from title
+    title_lower = title_text.lower()
+    if 'reefer' in title_lower:
+        equipment_type = 'Reefer'
+    elif 'flatbed' in title_lower:
+        equipment_type = 'Flatbed'
+    elif 'intermodal' in title_lower:
+        equipment_type = 'Intermodal'
+    else:
+        equipment_type = 'Dry Van'
+
+    return {
+        'company': company[:200],
+        'title': clean_text(title_text)[:200],
+        'state': (location or state or 'Unknown')[:200],
+        'zip_code': None,
+        'job_details': "\n\n".join(description_parts) or "No additional details available.",
+        'pay_details': "\n\n".join(pay_parts) or None,
+        'equipment_details': f"**Equipment Type:** {equipment_type}",
+        'requirements_details': "\n\n".join(requirement_parts) or None,
+        'is_active': True,
+        'content_hash': compute_content_hash(fields | {'states': ','.join(fields.get('states', []))}),
+    }
+
+
+def parse_listing_html(html):
+    """Worker entry point: parse one serialized listing"""
+    return build_job(extract_fields(lxml.html.fromstring(html)))
+
+
+def parse_listing_chunk(chunk):
+    """Worker entry point: parse (index, serialized listing) pairs, one error per bad listing"""
+    results = []
+    for idx, html in chunk:
         try:
-            # Extract all fields using flexible search
-            company_elem = item.find(attrs={'data-softr-field-id': '_gicjcwgov'})
-            company_text = company_elem.get_text(strip=True) if company_elem else ""
-            
-            title_elem = item.find(attrs={'data-softr-field-id': '_nr67crtk9'})
-            title_text = title_elem.get_text(strip=True) if title_elem else ""
-            
-            # Salary fields - try both basic and detailed
-            salary_elem = item.find(attrs={'data-softr-field-id': '_uxv926gfo'})
-            salary_text = salary_elem.get_text(strip=True) if salary_elem else ""
-            
-            pay_details_elem = item.find(attrs={'data-softr-field-id': '_v1qt13aoq'})
-            pay_details = pay_details_elem.get_text(strip=True) if pay_details_elem else ""
-            
-            # Use detailed pay info if available, otherwise use basic salary
-            if pay_details and 'Pay Details' in pay_details:
-                salary_text = pay_details.replace('Pay Details', '').strip() or salary_text
-            
-            # Home time fields - try both
-            home_time_elem = item.find(attrs={'data-softr-field-id': '_ws49360zq'})
-            home_time_text = home_time_elem.get_text(strip=True) if home_time_elem else ""
-            
-            exact_home_time_elem = item.find(attrs={'data-softr-field-id': '_w0q9cb9mz'})
-            exact_home_time = exact_home_time_elem.get_text(strip=True) if exact_home_time_elem else ""
-            
-            if exact_home_time and 'Exact Home Time' in exact_home_time:
-                home_time_text = exact_home_time.replace('Exact Home Time', '').strip() or home_time_text
-            
-            # Experience
-            experience_elem = item.find(attrs={'data-softr-field-id': '_0mezxqo33'})
-            experience_text = experience_elem.get_text(strip=True) if experience_elem else ""
-            
-            # Driver type - try both fields
-            driver_type_elem = item.find(attrs={'data-softr-field-id': '_saga7u800'})
-            driver_type_text = driver_type_elem.get_text(strip=True) if driver_type_elem else ""
-            
-            driver_type_detailed_elem = item.find(attrs={'data-softr-field-id': '_fwf1wek87'})
-            driver_type_detailed = driver_type_detailed_elem.get_text(strip=True) if driver_type_detailed_elem else ""
-            
-            if driver_type_detailed and 'Driver Type' in driver_type_detailed:
-                driver_type_text = driver_type_detailed.replace('Driver Type', '').strip() or driver_type_text
-            
-            # Freight type
-            freight_type_elem = item.find(attrs={'data-softr-field-id': '_jeqx1ya4b'})
-            freight_type_text = freight_type_elem.get_text(strip=True) if freight_type_elem else ""
-            
-            load_unload_elem = item.find(attrs={'data-softr-field-id': '_cis5bvzg2'})
-            load_unload = load_unload_elem.get_text(strip=True) if load_unload_elem else ""
-            
-            if load_unload and 'Load/Unload' in load_unload:
-                freight_type_text = load_unload.replace('Load/Unload', '').strip() or freight_type_text
-            
-            # States
-            state_elems = item.find_all(attrs={'data-softr-field-id': '_e6sd7p6ya'})
-            states = [elem.get_text(strip=True) for elem in state_elems]
-            # Split combined states like "ALGA" into ["AL", "GA"]
-            expanded_states = []
-            for state in states:
-                if len(state) > 2:
-                    # Split into 2-character chunks
-                    expanded_states.extend([state[i:i+2] for i in range(0, len(state), 2)])
-                else:
-                    expanded_states.append(state)
-            states_covered = ', '.join(expanded_states) if expanded_states else None
-            
-            # Lane Information / Full Description
-            lane_info_elem = item.find(attrs={'data-softr-field-id': '_lksgonkue'})
-            lane_info = lane_info_elem.get_text(strip=True) if lane_info_elem else ""
-            
-            # Additional Pay Info
-            additional_pay_elem = item.find(attrs={'data-softr-field-id': '_eceq879ao'})
-            additional_pay = additional_pay_elem.get_text(strip=True) if additional_pay_elem else ""
-            
-            # Orientation
-            orientation_elem = item.find(attrs={'data-softr-field-id': '_1xl3peqa8'})
-            orientation = orientation_elem.get_text(strip=True) if orientation_elem else ""
-            
-            # Benefits
-            benefits_elem = item.find(attrs={'data-softr-field-id': '_590iwtqgx'})
-            benefits_text = benefits_elem.get_text(strip=True) if benefits_elem else ""
-            
-            # Debug output for first 3 jobs
-            if idx < 3:
-                print(f"\n--- Job {idx + 1} Debug ---")
-                print(f"Company: '{company_text}'")
-                print(f"Title: '{title_text}'")
-                print(f"Salary: '{salary_text}'")
-                print(f"Home Time: '{home_time_text}'")
-                print(f"Experience: '{experience_text}'")
-                print(f"Driver Type: '{driver_type_text}'")
-                print(f"Freight Type: '{freight_type_text}'")
-                print(f"States: {expanded_states}")
-                print(f"Lane Info: '{lane_info[:100]}'...")
-                print(f"Benefits: '{benefits_text[:100]}'...")
-            
-            # Parse location and extract state
-            location, state = extract_location_and_state(title_text)
-            company = extract_company_name(title_text, company_text)
-            
-            # Build comprehensive description
-            description_parts = []
-            
-            # Add lane information as primary description if available
-            if lane_info:
-                # Clean up lane info
-                lane_info_clean = lane_info.replace('Lane Information', '').strip()
-                if lane_info_clean:
-                    description_parts.append(lane_info_clean)
-            
-            # Add structured information
-            if salary_text:
-                description_parts.append(f"**Pay:** {salary_text}")
-            if additional_pay:
-                additional_pay_clean = additional_pay.replace('Additional Pay Info', '').strip()
-                if additional_pay_clean:
-                    description_parts.append(f"**Additional Pay Info:** {additional_pay_clean}")
-            if home_time_text:
-                description_parts.append(f"**Home Time:** {home_time_text}")
-            if experience_text:
-                description_parts.append(f"**Experience Required:** {experience_text}")
-            if driver_type_text:
-                description_parts.append(f"**Driver Type:** {driver_type_text}")
-            if freight_type_text:
-                description_parts.append(f"**Freight Type:** {freight_type_text}")
-            if expanded_states:
-                description_parts.append(f"**States:** {', '.join(expanded_states)}")
-            if orientation:
-                orientation_clean = orientation.replace('Orientation', '').strip()
-                if orientation_clean:
-                    description_parts.append(f"**Orientation:** {orientation_clean}")
-            
-            description = "\n\n".join(description_parts) if description_parts else "No additional details available."
-            
-            # Determine equipment type from title or freight type
-            equipment_type = None
-            if 'reefer' in title_text.lower():
-                equipment_type = 'Reefer'
-            elif 'flatbed' in title_text.lower():
-                equipment_type = 'Flatbed'
-            elif 'intermodal' in title_text.lower():
-                equipment_type = 'Intermodal'
-            else:
-                equipment_type = 'Dry Van'
-            
-            # Create job data with all fields
-            job_data = {
-                'title': clean_text(title_text)[:200],
-                'company': company[:200],
-                'location': location[:200],
-                'zip_code': '00000',  # Default zip code
-                'description': description,
-                'job_type': 'full-time',
-                
-                # Compensation
-                'salary': salary_text[:100] if salary_text else None,
-                'pay_type': 'Weekly' if salary_text and 'weekly' in salary_text.lower() else 'Hourly' if salary_text and 'hour' in salary_text.lower() else None,
-                
-                # Schedule & Home Time
-                'home_time': home_time_text[:100] if home_time_text else None,
-                'schedule_type': home_time_text[:100] if home_time_text else None,
-                
-                # Experience & Requirements
-                'experience_required': experience_text[:100] if experience_text else None,
-                'requirements': f"Experience: {experience_text}" if experience_text else None,
-                
-                # Driver-Specific Fields
-                'driver_type': driver_type_text[:100] if driver_type_text else None,
-                'freight_type': freight_type_text[:100] if freight_type_text else None,
-                'equipment_type': equipment_type,
-                
-                # Coverage Area
-                'states_covered': states_covered,
-                
-                # Benefits
-                'benefits': benefits_text if benefits_text else None,
-                
-                # Application
-                'apply_link': 'https://classarecruiting.com',
-            }
-            
-            jobs.append(job_data)
-            
+            results.append((idx, parse_listing_html(html), None))
         except Exception as e:
-            print(f"Error parsing job item {idx}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
-    
+            results.append((idx, None, str(e)))
+    return results
+
+
+def iter_pooled_results(file_path, workers):
+    """
+    Parse listings in a process pool, yielding (index, job, error) in file
+    order. Listings are submitted in chunks and only a few chunks per worker
+    are in flight, so the file is never fully serialized into memory.
+    """
+    listings = enumerate(etree.tostring(elem, encoding='unicode') for elem in iter_listing_elements(file_path))
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            chunk = list(islice(listings, LISTING_CHUNK_SIZE))
+            if chunk:
+                pending.append(executor.submit(parse_listing_chunk, chunk))
+            if pending and (not chunk or len(pending) >= workers * CHUNKS_PER_WORKER):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
+
+
+def parse_html_file(file_path, workers=1):
+    """Parse the HTML file and extract job listings"""
+    jobs = []
+    if workers > 1 and etree is not None:
+        for idx, job, error in iter_pooled_results(file_path, workers):
+            if error is not None:
+                print(f"Error parsing job item {idx}: {error}")
+            else:
+                jobs.append(job)
+    else:
+        for idx, fields in enumerate(iter_listing_fields(file_path)):
+            try:
+                jobs.append(build_job(fields, idx))
+            except Exception as e:
+                print(f"Error parsing job item {idx}: {e}")
+                continue
+
+    print(f"\nFound {len(jobs)} job items in HTML")
     return jobs
 
-def import_jobs(html_file_path):
+def import_jobs(html_file_path, workers=1, enrich=False):
     """Import jobs from HTML file into database"""
     print(f"Parsing HTML file: {html_file_path}")
-    jobs = parse_html_file(html_file_path)
-    
+    jobs = parse_html_file(html_file_path, workers)
+
     print(f"\nParsed {len(jobs)} job listings")
-    
-    created_count = 0
-    updated_count = 0
-    
+
+    # Carriers are resolved in bulk, jobs are written in batches
+    resolver = CarrierResolver()
+    resolver.resolve({job_data['company']: {} for job_data in jobs})
+    writer = JobWriter()
+
+    parsed = {}
     for job_data in jobs:
-        try:
-            # Try to find existing job by title and company
-            existing_job = Job.objects.filter(
-                title=job_data['title'],
-                company=job_data['company']
-            ).first()
-            
-            if existing_job:
-                # Update existing job with all new fields
-                for key, value in job_data.items():
-                    setattr(existing_job, key, value)
-                existing_job.save()
-                updated_count += 1
-            else:
-                # Create new job
-                Job.objects.create(**job_data)
-                created_count += 1
-                
-        except Exception as e:
-            print(f"Error importing job '{job_data.get('title', 'Unknown')}': {e}")
-            import traceback
-            traceback.print_exc()
-            continue
-    
+        carrier = resolver.get(job_data.pop('company'))
+        parsed[(carrier.id, job_data['title'])] = dict(job_data, carrier=carrier)
+
+    existing = {}
+    stored_jobs = (
+        Job.objects.filter(carrier_id__in={carrier.id for carrier in resolver.carriers.values()})
+        .values_list('id', 'carrier_id', 'title', 'content_hash')
+    )
+    for pk, carrier_id, title, content_hash in stored_jobs:
+        if (carrier_id, title) in parsed:
+            existing.setdefault((carrier_id, title), (pk, content_hash))
+
+    classified = classify_by_hash({key: job_data['content_hash'] for key, job_data in parsed.items()}, existing)
+    for key in classified['new']:
+        writer.create(parsed[key]['title'], parsed[key])
+    for key in classified['changed']:
+        writer.update(parsed[key]['title'], existing[key][0], parsed[key])
+    writer.flush()
+
+    for error in writer.errors:
+        print(f"Error importing job {error}")
+
     print(f"\n{'='*60}")
     print(f"Import Summary:")
-    print(f"  Created: {created_count} jobs")
-    print(f"  Updated: {updated_count} jobs")
-    print(f"  Total:   {created_count + updated_count} jobs")
+    print(f"  Created:   {writer.created} jobs")
+    print(f"  Updated:   {writer.updated} jobs")
+    print(f"  Unchanged: {len(classified['unchanged'])} jobs")
+    print(f"  Total:     {writer.created + writer.updated + len(classified['unchanged'])} jobs")
+    if enrich:
+        carrier_ids = [carrier.id for carrier in resolver.carriers.values()]
+        enriched = enrich_jobs(Job.objects.filter(carrier_id__in=carrier_ids, needs_enrichment=True))
+        print(f"  Enriched:  {enriched} jobs")
+        print(f"  Gazetteer: {gazetteer.format_stats()}")
     print(f"{'='*60}")
 
 if __name__ == '__main__':
-    # Path to the HTML file
-    html_file = os.path.join(os.path.dirname(__file__), '..', 'Job Search.html')
-    
-    if not os.path.exists(html_file):
-        print(f"Error: HTML file not found at {html_file}")
+    parser = argparse.ArgumentParser(description='Import jobs from a saved Softr job search page')
+    parser.add_argument(
+        'html_file',
+        nargs='?',
+        default=os.path.join(os.path.dirname(__file__), '..', 'Job Search.html'),
+        help='Path to the saved HTML page'
+    )
+    parser.add_argument('--workers', type=int, default=1, help='Parse listings in a pool of N processes')
+    parser.add_argument('--enrich', action='store_true', help='Resolve zip codes and coordinates after importing')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.html_file):
+        print(f"Error: HTML file not found at {args.html_file}")
         sys.exit(1)
-    
-    import_jobs(html_file)
+
+    import_jobs(args.html_file, args.workers, args.enrich)
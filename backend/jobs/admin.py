@@ -1,16 +1,26 @@
 from django.contrib import admin
+from django.db import connection
+from django.db.models import Q
 from django.utils.html import format_html
-from .models import Carrier, Job
+from .models import Carrier, CarrierAlias, GeocodeCache, Job
+
+
+class CarrierAliasInline(admin.TabularInline):
+    model = CarrierAlias
+    fields = ('alias', 'created_at')
+    readonly_fields = ('created_at',)
+    extra = 0
 
 
 @admin.register(Carrier)
 class CarrierAdmin(admin.ModelAdmin):
-    list_display = ('name', 'website', 'is_active', 'created_at')
+    list_display = ('name', 'website', 'is_active', 'active_jobs_count', 'open_jobs_count', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
     readonly_fields = ('created_at', 'updated_at')
     list_per_page = 50  # Show up to 50 carriers per page
     preserve_filters = False  # Don't preserve filters to avoid caching
+    inlines = [CarrierAliasInline]
     
     def get_queryset(self, request):
         """
@@ -19,6 +29,14 @@ class CarrierAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         # Force evaluation to prevent caching issues
         return qs.order_by('name')
+
+    def get_search_results(self, request, queryset, search_term):
+        """On PostgreSQL, match names and aliases through the trigram indexes."""
+        if len(search_term.strip()) < 3 or connection.vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        matches = queryset.filter(Q(name__trigram_word_similar=term) | Q(aliases__alias__trigram_word_similar=term))
+        return matches.distinct(), False
     
     fieldsets = (
         ('Company Information', {
@@ -69,15 +87,31 @@ class CarrierAdmin(admin.ModelAdmin):
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'carrier', 'state', 'colored_zip_code', 'is_active', 'created_at')
-    list_filter = ('carrier', 'is_active', 'created_at')
+    list_filter = ('carrier', 'is_active', 'needs_enrichment', 'created_at')
     search_fields = ('title', 'carrier__name', 'state', 'job_details', 'zip_code')
     readonly_fields = ('created_at', 'updated_at')
     list_per_page = 100
     preserve_filters = False
+    actions = ['enrich_selected']
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs.select_related('carrier')
+
+    def get_search_results(self, request, queryset, search_term):
+        """On PostgreSQL, search the indexed search vector instead of icontains scans."""
+        if not search_term or connection.vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+        from django.contrib.postgres.search import SearchQuery
+        from .search import SEARCH_CONFIG
+        query = SearchQuery(search_term, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(Q(search_vector=query) | Q(zip_code=search_term.strip())), False
+    
+    @admin.action(description='Queue zip code and coordinate lookup')
+    def enrich_selected(self, request, queryset):
+        # Geocoding can go over the network, so it is left to the enrich_jobs command / worker
+        count = queryset.update(needs_enrichment=True)
+        self.message_user(request, f"Queued {count} job(s); 'manage.py enrich_jobs' resolves their location.")
     
     def colored_zip_code(self, obj):
         """Display zip code with color-coded source indicator"""
@@ -133,3 +167,10 @@ class JobAdmin(admin.ModelAdmin):
         }),
     )
 
+
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'key', 'zip_code', 'latitude', 'longitude', 'state', 'source', 'fetched_at')
+    list_filter = ('kind', 'source')
+    search_fields = ('key', 'zip_code')
@@ -0,0 +1,123 @@
+"""
+Async versions of the read-heavy API endpoints, used when the project is
+served by the ASGI application (settings.ASYNC_API_VIEWS, set by
+jobstream_backend/asgi.py).
+
+GET requests for the job list, ranked search, job detail and carrier list
+are answered with the async ORM and async cache calls, so a request
+waiting on the database doesn't hold a worker thread. Work that is only
+available synchronously (radius matching with geocoding, facet
+aggregation on a cache miss) runs through sync_to_async. Other methods
+are handed to the DRF views (see with_sync_fallback), so clients use the
+same URLs and get the same payloads under WSGI and ASGI.
+"""
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+from . import rendering
+from .facets import acatalog_counts, count_queryset
+from .models import Job
+from .search import search_jobs
+from .serializers import CarrierSerializer, JobSerializer
+from .utils import get_coordinates_from_zip
+from .views import CarrierViewSet, JobDetail, JobList, JobSearchView
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    # DRF's encoder, so decimals and dates come out as they do from the DRF views
+    return JsonResponse(data, status=status_code, safe=False, encoder=JSONEncoder)
+
+
+def with_sync_fallback(sync_view):
+    """
+    Serve GET with the decorated async view and every other method with
+    sync_view (a DRF view, run in a thread).
+    """
+    sync_view = sync_to_async(sync_view)
+
+    def decorator(async_view):
+        @csrf_exempt  # DRF enforces CSRF for session-authenticated writes itself
+        async def view(request, *args, **kwargs):
+            if request.method == 'GET':
+                return await async_view(request, *args, **kwargs)
+            return await sync_view(request, *args, **kwargs)
+        return view
+    return decorator
+
+
+@with_sync_fallback(JobList.as_view())
+async def job_list(request):
+    """Async JobList.list: same query params and payload, built by the same JobList helpers."""
+    params = request.GET
+    try:
+        queryset, filtered, ordering = JobList.filtered_queryset(params)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    with_facets = JobList.facets_requested(params)
+    driver_zip = params.get('zip_code')
+    if driver_zip:
+        # Radius matching can geocode, which is synchronous
+        matches = await sync_to_async(JobList.radius_matches)(driver_zip, queryset, ordering, with_facets)
+        return json_response(JobList.radius_data(matches, request, with_facets))
+
+    jobs = [job async for job in queryset]
+    results = JobSerializer(jobs, many=True, context={'request': request}).data
+    if with_facets:
+        facets = await sync_to_async(count_queryset)(queryset) if filtered else await acatalog_counts()
+        return json_response({'results': results, 'facets': facets})
+    return json_response(results)
+
+
+@with_sync_fallback(JobSearchView.as_view())
+async def job_search(request):
+    """Async JobSearchView: same query params and payload."""
+    text = request.GET.get('q', '').strip()
+    if not text:
+        return json_response({"error": "q is required."}, status.HTTP_400_BAD_REQUEST)
+    if connection.vendor != 'postgresql':
+        return json_response({"error": "Full-text search requires PostgreSQL."}, status.HTTP_501_NOT_IMPLEMENTED)
+    try:
+        radius = int(request.GET['radius']) if request.GET.get('radius') else None
+        limit = min(int(request.GET.get('limit') or 50), JobSearchView.MAX_LIMIT)
+    except ValueError:
+        return json_response({"error": "radius and limit must be numbers."}, status.HTTP_400_BAD_REQUEST)
+
+    latitude = longitude = None
+    driver_zip = request.GET.get('zip_code')
+    if driver_zip:
+        latitude, longitude = await sync_to_async(get_coordinates_from_zip)(driver_zip)
+        if latitude is None:
+            return json_response({"error": "Unknown zip code."}, status.HTTP_400_BAD_REQUEST)
+
+    queryset = Job.objects.filter(is_active=True).select_related('carrier')
+    results = []
+    async for job in search_jobs(queryset, text, latitude, longitude, radius)[:limit]:
+        job_dict = JobSerializer(job, context={'request': request}).data
+        job_dict['rank'] = job.rank
+        job_dict['snippet'] = job.snippet
+        job_dict['distance_miles'] = round(job.distance_miles, 1) if driver_zip else None
+        results.append(job_dict)
+    return json_response(results)
+
+
+@with_sync_fallback(JobDetail.as_view())
+async def job_detail(request, pk):
+    """Async JobDetail.retrieve, with rendered sections from the render cache."""
+    try:
+        job = await Job.objects.select_related('carrier').aget(pk=pk)
+    except Job.DoesNotExist:
+        return json_response({"detail": "No Job matches the given query."}, status.HTTP_404_NOT_FOUND)
+    data = JobSerializer(job, context={'request': request}).data
+    data['rendered'] = await rendering.arendered_sections(job)
+    return json_response(data)
+
+
+@with_sync_fallback(CarrierViewSet.as_view({'get': 'list', 'post': 'create'}))
+async def carrier_list(request):
+    """Async CarrierViewSet.list (job counters are columns, so this is one query)."""
+    carriers = [carrier async for carrier in CarrierViewSet.queryset.all()]
+    return json_response(CarrierSerializer(carriers, many=True, context={'request': request}).data)
@@ -0,0 +1,179 @@
+"""
+Carrier name lookup: typeahead suggestions and fuzzy resolution of
+carrier names found in import files.
+
+On PostgreSQL both use pg_trgm similarity over Carrier.name and
+CarrierAlias.alias, served by trigram GIN indexes (migration 0024).
+Other databases fall back to prefix matching and difflib.
+"""
+import difflib
+import re
+from django.db import connection
+from django.db.models import Q
+
+# Built-in aliases; stored in the alias table the first time an import uses them
+DEFAULT_ALIASES = {
+    'US Express': 'US Xpress',
+    'Swift': 'Swift Transportation',
+}
+
+# Minimum similarity for an import to reuse an existing carrier (0-1)
+FUZZY_MATCH_THRESHOLD = 0.7
+FALLBACK_MATCH_CUTOFF = 0.85
+
+# Typeahead queries shorter than this have too few trigrams; they use a prefix match
+MIN_TRIGRAM_QUERY = 3
+
+SUFFIX_RE = re.compile(r'\b(?:inc|llc|l\.l\.c|co|corp|corporation|company|ltd)\b\.?')
+NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+DIGITS_RE = re.compile(r'\d+')
+
+
+def normalize_name(name):
+    """Lowercase, without punctuation and company suffixes ("Werner Enterprises, Inc." -> "werner enterprises")."""
+    name = SUFFIX_RE.sub(' ', (name or '').lower())
+    return ' '.join(NON_WORD_RE.sub(' ', name).split())
+
+
+def _use_trigrams():
+    return connection.vendor == 'postgresql'
+
+
+def _same_numbers(a, b):
+    # "Carrier 1" and "Carrier 10" are similar strings but different companies
+    return DIGITS_RE.findall(a) == DIGITS_RE.findall(b)
+
+
+def suggest_carriers(text, limit=10):
+    """
+    Typeahead suggestions for a partial carrier name.
+
+    Args:
+        text (str): What the user typed so far
+        limit (int): Maximum number of carriers returned
+
+    Returns:
+        list: (carrier, matched name or alias, score) tuples, best first
+    """
+    from .models import Carrier, CarrierAlias
+
+    text = text.strip()
+    if not text:
+        return []
+
+    if _use_trigrams() and len(text) >= MIN_TRIGRAM_QUERY:
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        names = (
+            Carrier.objects.filter(is_active=True, name__trigram_word_similar=text)
+            .only('id', 'name')
+            .annotate(score=TrigramWordSimilarity(text, 'name'))
+            .order_by('-score', 'name')[:limit]
+        )
+        aliases = (
+            CarrierAlias.objects.filter(carrier__is_active=True, alias__trigram_word_similar=text)
+            .select_related('carrier').only('alias', 'carrier__id', 'carrier__name')
+            .annotate(score=TrigramWordSimilarity(text, 'alias'))
+            .order_by('-score', 'alias')[:limit]
+        )
+        candidates = [(carrier, carrier.name, carrier.score) for carrier in names]
+        candidates += [(alias.carrier, alias.alias, alias.score) for alias in aliases]
+    else:
+        starts = Q(name__istartswith=text) | Q(name__icontains=f' {text}')
+        names = Carrier.objects.filter(starts, is_active=True).only('id', 'name').order_by('name')[:limit]
+        aliases = (
+            CarrierAlias.objects.filter(Q(alias__istartswith=text) | Q(alias__icontains=f' {text}'))
+            .filter(carrier__is_active=True)
+            .select_related('carrier').only('alias', 'carrier__id', 'carrier__name')[:limit]
+        )
+        # Prefix matches rank above matches on a later word
+        lowered = text.lower()
+        candidates = [
+            (carrier, name, 1.0 if name.lower().startswith(lowered) else 0.5)
+            for carrier, name in [(c, c.name) for c in names] + [(a.carrier, a.alias) for a in aliases]
+        ]
+
+    # Best match per carrier
+    best = {}
+    for carrier, matched, score in candidates:
+        if carrier.pk not in best or score > best[carrier.pk][2]:
+            best[carrier.pk] = (carrier, matched, score)
+    return sorted(best.values(), key=lambda entry: (-entry[2], entry[0].name))[:limit]
+
+
+def closest_carrier(name):
+    """
+    The existing carrier whose name is most similar to name, if it is
+    similar enough to be the same company.
+
+    Returns:
+        Carrier or None
+    """
+    from .models import Carrier
+
+    key = normalize_name(name)
+    if not key:
+        return None
+    if _use_trigrams():
+        from django.contrib.postgres.search import TrigramSimilarity
+        candidates = (
+            Carrier.objects.filter(name__trigram_similar=key)
+            .annotate(score=TrigramSimilarity('name', key))
+            .filter(score__gte=FUZZY_MATCH_THRESHOLD)
+            .order_by('-score')[:5]
+        )
+        return next((c for c in candidates if _same_numbers(key, normalize_name(c.name))), None)
+
+    carriers = {normalize_name(carrier_name): pk for pk, carrier_name in Carrier.objects.values_list('id', 'name')}
+    for match in difflib.get_close_matches(key, carriers, n=5, cutoff=FALLBACK_MATCH_CUTOFF):
+        if _same_numbers(key, match):
+            return Carrier.objects.get(pk=carriers[match])
+    return None
+
+
+def match_carriers(names):
+    """
+    Resolve carrier names that are not exact Carrier.name values: through
+    the alias table, the built-in aliases, then the closest existing
+    carrier. Names resolved by the last two are stored as aliases, so the
+    next import finds them in one query.
+
+    Args:
+        names: Carrier names as found in an import file
+
+    Returns:
+        dict: name -> Carrier for every name that could be resolved
+    """
+    from .models import Carrier, CarrierAlias
+
+    keys = {name: normalize_name(name) for name in names}
+    by_key = {
+        alias.key: alias.carrier
+        for alias in CarrierAlias.objects.filter(key__in=set(keys.values())).select_related('carrier')
+    }
+    found = {name: by_key[key] for name, key in keys.items() if key in by_key}
+
+    remaining = [name for name in names if name not in found]
+    targets = Carrier.objects.in_bulk(
+        [DEFAULT_ALIASES[name] for name in remaining if name in DEFAULT_ALIASES], field_name='name'
+    )
+    learned = {}
+    for name in remaining:
+        carrier = targets.get(DEFAULT_ALIASES.get(name)) or closest_carrier(name)
+        if carrier is not None:
+            found[name] = learned[name] = carrier
+
+    remember_aliases(learned)
+    return found
+
+
+def remember_aliases(aliases):
+    """Store name -> Carrier pairs in the alias table (existing keys are kept)."""
+    from .models import CarrierAlias
+
+    rows = {}
+    for name, carrier in aliases.items():
+        key = normalize_name(name)
+        if key:
+            rows[key] = CarrierAlias(alias=name, key=key, carrier=carrier)
+    if rows:
+        CarrierAlias.objects.bulk_create(rows.values(), ignore_conflicts=True)
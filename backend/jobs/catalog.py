@@ -0,0 +1,117 @@
+"""
+Catalog version: a counter bumped on every write to jobs or carriers,
+and the append-only change log recording what each write touched.
+
+Model saves and deletes log their change through signals (jobs.signals);
+bulk write paths (imports, batch parsing, status updates) call
+log_changes() themselves, inside their transaction; that includes the
+location writes of enrichment, backfill_coordinates and carrier
+headquarters moves. Carrier headquarters coordinates are the one
+exception: they are derived from headquarters_zip and are not part of the
+synced carrier fields, so enrichment and backfill_coordinates store them
+without a change entry (the jobs they re-locate are logged).
+
+Anything cached from the whole catalog is keyed by current_version(), so
+it is refreshed on the first request after a change, in every process;
+clients holding a copy of the catalog sync with changes_since().
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+VERSION_PK = 1
+
+
+def current_version():
+    """
+    Returns:
+        int: The current catalog version (0 before the first write)
+    """
+    from .models import CatalogVersion
+    version = CatalogVersion.objects.filter(pk=VERSION_PK).values_list('version', flat=True).first()
+    return version or 0
+
+
+async def acurrent_version():
+    """Async variant of current_version()."""
+    from .models import CatalogVersion
+    version = await CatalogVersion.objects.filter(pk=VERSION_PK).values_list('version', flat=True).afirst()
+    return version or 0
+
+
+def bump_version():
+    """
+    Record a change to the catalog with a single UPDATE.
+    The row stays locked until the transaction ends, so concurrent writers
+    get consecutive versions in commit order.
+
+    Returns:
+        int: The new version
+    """
+    from .models import CatalogVersion
+    versions = CatalogVersion.objects.filter(pk=VERSION_PK)
+    if not versions.update(version=F('version') + 1, updated_at=timezone.now()):
+        # First write: create the row at 0 and bump it like any other, so two
+        # writers racing to create it still get consecutive versions
+        CatalogVersion.objects.get_or_create(pk=VERSION_PK, defaults={'version': 0})
+        versions.update(version=F('version') + 1, updated_at=timezone.now())
+    return current_version()
+
+
+def log_changes(kind, upserted=(), deleted=()):
+    """
+    Bump the catalog version and append the changed objects to the change
+    log. Job changes are published to the event streams (jobs.events)
+    once the transaction commits.
+
+    Args:
+        kind (str): 'job' or 'carrier'
+        upserted: Primary keys of created or updated objects
+        deleted: Primary keys of deleted objects
+
+    Returns:
+        int: The new version
+    """
+    from .events import publish_job_changes
+    from .models import CatalogChange
+    upserted, deleted = list(dict.fromkeys(upserted)), list(dict.fromkeys(deleted))
+    # The version and its entries become visible together
+    with transaction.atomic():
+        version = bump_version()
+        CatalogChange.objects.bulk_create(
+            [CatalogChange(version=version, kind=kind, object_id=pk) for pk in upserted]
+            + [CatalogChange(version=version, kind=kind, object_id=pk, deleted=True) for pk in deleted],
+            batch_size=1000,
+        )
+        if kind == 'job':
+            transaction.on_commit(lambda: publish_job_changes(version, upserted, deleted))
+    return version
+
+
+def changes_since(version):
+    """
+    The objects changed after a catalog version, last change per object.
+
+    Args:
+        version (int): Catalog version the client holds
+
+    Returns:
+        tuple: (current version, changes) where changes is
+               kind -> {'upserted': set of ids, 'deleted': set of ids}, or
+               None if the log does not reach back to that version
+    """
+    from .models import CatalogChange
+    current = current_version()
+    first = CatalogChange.objects.order_by('version').values_list('version', flat=True).first()
+    if version > current or (version < current and (first is None or version < first - 1)):
+        return current, None
+
+    latest = {}
+    rows = CatalogChange.objects.filter(version__gt=version).values_list('kind', 'object_id', 'deleted')
+    for kind, object_id, deleted in rows.order_by('version', 'id').iterator(chunk_size=2000):
+        latest[kind, object_id] = deleted
+
+    changes = {kind: {'upserted': set(), 'deleted': set()} for kind, _ in CatalogChange.KIND_CHOICES}
+    for (kind, object_id), deleted in latest.items():
+        changes[kind]['deleted' if deleted else 'upserted'].add(object_id)
+    return current, changes
@@ -0,0 +1,59 @@
+"""
+Denormalized job counters on Carrier: active_jobs_count and
+open_jobs_count (active jobs open to hiring).
+
+Job saves and deletes refresh the counters of the affected carriers in
+the same transaction (jobs.signals); bulk write paths (imports, batch
+parsing) call refresh_carrier_counts() inside their own transaction.
+The recount_carrier_jobs command repairs any drift.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Job fields whose changes move the counters
+COUNTED_FIELDS = ('is_active', 'hiring_status', 'carrier_id')
+
+# counter field -> filter on a carrier's jobs
+COUNTERS = {
+    'active_jobs_count': Q(is_active=True),
+    'open_jobs_count': Q(is_active=True, hiring_status='open'),
+}
+
+
+def _count_subquery(condition):
+    from .models import Job
+    jobs = (
+        Job.objects.filter(condition, carrier=OuterRef('pk'))
+        .order_by().values('carrier').annotate(n=Count('id')).values('n')
+    )
+    return Coalesce(Subquery(jobs, output_field=IntegerField()), Value(0))
+
+
+def refresh_carrier_counts(carrier_ids):
+    """
+    Recompute the counters of the given carriers with a single UPDATE.
+
+    Args:
+        carrier_ids: Carrier primary keys
+    """
+    from .models import Carrier
+    carrier_ids = {pk for pk in carrier_ids if pk is not None}
+    if carrier_ids:
+        Carrier.objects.filter(pk__in=carrier_ids).update(**{
+            field: _count_subquery(condition) for field, condition in COUNTERS.items()
+        })
+
+
+def count_all():
+    """
+    Count the jobs of every carrier in one aggregate query.
+
+    Returns:
+        dict: carrier id -> {counter field: count}, for carriers with jobs
+    """
+    from .models import Job
+    rows = (
+        Job.objects.order_by().values('carrier_id')
+        .annotate(**{field: Count('id', filter=condition) for field, condition in COUNTERS.items()})
+    )
+    return {row.pop('carrier_id'): row for row in rows}
@@ -0,0 +1,245 @@
+"""
+Batched location enrichment for jobs.
+
+Job.save() only flags rows with needs_enrichment. This module fills in
+zip_code, zip_source, latitude, longitude and location_source for many jobs
+at once, so geocoding (which may hit external services) never runs inside
+a request, an admin save or an import loop.
+"""
+import re
+from decimal import Decimal
+from functools import lru_cache
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from . import catalog, gazetteer, geocode_cache
+from .models import Carrier, Job
+from .geocoding import geocode_zip
+from .utils import get_coordinates_for_zips
+from .zip_utils import geocode_location_to_zip
+
+
+def clean_zip(zip_code):
+    return str(zip_code).strip()[:5] if zip_code else None
+
+
+LOCATION_RE = re.compile(r'([^,]+),\s*([A-Z]{2})')
+
+ENRICHED_FIELDS = [
+    'zip_code', 'zip_source', 'hiring_radius_miles',
+    'latitude', 'longitude', 'location_source', 'needs_enrichment',
+    *Job.PARSED_FIELDS,
+]
+
+# Enriched values that count as a change to the job (the flag is bookkeeping)
+CHANGE_FIELDS = [Job._meta.get_field(name) for name in ENRICHED_FIELDS if name != 'needs_enrichment']
+
+
+def stored_values(job):
+    """A job's enriched values as the database keeps them, to tell which jobs a run changed"""
+    values = []
+    for field in CHANGE_FIELDS:
+        value = field.to_python(getattr(job, field.attname))
+        if isinstance(value, Decimal):
+            value = round(value, field.decimal_places)
+        values.append(value)
+    return values
+
+
+def locate_carrier_headquarters(carriers, remote=False):
+    """
+    Resolve headquarters_zip to coordinates (and a missing state code) for
+    many carriers with one vectorized lookup against the local ZIP table.
+
+    Args:
+        carriers: Carrier instances (modified in place, not saved)
+        remote (bool): Also try the remote geocoder for ZIPs that are in
+                       neither the local table nor the geocode cache
+
+    Returns:
+        list: Carriers whose headquarters location fields changed
+    """
+    zips = {clean_zip(carrier.headquarters_zip) for carrier in carriers if carrier.headquarters_zip}
+    found = get_coordinates_for_zips(zips)
+    for zip_code, entry in geocode_cache.get_many('zip', zips - found.keys()).items():
+        if entry.found:
+            found[zip_code] = (entry.latitude, entry.longitude, entry.state)
+    if remote:
+        for zip_code in zips - found.keys():
+            lat, lng = geocode_zip(zip_code)
+            if lat is not None and lng is not None:
+                entry = geocode_cache.get('zip', zip_code)
+                found[zip_code] = (lat, lng, entry.state if entry else None)
+
+    changed = []
+    for carrier in carriers:
+        lat, lng, state = found.get(clean_zip(carrier.headquarters_zip), (None, None, None))
+        location = (
+            round(lat, 6) if lat is not None else None,
+            round(lng, 6) if lng is not None else None,
+            carrier.headquarters_state or state,
+        )
+        current = (
+            round(float(carrier.headquarters_latitude), 6) if carrier.headquarters_latitude is not None else None,
+            round(float(carrier.headquarters_longitude), 6) if carrier.headquarters_longitude is not None else None,
+            carrier.headquarters_state,
+        )
+        if location != current:
+            carrier.headquarters_latitude, carrier.headquarters_longitude, carrier.headquarters_state = location
+            changed.append(carrier)
+    return changed
+
+
+def reset_carrier_hq_locations(carrier):
+    """
+    After a carrier headquarters change, re-point the affected jobs of that
+    carrier in a single UPDATE: jobs whose zip came from the HQ get the new
+    HQ zip, and those jobs plus HQ-located and state-only jobs take the
+    carrier's stored HQ coordinates. If the HQ couldn't be located they are
+    flagged for enrichment instead.
+
+    Returns:
+        int: Number of jobs updated
+    """
+    zip_from_hq = Q(zip_source='carrier_hq')
+    located = carrier.headquarters_latitude is not None and carrier.headquarters_longitude is not None
+    if located:
+        location_source = Case(When(zip_from_hq, then=Value('job_zip')), default=Value('carrier_hq'))
+    else:
+        location_source = None
+    jobs = Job.objects.filter(
+        Q(carrier=carrier),
+        zip_from_hq | Q(location_source__in=['carrier_hq', 'state_only']),
+    )
+    with transaction.atomic():
+        ids = list(jobs.values_list('id', flat=True))
+        if not ids:
+            return 0
+        updated = Job.objects.filter(pk__in=ids).update(
+            zip_code=Case(When(zip_from_hq, then=Value(carrier.headquarters_zip)), default=F('zip_code')),
+            latitude=carrier.headquarters_latitude,
+            longitude=carrier.headquarters_longitude,
+            location_source=location_source,
+            needs_enrichment=not located,
+            updated_at=timezone.now(),
+        )
+        catalog.log_changes('job', upserted=ids)
+    return updated
+
+
+def location_settled(job):
+    """
+    Whether enrichment reached a final answer for a job: it has coordinates,
+    or every lookup it depends on has a cached result (a cached negative
+    entry is a definite "unknown"). Lookups that failed for a transient
+    reason (network error, open circuit) cache nothing, so those jobs stay
+    flagged and are retried by the next run.
+    """
+    if job.latitude is not None and job.longitude is not None:
+        return True
+
+    zips = {clean_zip(job.zip_code)} if job.zip_code else set()
+    if job.carrier and job.carrier.headquarters_zip:
+        zips.add(clean_zip(job.carrier.headquarters_zip))
+    zips = {zip_code for zip_code in zips if zip_code.isdigit() and len(zip_code) == 5}
+    if len(geocode_cache.get_many('zip', zips)) < len(zips):
+        return False
+
+    match = LOCATION_RE.match((job.state or '').strip())
+    if not job.zip_code and match and not gazetteer.peek(*match.groups()):
+        return geocode_cache.get('location', gazetteer.make_key(*match.groups())) is not None
+    return True
+
+
+def prefetch_geocodes(jobs):
+    """
+    Warm the geocode cache for a batch of jobs with one query per key kind,
+    so the per-job lookups in populate_location are served from memory.
+    """
+    zips = set()
+    locations = set()
+    for job in jobs:
+        if job.zip_code:
+            zips.add(clean_zip(job.zip_code))
+        if job.carrier and job.carrier.headquarters_zip and job.carrier.headquarters_latitude is None:
+            zips.add(clean_zip(job.carrier.headquarters_zip))
+        match = LOCATION_RE.match((job.state or '').strip())
+        if match:
+            locations.add(gazetteer.make_key(*match.groups()))
+
+    geocode_cache.get_many('zip', zips)
+    geocode_cache.get_many('location', locations)
+
+
+def locate_batch_carriers(jobs, force=False):
+    """
+    Store headquarters coordinates on the carriers of a batch of jobs that
+    don't have them yet (all of them with force), so get_job_location can
+    use them without a lookup.
+    """
+    carriers = {}
+    for job in jobs:
+        carrier = job.carrier
+        if carrier and carrier.headquarters_zip and (force or carrier.headquarters_latitude is None):
+            carriers.setdefault(carrier.pk, []).append(carrier)
+    if not carriers:
+        return
+
+    changed = locate_carrier_headquarters([group[0] for group in carriers.values()], remote=True)
+    if changed:
+        Carrier.objects.bulk_update(changed, list(Carrier.HEADQUARTERS_LOCATION_FIELDS))
+    # select_related gives every job its own carrier instance
+    for first, *others in carriers.values():
+        for carrier in others:
+            for field in Carrier.HEADQUARTERS_LOCATION_FIELDS:
+                setattr(carrier, field, getattr(first, field))
+
+
+def enrich_jobs(jobs=None, batch_size=500, force=False):
+    """
+    Resolve zip codes and coordinates for jobs and save them in bulk.
+
+    Args:
+        jobs: Job queryset to enrich (default: all jobs flagged needs_enrichment)
+        batch_size (int): Number of jobs loaded and written per batch
+        force (bool): Recompute coordinates even if the job already has them
+
+    Returns:
+        int: Number of jobs enriched (jobs whose lookups failed stay flagged)
+    """
+    if jobs is None:
+        jobs = Job.objects.filter(needs_enrichment=True)
+
+    # Each distinct ZIP / "City, ST" string is resolved once per run
+    location_to_zip = lru_cache(maxsize=None)(geocode_location_to_zip)
+    zip_to_coords = lru_cache(maxsize=None)(geocode_zip)
+
+    job_ids = list(jobs.order_by('id').values_list('id', flat=True))
+    enriched = 0
+
+    for start in range(0, len(job_ids), batch_size):
+        batch = list(
+            Job.objects.select_related('carrier').filter(pk__in=job_ids[start:start + batch_size])
+        )
+        prefetch_geocodes(batch)
+        locate_batch_carriers(batch, force)
+        now = timezone.now()
+        changed = []
+        for job in batch:
+            before = stored_values(job)
+            if force:
+                job.latitude = job.longitude = job.location_source = None
+            job.populate_location(location_to_zip=location_to_zip, zip_to_coords=zip_to_coords)
+            job.refresh_parsed_fields()
+            job.needs_enrichment = not location_settled(job)
+            if stored_values(job) != before:
+                job.updated_at = now
+                changed.append(job.pk)
+
+        with transaction.atomic():
+            Job.objects.bulk_update(batch, [*ENRICHED_FIELDS, 'updated_at'])
+            if changed:
+                catalog.log_changes('job', upserted=changed)
+        enriched += sum(1 for job in batch if not job.needs_enrichment)
+
+    return enriched
@@ -0,0 +1,184 @@
+"""
+Server-sent events for job changes.
+
+Writes in this process publish a compact event (id, carrier, hiring
+status, active flag of each changed job, plus deleted ids) to an
+in-process broadcaster once their transaction commits (see
+catalog.log_changes). Every connected stream gets its own queue.
+
+Event ids are catalog versions, so a reconnecting client's Last-Event-ID
+is resolved against the change log (catalog.changes_since) and the
+client catches up on everything it missed, including writes made by
+other processes (imports, other workers). Streams also check the catalog
+version at each heartbeat to pick those up while connected.
+
+Streams hold a connection open, so they are only served under ASGI
+(jobstream_backend/asgi.py).
+"""
+import asyncio
+import json
+import threading
+from asgiref.sync import sync_to_async
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+
+# Events queued for a slow client before it is sent a catch-up from the change log instead
+MAX_PENDING_EVENTS = 100
+
+# Larger changes (e.g. imports) tell clients to reload instead of listing every job
+MAX_EVENT_JOBS = 500
+
+EVENT_FIELDS = ('id', 'carrier_id', 'hiring_status', 'is_active')
+
+
+class Subscription:
+    """One connected stream: a queue fed from the broadcaster on the stream's event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self.overflowed = False
+
+    def offer(self, event):
+        # Runs on self.loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Broadcaster:
+    """Fans events out to the subscriptions of this process (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        with self._lock:
+            return bool(self._subscriptions)
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The stream's event loop has shut down
+                self.unsubscribe(subscription)
+
+
+broadcaster = Broadcaster()
+
+
+def build_event(version, upserted, deleted):
+    """
+    Compact event for changed jobs.
+
+    Args:
+        version (int): Catalog version of the change
+        upserted: Ids of created or updated jobs
+        deleted: Ids of deleted jobs
+
+    Returns:
+        dict: {'version', 'jobs', 'deleted'} or {'version', 'reload': True}
+              for changes too large to list; None if nothing changed
+    """
+    from .models import Job
+
+    if not upserted and not deleted:
+        return None
+    if len(upserted) + len(deleted) > MAX_EVENT_JOBS:
+        return {'version': version, 'reload': True}
+    jobs = list(Job.objects.filter(pk__in=upserted).order_by('id').values(*EVENT_FIELDS))
+    # Jobs deleted since the change was logged
+    gone = set(upserted) - {job['id'] for job in jobs}
+    return {'version': version, 'jobs': jobs, 'deleted': sorted(set(deleted) | gone)}
+
+
+def publish_job_changes(version, upserted=(), deleted=()):
+    """Publish committed job changes to the streams of this process."""
+    if not broadcaster.has_subscribers():
+        return
+    event = build_event(version, list(upserted), list(deleted))
+    if event is not None:
+        broadcaster.publish(event)
+
+
+def catch_up(version):
+    """
+    The event bringing a client from a catalog version to the current one.
+
+    Returns:
+        tuple: (current version, event or None)
+    """
+    from . import catalog
+
+    current, changes = catalog.changes_since(version)
+    if changes is None:
+        return current, {'version': current, 'reload': True}
+    jobs = changes['job']
+    return current, build_event(current, list(jobs['upserted']), list(jobs['deleted']))
+
+
+def format_event(event):
+    kind = 'reload' if event.get('reload') else 'jobs'
+    return f"id: {event['version']}\nevent: {kind}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(last_version=None):
+    """
+    Server-sent event stream of job changes.
+
+    Args:
+        last_version (int): Last-Event-ID of a reconnecting client; new
+                            clients get a 'ready' event with the current version
+    """
+    from . import catalog
+
+    # Subscribe before reading the change log so nothing falls in between
+    subscription = broadcaster.subscribe()
+    pending = last_version is not None
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if last_version is None:
+            last_version = await sync_to_async(catalog.current_version)()
+            yield f'id: {last_version}\nevent: ready\ndata: {json.dumps({"version": last_version})}\n\n'
+
+        while True:
+            if pending or subscription.overflowed:
+                subscription.overflowed = False
+                current, event = await sync_to_async(catch_up)(last_version)
+                if event is not None:
+                    yield format_event(event)
+                last_version = max(last_version, current)
+                pending = False
+
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                # Writes made by other processes only show up in the change log
+                pending = await sync_to_async(catalog.current_version)() > last_version
+                continue
+
+            if event['version'] == last_version + 1:
+                yield format_event(event)
+                last_version = event['version']
+            elif event['version'] > last_version:
+                # Versions in between were written by another process
+                pending = True
+    finally:
+        broadcaster.unsubscribe(subscription)
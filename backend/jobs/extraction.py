@@ -0,0 +1,318 @@
+"""
+Structured fact extraction from job posting text.
+
+One combined, precompiled pattern scans a text blob once and collects
+every fact the app uses: "Must Live Within X miles of ZIP", hiring-area
+ZIPs, CPM and weekly pay figures, home time, experience, states and all
+"Label: value" lines. Results are memoized by a hash of the text, so
+unchanged text is never parsed twice in a process.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from decimal import Decimal
+
+CACHE_SIZE = 5000
+
+US_STATES = frozenset((
+    'AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO '
+    'MT NE NV NH NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC'
+).split())
+
+# Alternatives are tried in order at each position, so the specific
+# phrases come before the generic "Label:" and bare ZIP matches.
+FACTS_RE = re.compile(r"""
+  (?=[mh$.\d]|^)  # cheap prefilter: only positions where an alternative can start
+  (?:
+    must\s+live\s+within[:\s]+(?P<radius>\d+)\s*miles?\s*of\s*(?P<must_zip>\d{5})
+  | hiring\s+area\s+zip\s+codes?(?:\(s\))?[:\s]+(?P<area_zips>\d{5}(?:\s*[,;/&]\s*\d{5})*)
+  | ^[ \t]*(?P<label>[A-Za-z][A-Za-z0-9 /&()'–-]{0,60}?)[ \t]*:(?=[ \t]*(?P<value>[^\n]*))
+  | \$?[ ]?(?P<cpm_lo>\d?\.\d{2,3})(?:\s*(?:[–-]|to)\s*\$?[ ]?(?P<cpm_hi>\d?\.\d{2,3}))?
+        \s*(?:cpm\b|cents\s+per\s+mile|per\s+mile)
+  | \$[ ]?(?P<money_lo>\d{1,2},\d{3}|\d{3,5})(?:\.\d{2})?
+        (?:\s*(?:[–-]|to)\s*\$?[ ]?(?P<money_hi>\d{1,2},\d{3}|\d{3,5})(?:\.\d{2})?)?
+        (?P<per_week>\s*(?:per\s+week|/\s*(?:wk|week)|a\s+week|weekly))?
+  | \b(?P<zip>\d{5})\b
+  )
+""", re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+
+ZIP_RE = re.compile(r'\b\d{5}\b')
+MILES_RE = re.compile(r'\b(\d{1,2},\d{3}|\d{3,4})\b')
+STATE_CODE_RE = re.compile(r'\b[A-Z]{2}\b')
+DURATION_RE = re.compile(r'(\d+)\s*(months?|mos?|years?|yrs?)\b', re.IGNORECASE)
+NO_EXPERIENCE_RE = re.compile(r'\b(?:trainees?|students?|no experience|recent grads?)\b', re.IGNORECASE)
+
+# Labels whose dollar figures are weekly pay (others, e.g. stop pay, are ignored)
+WEEKLY_PAY_LABEL_RE = re.compile(r'week|earnings|salary|^pay\b|pay range|compensation', re.IGNORECASE)
+OTHER_PAY_LABEL_RE = re.compile(r'stop|unload|short haul|bonus|detention|layover|orientation', re.IGNORECASE)
+
+# "Pay Type" values mapped to the normalized pay_type column, first match wins
+PAY_TYPE_RULES = [
+    ('hourly', re.compile(r'hour', re.IGNORECASE)),
+    ('salary', re.compile(r'salary', re.IGNORECASE)),
+    ('percentage', re.compile(r'percent|%', re.IGNORECASE)),
+    ('cpm', re.compile(r'cpm|mile', re.IGNORECASE)),
+    ('weekly', re.compile(r'week', re.IGNORECASE)),
+]
+
+# Facet values: (value, pattern) in priority order; home time takes the first match
+FREIGHT_TYPE_RULES = [
+    ('dry_van', re.compile(r'\bdry\b', re.IGNORECASE)),
+    ('reefer', re.compile(r'reefer|refrigerated', re.IGNORECASE)),
+    ('flatbed', re.compile(r'flatbed|step ?deck', re.IGNORECASE)),
+    ('intermodal', re.compile(r'intermodal|container', re.IGNORECASE)),
+    ('tanker', re.compile(r'tank', re.IGNORECASE)),
+]
+DRIVER_TYPE_RULES = [
+    ('company', re.compile(r'company', re.IGNORECASE)),
+    ('owner_operator', re.compile(r'owner|\bo/o\b', re.IGNORECASE)),
+    ('lease_purchase', re.compile(r'lease', re.IGNORECASE)),
+    ('team', re.compile(r'\bteams?\b', re.IGNORECASE)),
+]
+HOME_TIME_RULES = [
+    ('daily', re.compile(r'daily|nightly|every (?:night|day)', re.IGNORECASE)),
+    ('biweekly', re.compile(r'bi-?weekly|every (?:other|2|two) weeks?|14 days', re.IGNORECASE)),
+    ('weekly', re.compile(r'week', re.IGNORECASE)),
+    ('otr', re.compile(r'\botr\b|over the road|month|\d+\s*(?:days|weeks) out', re.IGNORECASE)),
+]
+
+# CPM differentials ("night differential $0.06 CPM") are not base pay
+MIN_BASE_CPM = 0.20
+WEEKLY_PAY_RANGE = (300, 10000)
+
+
+class JobFacts(namedtuple('JobFacts', [
+    'must_live_radius', 'must_live_zip', 'hiring_area_zips', 'zips',
+    'cpm_min', 'cpm_max', 'weekly_pay_min', 'weekly_pay_max', 'pay_type',
+    'weekly_miles', 'home_time', 'experience', 'experience_months', 'states', 'fields',
+])):
+    """Everything extracted from one text blob. Lists are tuples, fields is label -> value."""
+
+    def zip_hint(self):
+        """
+        Best zip code for the job: the must-live ZIP, then the first
+        hiring-area ZIP, then the first ZIP anywhere in the text.
+
+        Returns:
+            tuple: (zip_code, hiring_radius_miles) or (None, None)
+        """
+        if self.must_live_zip:
+            return self.must_live_zip, self.must_live_radius
+        if self.hiring_area_zips:
+            return self.hiring_area_zips[0], None
+        if self.zips:
+            return self.zips[0], None
+        return None, None
+
+    def field(self, label):
+        """Value of a "Label: value" line (case-insensitive), or None."""
+        return self.fields.get(normalize_label(label))
+
+    def pay_columns(self):
+        """
+        Numeric pay values for the indexed Job pay columns.
+
+        The weekly estimate is the midpoint of the stated weekly pay, else
+        the midpoint CPM times the stated weekly miles.
+
+        Returns:
+            dict: cpm_min, cpm_max, weekly_pay_estimate and pay_type
+        """
+        estimate = None
+        if self.weekly_pay_min:
+            estimate = round((self.weekly_pay_min + self.weekly_pay_max) / 2)
+        elif self.cpm_min and self.weekly_miles:
+            estimate = round((self.cpm_min + self.cpm_max) / 2 * self.weekly_miles)
+
+        pay_type = next(
+            (name for name, pattern in PAY_TYPE_RULES if self.pay_type and pattern.search(self.pay_type)),
+            None,
+        )
+        if pay_type is None:
+            pay_type = 'weekly' if self.weekly_pay_min else 'cpm' if self.cpm_min else None
+
+        return {
+            'cpm_min': _cents(self.cpm_min),
+            'cpm_max': _cents(self.cpm_max),
+            'weekly_pay_estimate': estimate,
+            'pay_type': pay_type,
+        }
+
+    def facet_columns(self):
+        """
+        Normalized values for the Job facet columns. Multi-valued facets
+        are stored comma-delimited with surrounding commas (",dry_van,reefer,")
+        so one value can be matched with a plain contains lookup.
+
+        Returns:
+            dict: freight_types, driver_types, home_time and experience_months
+        """
+        freight = ' '.join(filter(None, (
+            self.field('Freight Types'), self.field('Freight Type'), self.field('Freight'),
+        )))
+        drivers = ' '.join(filter(None, (self.field('Driver Types'), self.field('Driver Type'))))
+        return {
+            'freight_types': _delimited(FREIGHT_TYPE_RULES, freight),
+            'driver_types': _delimited(DRIVER_TYPE_RULES, drivers),
+            'home_time': next(
+                (name for name, pattern in HOME_TIME_RULES if self.home_time and pattern.search(self.home_time)),
+                None,
+            ),
+            'experience_months': self.experience_months,
+        }
+
+
+def normalize_label(label):
+    return ' '.join(label.lower().split())
+
+
+def _money(value):
+    return int(value.replace(',', '')) if value else None
+
+
+def _cents(value):
+    return Decimal(str(round(value, 3))) if value is not None else None
+
+
+def _delimited(rules, text):
+    values = [name for name, pattern in rules if text and pattern.search(text)]
+    return f",{','.join(values)}," if values else None
+
+
+def _weekly_miles(fields):
+    value = fields.get('weekly mileage') or fields.get('avg weekly miles') or fields.get('mileage')
+    miles = [int(number.replace(',', '')) for number in MILES_RE.findall(value or '')]
+    return round(sum(miles) / len(miles)) if miles else None
+
+
+def _experience_months(value):
+    durations = [
+        int(number) * (12 if unit.lower().startswith('y') else 1)
+        for number, unit in DURATION_RE.findall(value)
+    ]
+    if durations:
+        return min(durations)
+    if NO_EXPERIENCE_RE.search(value):
+        return 0
+    return None
+
+
+def _parse(text):
+    must_live_radius = must_live_zip = None
+    area_zips = []
+    zips = []
+    cpms = []
+    weekly = []
+    fields = {}
+    states = []
+    label = None
+    label_end = 0
+
+    for match in FACTS_RE.finditer(text):
+        if match.group('must_zip'):
+            if must_live_zip is None:
+                must_live_radius = int(match.group('radius'))
+                must_live_zip = match.group('must_zip')
+            zips.append(match.group('must_zip'))
+        elif match.group('area_zips'):
+            found = ZIP_RE.findall(match.group('area_zips'))
+            area_zips.extend(found)
+            zips.extend(found)
+        elif match.group('label') is not None:
+            label = normalize_label(match.group('label'))
+            label_end = match.end()
+            value = match.group('value').strip()
+            if value and label not in fields:
+                fields[label] = value
+            if label in ('states', 'state') or label.startswith('states '):
+                states.extend(code for code in STATE_CODE_RE.findall(value) if code in US_STATES)
+        elif match.group('cpm_lo'):
+            for value in (match.group('cpm_lo'), match.group('cpm_hi')):
+                if value and float(value) >= MIN_BASE_CPM:
+                    cpms.append(float(value))
+        elif match.group('money_lo'):
+            # The line's label, if the figure is on the same line as one
+            line_label = label if label and '\n' not in text[label_end:match.start()] else None
+            weekly_context = match.group('per_week') or (
+                line_label and WEEKLY_PAY_LABEL_RE.search(line_label)
+                and not OTHER_PAY_LABEL_RE.search(line_label)
+            )
+            if weekly_context:
+                for value in (_money(match.group('money_lo')), _money(match.group('money_hi'))):
+                    if value and WEEKLY_PAY_RANGE[0] <= value <= WEEKLY_PAY_RANGE[1]:
+                        weekly.append(value)
+        elif match.group('zip'):
+            zips.append(match.group('zip'))
+
+    home_time = fields.get('home time') or fields.get('exact home time')
+    # A posting can have several experience labels ("Experience Requirements:
+    # First Seat", "Experience Levels: 0 to 6 Months"); use the first that parses
+    experiences = [value for key, value in fields.items() if key.startswith('experience')]
+    experience, experience_months = next(
+        ((value, months) for value in experiences if (months := _experience_months(value)) is not None),
+        (experiences[0] if experiences else None, None),
+    )
+    return JobFacts(
+        must_live_radius=must_live_radius,
+        must_live_zip=must_live_zip,
+        hiring_area_zips=tuple(area_zips),
+        zips=tuple(zips),
+        cpm_min=min(cpms) if cpms else None,
+        cpm_max=max(cpms) if cpms else None,
+        weekly_pay_min=min(weekly) if weekly else None,
+        weekly_pay_max=max(weekly) if weekly else None,
+        pay_type=fields.get('pay type'),
+        weekly_miles=_weekly_miles(fields),
+        home_time=home_time,
+        experience=experience,
+        experience_months=experience_months,
+        states=tuple(dict.fromkeys(states)),
+        fields=fields,
+    )
+
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def extract_facts(text):
+    """
+    Extract all structured facts from a text blob.
+
+    Args:
+        text (str): Posting text (may be empty or None)
+
+    Returns:
+        JobFacts: Shared, cached result; treat it as read-only
+    """
+    text = text or ''
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    with _lock:
+        facts = _cache.get(key)
+        if facts is not None:
+            _cache.move_to_end(key)
+            return facts
+
+    facts = _parse(text)
+    with _lock:
+        _cache[key] = facts
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return facts
+
+
+def job_text(job):
+    """All consolidated text sections of a job as one blob."""
+    return '\n'.join(filter(None, [
+        job.job_details,
+        job.pay_details,
+        job.equipment_details,
+        job.key_disqualifiers,
+        job.requirements_details,
+    ]))
+
+
+def extract_job_facts(job):
+    """Extract facts from all of a job's text sections."""
+    return extract_facts(job_text(job))
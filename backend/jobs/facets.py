@@ -0,0 +1,157 @@
+"""
+Facet filters and counts for the job list.
+
+Facet values live in indexed columns parsed from the job text (see
+Job.refresh_parsed_fields). Counts for the unfiltered catalog are cached
+per catalog version, so a facet sidebar costs no aggregation until the
+catalog changes; filtered counts are aggregated per request.
+"""
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, Q
+from . import catalog
+from .extraction import DRIVER_TYPE_RULES, FREIGHT_TYPE_RULES
+from .models import Job
+
+CACHE_KEY = 'jobs:facets:{version}'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Comma-delimited columns: any of the requested values matches
+MULTI_VALUE_FACETS = {
+    'freight_type': ('freight_types', [name for name, _ in FREIGHT_TYPE_RULES]),
+    'driver_type': ('driver_types', [name for name, _ in DRIVER_TYPE_RULES]),
+}
+SINGLE_VALUE_FACETS = {
+    'home_time': 'home_time',
+    'hiring_status': 'hiring_status',
+    'experience_months': 'experience_months',
+}
+
+
+def facet_filters(params):
+    """
+    Translate facet query params into a Q object. Each param takes a
+    comma-separated list of values (any of them matches);
+    max_experience_months keeps jobs requiring at most that much experience.
+
+    Raises:
+        ValueError: On an unknown facet value or a non-numeric number
+    """
+    filters = Q()
+    for param, (column, values) in MULTI_VALUE_FACETS.items():
+        if params.get(param):
+            requested = params[param].split(',')
+            if not set(values).issuperset(requested):
+                raise ValueError(f"{param} must be one of: {', '.join(values)}")
+            any_of = Q()
+            for value in requested:
+                any_of |= Q(**{f'{column}__contains': f',{value},'})
+            filters &= any_of
+    for param in ('home_time', 'hiring_status'):
+        if params.get(param):
+            filters &= Q(**{f'{param}__in': params[param].split(',')})
+    if params.get('carrier'):
+        try:
+            filters &= Q(carrier_id__in=[int(pk) for pk in params['carrier'].split(',')])
+        except ValueError:
+            raise ValueError('carrier must be a list of carrier ids')
+    if params.get('max_experience_months'):
+        try:
+            months = int(params['max_experience_months'])
+        except ValueError:
+            raise ValueError('max_experience_months must be a number')
+        filters &= Q(experience_months__lte=months) | Q(experience_months__isnull=True)
+    return filters
+
+
+def _label(param, value):
+    if param in MULTI_VALUE_FACETS:
+        return value.replace('_', ' ').title()
+    if param == 'home_time':
+        return dict(Job.HOME_TIME_CHOICES).get(value, value)
+    if param == 'hiring_status':
+        return dict(Job.HIRING_STATUS_CHOICES).get(value, value)
+    if param == 'experience_months':
+        return 'No experience' if value == 0 else f'{value} months'
+    return value
+
+
+def _entries(param, counts, labels=None):
+    return [
+        {
+            'value': value,
+            'label': labels[value] if labels else _label(param, value),
+            'count': count,
+        }
+        for value, count in sorted(counts.items(), key=lambda item: -item[1])
+        if value is not None and count
+    ]
+
+
+def count_queryset(queryset):
+    """
+    Aggregate facet counts over a job queryset in the database.
+
+    Returns:
+        dict: facet name -> list of {'value', 'label', 'count'}, largest first
+    """
+    queryset = queryset.order_by()
+    facets = {}
+    for param, (column, values) in MULTI_VALUE_FACETS.items():
+        totals = queryset.aggregate(**{
+            value: Count('id', filter=Q(**{f'{column}__contains': f',{value},'})) for value in values
+        })
+        facets[param] = _entries(param, totals)
+
+    for param, column in SINGLE_VALUE_FACETS.items():
+        facets[param] = _entries(param, dict(queryset.values_list(column).annotate(n=Count('id'))))
+
+    carriers = list(queryset.values_list('carrier_id', 'carrier__name').annotate(n=Count('id')))
+    facets['carrier'] = _entries(
+        'carrier',
+        {pk: count for pk, _, count in carriers},
+        {pk: name for pk, name, _ in carriers},
+    )
+    return facets
+
+
+def count_jobs(jobs):
+    """
+    Facet counts for an already loaded list of jobs (e.g. radius search
+    results), in Python. Carriers must be loaded (select_related).
+    """
+    counts = {param: {} for param in (*MULTI_VALUE_FACETS, *SINGLE_VALUE_FACETS, 'carrier')}
+    carrier_names = {}
+    for job in jobs:
+        for param, (column, _) in MULTI_VALUE_FACETS.items():
+            for value in filter(None, (getattr(job, column) or '').split(',')):
+                counts[param][value] = counts[param].get(value, 0) + 1
+        for param, column in SINGLE_VALUE_FACETS.items():
+            value = getattr(job, column)
+            counts[param][value] = counts[param].get(value, 0) + 1
+        counts['carrier'][job.carrier_id] = counts['carrier'].get(job.carrier_id, 0) + 1
+        carrier_names[job.carrier_id] = job.carrier.name
+    return {
+        param: _entries(param, param_counts, carrier_names if param == 'carrier' else None)
+        for param, param_counts in counts.items()
+    }
+
+
+def catalog_counts():
+    """Facet counts for all active jobs, cached per catalog version."""
+    key = CACHE_KEY.format(version=catalog.current_version())
+    facets = cache.get(key)
+    if facets is None:
+        facets = count_queryset(Job.objects.filter(is_active=True))
+        cache.set(key, facets, CACHE_TIMEOUT)
+    return facets
+
+
+async def acatalog_counts():
+    """Async variant of catalog_counts(); only a cache miss aggregates (in a thread)."""
+    key = CACHE_KEY.format(version=await catalog.acurrent_version())
+    facets = await cache.aget(key)
+    if facets is None:
+        facets = await sync_to_async(count_queryset)(Job.objects.filter(is_active=True))
+        await cache.aset(key, facets, CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,153 @@
+"""
+Offline city/state -> ZIP gazetteer.
+
+Maps a normalized (city, state) pair to a representative ZIP code and the
+city's coordinates, so "City, ST" strings can be resolved without calling
+the Census geocoder. The index is built from the pgeocode US dataset
+(see the build_gazetteer command) and bundled as a gzipped TSV file.
+"""
+import csv
+import gzip
+import os
+import re
+from math import radians, cos
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'us_gazetteer.tsv.gz')
+
+# Common abbreviations in city names, expanded the way the dataset spells them
+CITY_ABBREVIATIONS = {
+    'st': 'saint',
+    'ste': 'sainte',
+    'ft': 'fort',
+    'mt': 'mount',
+    'pt': 'point',
+}
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]+')
+_SPACES_RE = re.compile(r'\s+')
+
+_index = None
+
+# Hit/miss counters for the current process, reported by importers
+stats = {'hits': 0, 'misses': 0}
+
+
+def normalize_city(city):
+    """Lowercase, drop punctuation and expand abbreviations ('St. Louis' -> 'saint louis')."""
+    city = _NON_ALNUM_RE.sub(' ', city.lower().replace('.', ' '))
+    words = _SPACES_RE.sub(' ', city).strip().split(' ')
+    return ' '.join(CITY_ABBREVIATIONS.get(word, word) for word in words if word)
+
+
+def make_key(city, state):
+    return f"{normalize_city(city)}|{state.strip().upper()}"
+
+
+def build_index(rows):
+    """
+    Build the gazetteer from (zip, city, state, latitude, longitude) rows.
+
+    The representative ZIP of a city is the one closest to the centroid of
+    all of the city's ZIPs; the centroid is used as the city's coordinates.
+
+    Returns:
+        dict: key -> (zip, latitude, longitude)
+    """
+    cities = {}
+    for zip_code, city, state, lat, lon in rows:
+        if not (zip_code and city and state) or lat is None or lon is None:
+            continue
+        cities.setdefault(make_key(city, state), []).append((zip_code, lat, lon))
+
+    index = {}
+    for key, zips in cities.items():
+        lat_c = sum(lat for _, lat, _ in zips) / len(zips)
+        lon_c = sum(lon for _, _, lon in zips) / len(zips)
+        scale = cos(radians(lat_c))
+        representative = min(
+            zips,
+            key=lambda z: (z[1] - lat_c) ** 2 + ((z[2] - lon_c) * scale) ** 2
+        )[0]
+        index[key] = (representative, round(lat_c, 6), round(lon_c, 6))
+    return index
+
+
+def rows_from_pgeocode():
+    """Yield gazetteer rows from the US dataset file pgeocode caches on disk."""
+    import pgeocode
+    from .utils import get_geocoder
+
+    path = os.path.join(pgeocode.STORAGE_DIR, 'US.txt')
+    if not os.path.exists(path):
+        # pgeocode downloads and caches the dataset on first use
+        get_geocoder()
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            try:
+                lat, lon = float(row['latitude']), float(row['longitude'])
+            except ValueError:
+                continue
+            yield row['postal_code'].zfill(5), row['place_name'], row['state_code'], lat, lon
+
+
+def write_index(index, path=DATA_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for key in sorted(index):
+            zip_code, lat, lon = index[key]
+            f.write(f"{key}\t{zip_code}\t{lat}\t{lon}\n")
+
+
+def read_index(path=DATA_PATH):
+    index = {}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            key, zip_code, lat, lon = line.rstrip('\n').split('\t')
+            index[key] = (zip_code, float(lat), float(lon))
+    return index
+
+
+def get_index():
+    """
+    Load the gazetteer once per process. Falls back to building it from the
+    local pgeocode dataset when the bundled file hasn't been generated.
+    """
+    global _index
+    if _index is None:
+        try:
+            if os.path.exists(DATA_PATH):
+                _index = read_index()
+            else:
+                _index = build_index(rows_from_pgeocode())
+        except Exception as e:
+            print(f"Gazetteer unavailable: {e}")
+            _index = {}
+    return _index
+
+
+def lookup(city, state):
+    """
+    Resolve a city/state pair locally.
+
+    Returns:
+        tuple: (zip_code, latitude, longitude) or None if the city is unknown
+    """
+    result = get_index().get(make_key(city, state))
+    stats['hits' if result else 'misses'] += 1
+    return result
+
+
+def peek(city, state):
+    """lookup() without counting toward the hit/miss stats, for re-checking a known pair."""
+    return get_index().get(make_key(city, state))
+
+
+def reset_stats():
+    stats['hits'] = 0
+    stats['misses'] = 0
+
+
+def format_stats():
+    total = stats['hits'] + stats['misses']
+    rate = f" ({stats['hits'] / total:.0%} hit rate)" if total else ''
+    return f"{stats['hits']} hits, {stats['misses']} misses{rate}"
@@ -0,0 +1,175 @@
+"""
+Geocode cache: a process-local LRU in front of the GeocodeCache table.
+
+Every lookup path (geocode_zip, get_coordinates_from_zip and
+geocode_location_to_zip) checks here first, so each ZIP or "City, ST"
+string is resolved once across all workers and import runs.
+
+Keys with no row in the table are remembered as absent for ABSENT_TTL
+seconds, so repeated lookups of an unknown key (e.g. a driver ZIP on every
+search request) don't query the table each time. The marker is short-lived
+because another process may store the key meanwhile.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+LRU_SIZE = 20000
+ABSENT_TTL = 60
+
+CachedGeocode = namedtuple('CachedGeocode', 'latitude longitude zip_code state source found fetched_at')
+
+_lru = OrderedDict()
+# (kind, key) -> monotonic time until which the key is known to have no row
+_absent = OrderedDict()
+_lock = threading.Lock()
+
+
+def _negative_ttl():
+    return timedelta(seconds=getattr(settings, 'GEOCODE_NEGATIVE_CACHE_TTL', 60 * 60 * 24 * 7))
+
+
+def _from_row(row):
+    latitude = float(row.latitude) if row.latitude is not None else None
+    longitude = float(row.longitude) if row.longitude is not None else None
+    found = latitude is not None or bool(row.zip_code)
+    return CachedGeocode(latitude, longitude, row.zip_code, row.state, row.source, found, row.fetched_at)
+
+
+def _expired(entry):
+    return not entry.found and entry.fetched_at < timezone.now() - _negative_ttl()
+
+
+def _remember(kind, key, entry):
+    with _lock:
+        _absent.pop((kind, key), None)
+        _lru[(kind, key)] = entry
+        _lru.move_to_end((kind, key))
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def get(kind, key):
+    """
+    Look up one key.
+
+    Returns:
+        CachedGeocode or None if the key is unknown (or its negative entry expired).
+        A returned entry with found=False is a cached "could not resolve".
+    """
+    return get_many(kind, [key]).get(key)
+
+
+def get_many(kind, keys):
+    """
+    Look up many keys with at most one query.
+
+    Args:
+        kind (str): 'zip' or 'location'
+        keys (iterable): Keys to resolve
+
+    Returns:
+        dict: key -> CachedGeocode for every key that is cached
+    """
+    from .models import GeocodeCache
+
+    found = {}
+    missing = []
+    now = time.monotonic()
+    with _lock:
+        for key in set(keys):
+            entry = _lru.get((kind, key))
+            if entry is not None and not _expired(entry):
+                _lru.move_to_end((kind, key))
+                found[key] = entry
+            elif _absent.get((kind, key), 0) <= now:
+                missing.append(key)
+
+    if missing:
+        for row in GeocodeCache.objects.filter(kind=kind, key__in=missing):
+            entry = _from_row(row)
+            if not _expired(entry):
+                _remember(kind, row.key, entry)
+                found[row.key] = entry
+
+        with _lock:
+            for key in missing:
+                if key not in found:
+                    _absent[(kind, key)] = now + ABSENT_TTL
+                    _absent.move_to_end((kind, key))
+            while len(_absent) > LRU_SIZE:
+                _absent.popitem(last=False)
+
+    return found
+
+
+def put(kind, key, latitude=None, longitude=None, zip_code=None, state=None, source=None):
+    """
+    Store a result. Leave latitude/longitude and zip_code empty to record a
+    negative entry for a key that could not be resolved.
+    """
+    from .models import GeocodeCache
+
+    GeocodeCache.objects.update_or_create(
+        kind=kind,
+        key=key,
+        defaults={
+            'latitude': round(latitude, 6) if latitude is not None else None,
+            'longitude': round(longitude, 6) if longitude is not None else None,
+            'zip_code': zip_code,
+            'state': state,
+            'source': source,
+        },
+    )
+    found = latitude is not None or bool(zip_code)
+    _remember(kind, key, CachedGeocode(latitude, longitude, zip_code, state, source, found, timezone.now()))
+
+
+def put_many(kind, entries):
+    """
+    Store many results with one upsert.
+
+    Args:
+        kind (str): 'zip' or 'location'
+        entries (dict): key -> dict of put() keyword arguments
+    """
+    from .models import GeocodeCache
+
+    now = timezone.now()
+    rows = []
+    for key, values in entries.items():
+        latitude = values.get('latitude')
+        longitude = values.get('longitude')
+        rows.append(GeocodeCache(
+            kind=kind,
+            key=key,
+            latitude=round(latitude, 6) if latitude is not None else None,
+            longitude=round(longitude, 6) if longitude is not None else None,
+            zip_code=values.get('zip_code'),
+            state=values.get('state'),
+            source=values.get('source'),
+            fetched_at=now,
+        ))
+        found = latitude is not None or bool(values.get('zip_code'))
+        _remember(kind, key, CachedGeocode(
+            latitude, longitude, values.get('zip_code'), values.get('state'),
+            values.get('source'), found, now,
+        ))
+
+    GeocodeCache.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['kind', 'key'],
+        update_fields=['latitude', 'longitude', 'zip_code', 'state', 'source', 'fetched_at'],
+    )
+
+
+def clear_local():
+    """Drop the process-local LRU (the table is left untouched)."""
+    with _lock:
+        _lru.clear()
+        _absent.clear()
@@ -3,8 +3,8 @@ Geocoding utilities for ZIP code-based job search.
 Uses ZipCodeAPI for converting ZIP codes to lat/long coordinates.
 """
 
-import requests
 from typing import Tuple, Optional
+from .remote_geocoder import get_session
 
 
 def geocode_zip(zip_code: str) -> Tuple[Optional[float], Optional[float]]:
@@ -24,6 +24,11 @@ def geocode_zip(zip_code: str) -> Tuple[Optional[float], Optional[float]]:
     if not clean_zip.isdigit() or len(clean_zip) < 5:
         return None, None
 
+    from . import geocode_cache
+    cached = geocode_cache.get('zip', clean_zip)
+    if cached:
+        return cached.latitude, cached.longitude
+
     # Try local pgeocode first for speed and consistency
     try:
         from .utils import get_coordinates_from_zip
@@ -36,20 +41,28 @@ def geocode_zip(zip_code: str) -> Tuple[Optional[float], Optional[float]]:
     # Fallback: Use Zippopotam.us (free, no key required)
     try:
         url = f"https://api.zippopotam.us/us/{clean_zip}"
-        response = requests.get(url, timeout=3)
+        response = get_session().get(url, timeout=3)
         
         if response.status_code == 200:
             data = response.json()
             if 'places' in data and len(data['places']) > 0:
                 place = data['places'][0]
-                return float(place.get('latitude')), float(place.get('longitude'))
+                lat, lng = float(place.get('latitude')), float(place.get('longitude'))
+                geocode_cache.put(
+                    'zip', clean_zip, lat, lng,
+                    state=place.get('state abbreviation'), source='zippopotam',
+                )
+                return lat, lng
+        if response.status_code in (200, 404):
+            # Definitive "unknown ZIP": remember it so it isn't retried every call
+            geocode_cache.put('zip', clean_zip, source='zippopotam')
     except Exception as e:
         print(f"Geocoding fallback error for ZIP {clean_zip}: {e}")
     
     return None, None
 
 
-def get_job_location(job) -> Tuple[Optional[float], Optional[float], str]:
+def get_job_location(job, zip_to_coords=None) -> Tuple[Optional[float], Optional[float], str]:
     """
     Determine best location for a job using multi-tier strategy.
     
@@ -59,21 +72,28 @@ def get_job_location(job) -> Tuple[Optional[float], Optional[float], str]:
     
     Args:
         job: Job model instance
+        zip_to_coords: Optional replacement for geocode_zip
+                       (e.g. a memoized version used by batch enrichment)
     
     Returns:
         Tuple of (latitude, longitude, location_source)
         location_source will be: 'job_zip', 'carrier_hq', or 'state_only'
     """
     
+    geocode = zip_to_coords or geocode_zip
+
     # Tier 1: Job ZIP Code
     if job.zip_code:
-        lat, lng = geocode_zip(job.zip_code)
+        lat, lng = geocode(job.zip_code)
         if lat is not None and lng is not None:
             return lat, lng, 'job_zip'
     
-    # Tier 2: Carrier Headquarters ZIP
-    if job.carrier and job.carrier.headquarters_zip:
-        lat, lng = geocode_zip(job.carrier.headquarters_zip)
+    # Tier 2: Carrier Headquarters (stored on the carrier when it was located)
+    carrier = job.carrier
+    if carrier and carrier.headquarters_latitude is not None and carrier.headquarters_longitude is not None:
+        return float(carrier.headquarters_latitude), float(carrier.headquarters_longitude), 'carrier_hq'
+    if carrier and carrier.headquarters_zip:
+        lat, lng = geocode(carrier.headquarters_zip)
         if lat is not None and lng is not None:
             return lat, lng, 'carrier_hq'
     
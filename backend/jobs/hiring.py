@@ -0,0 +1,36 @@
+"""
+Hiring status updates without Job.save().
+
+Toggling a job between open and full only touches hiring_status, so it
+skips the serializer and the save hooks (location reset, text parsing):
+the jobs are changed with one UPDATE, and the carrier counters and the
+change log are written in the same transaction.
+"""
+from django.db import transaction
+from django.utils import timezone
+from . import catalog, counters
+from .models import Job
+
+
+def set_hiring_status(jobs, hiring_status):
+    """
+    Set the hiring status of every job in a queryset.
+
+    Args:
+        jobs: Job QuerySet to update
+        hiring_status (str): One of Job.HIRING_STATUS_CHOICES
+
+    Returns:
+        tuple: (number of jobs changed, catalog version after the change)
+    """
+    with transaction.atomic():
+        # The changed ids go to the change log, so they are selected (and locked) first
+        changing = dict(
+            jobs.exclude(hiring_status=hiring_status).select_for_update()
+            .order_by().values_list('id', 'carrier_id')
+        )
+        if not changing:
+            return 0, catalog.current_version()
+        updated = Job.objects.filter(pk__in=changing).update(hiring_status=hiring_status, updated_at=timezone.now())
+        counters.refresh_carrier_counts(set(changing.values()))
+        return updated, catalog.log_changes('job', upserted=list(changing))
@@ -0,0 +1,377 @@
+"""
+Shared helpers for the CSV/XLSX import commands.
+
+Row parsing here must stay free of database access: parse_job_file runs in
+worker processes during multi-file imports.
+"""
+import csv
+import hashlib
+import json
+from django.db import transaction
+from . import catalog, counters, rendering
+
+
+CARRIER_COLUMNS = {
+    'headquarters_zip': 'headquarters_zip',
+    'headquarters_city': 'headquarters_city',
+    'headquarters_state': 'headquarters_state',
+    'description': 'carrier_description',
+    'website': 'website',
+    'contact_email': 'contact_email',
+    'contact_phone': 'contact_phone',
+
+    # Benefits
+    'benefit_401k': 'benefit_401k',
+    'benefit_disability_life': 'benefit_disability_life',
+    'benefit_stock_purchase': 'benefit_stock_purchase',
+    'benefit_medical_dental_vision': 'benefit_medical_dental_vision',
+    'benefit_paid_vacation': 'benefit_paid_vacation',
+    'benefit_prescription_drug': 'benefit_prescription_drug',
+    'benefit_weekly_paycheck': 'benefit_weekly_paycheck',
+    'benefit_driver_ranking_bonus': 'benefit_driver_ranking_bonus',
+    'benefit_military_program': 'benefit_military_program',
+    'benefit_tuition_program': 'benefit_tuition_program',
+    'benefit_other': 'benefit_other',
+}
+
+# Consolidated job sections and the CSV columns folded into each one.
+# The column named after the section is used as-is; older template columns
+# are appended as "Label: value" lines.
+SECTION_COLUMNS = {
+    'job_details': [
+        'job_details', 'account_overview', 'administrative_details', 'description',
+        'home_time', 'exact_home_time', 'load_unload_type', 'orientation_details',
+        'orientation_table', 'account_type', 'freight_types',
+    ],
+    'pay_details': [
+        'pay_details', 'pay_range', 'average_weekly_pay', 'salary', 'pay_type',
+        'short_haul_pay', 'stop_pay', 'unload_pay', 'bonus_offer',
+    ],
+    'equipment_details': ['equipment_details', 'transmissions', 'cameras'],
+    'key_disqualifiers': ['key_disqualifiers'],
+    'requirements_details': [
+        'requirements_details', 'experience_levels', 'driver_types', 'trainees_accepted',
+        'drug_test_type', 'sap_required', 'states',
+    ],
+}
+
+
+def build_section(row, section):
+    """Fold the CSV columns of one consolidated section into a single text block."""
+    parts = []
+    for column in SECTION_COLUMNS[section]:
+        value = (row.get(column) or '').strip()
+        if not value:
+            continue
+        if column == section:
+            parts.append(value)
+        else:
+            parts.append(f"{column.replace('_', ' ').title()}: {value}")
+    return '\n'.join(parts) or None
+
+
+def job_key(carrier_id, title, state):
+    """Identity of a job within an import: carrier, title and (known) state."""
+    return (carrier_id, title, state if state != 'Unknown' else None)
+
+
+def compute_content_hash(row):
+    """
+    Build a stable SHA-256 hash of a source row.
+
+    Keys are sorted and values are stripped so that column order and
+    surrounding whitespace don't change the hash. Empty values are dropped,
+    which keeps the hash stable when a partner adds an empty column.
+
+    Args:
+        row (dict): Source row (e.g. a csv.DictReader row)
+
+    Returns:
+        str: 64 character hex digest
+    """
+    normalized = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            normalized[str(key).strip()] = value
+
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def carrier_content_hash(carrier_data):
+    """
+    Content hash of a carrier's imported values. Every carrier importer
+    hashes the same representation, the model field values it is about to
+    store, so a carrier written by one importer is unchanged for another.
+
+    Args:
+        carrier_data (dict): Carrier model field name -> value
+
+    Returns:
+        str: 64 character hex digest
+    """
+    return compute_content_hash({
+        field: value for field, value in carrier_data.items() if field not in ('name', 'content_hash')
+    })
+
+
+def classify_by_hash(incoming, existing):
+    """
+    Compare incoming rows against stored hashes in one pass.
+
+    Args:
+        incoming (dict): key -> content hash of rows in the current import
+        existing (dict): key -> (pk, stored content hash) of matching database rows
+
+    Returns:
+        dict: 'new', 'changed' and 'unchanged' lists of incoming keys
+    """
+    result = {'new': [], 'changed': [], 'unchanged': []}
+
+    for key, content_hash in incoming.items():
+        if key not in existing:
+            result['new'].append(key)
+        elif existing[key][1] == content_hash:
+            result['unchanged'].append(key)
+        else:
+            result['changed'].append(key)
+
+    return result
+
+
+def parse_job_file(path):
+    """
+    Parse and normalize one jobs CSV file without touching the database.
+
+    Args:
+        path (str): Path to the CSV file
+
+    Returns:
+        dict: 'path', 'rows' as (row_num, carrier_name, carrier_data, job_data)
+              tuples and 'errors' as messages
+    """
+    rows = []
+    errors = []
+
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or []
+
+            # Check for carrier identity column
+            carrier_col = 'carrier_name' if 'carrier_name' in fieldnames else 'carrier'
+            title_col = 'title' if 'title' in fieldnames else 'job_title'
+
+            if carrier_col not in fieldnames or title_col not in fieldnames:
+                errors.append(f'{path}: Missing required columns. Found: {", ".join(fieldnames)}')
+                return {'path': path, 'rows': rows, 'errors': errors}
+
+            for row_num, row in enumerate(reader, start=2):
+                try:
+                    # Aliases are resolved later, in the parent (CarrierResolver)
+                    carrier_name = (row.get(carrier_col) or '').strip()
+                    if not carrier_name:
+                        errors.append(f'{path} row {row_num}: Missing carrier name')
+                        continue
+
+                    job_title = (row.get(title_col) or '').strip()
+                    if not job_title:
+                        errors.append(f'{path} row {row_num}: Missing job title')
+                        continue
+
+                    carrier_data = {
+                        field: (row.get(column) or '').strip() or None
+                        for field, column in CARRIER_COLUMNS.items()
+                    }
+
+                    # Build job data dictionary matching model fields
+                    job_data = {
+                        'title': job_title[:200],
+                        'state': (row.get('state') or '').strip() or 'Unknown',
+                        'zip_code': (row.get('zip_code') or '').strip() or None,
+                        'hiring_radius_miles': int(row.get('hiring_radius_miles', 50) or 50),
+                        'is_active': True,
+                        'content_hash': compute_content_hash(row),
+                    }
+                    for section in SECTION_COLUMNS:
+                        job_data[section] = build_section(row, section)
+
+                    rows.append((row_num, carrier_name, carrier_data, job_data))
+                except Exception as e:
+                    errors.append(f'{path} row {row_num}: {str(e)}')
+    except Exception as e:
+        errors.append(f'{path}: {str(e)}')
+
+    return {'path': path, 'rows': rows, 'errors': errors}
+
+
+class CarrierResolver:
+    """
+    Single point of carrier resolution for an import run.
+
+    Carriers are looked up and created in bulk by name, so parallel parsing
+    never races on the unique Carrier.name constraint. Names that are not
+    an exact carrier name are resolved through the alias table and fuzzy
+    matching (jobs.carrier_lookup) before a new carrier is created.
+    """
+
+    def __init__(self):
+        self.carriers = {}
+        self.created = 0
+
+    def resolve(self, carrier_rows):
+        """
+        Make sure every carrier name is loaded, creating missing ones.
+
+        Args:
+            carrier_rows (dict): carrier name -> field values for new carriers
+        """
+        from .carrier_lookup import DEFAULT_ALIASES, match_carriers, remember_aliases
+        from .models import Carrier
+
+        missing = [name for name in carrier_rows if name not in self.carriers]
+        if not missing:
+            return
+
+        self.carriers.update(Carrier.objects.in_bulk(missing, field_name='name'))
+        unknown = [name for name in missing if name not in self.carriers]
+        if unknown:
+            self.carriers.update(match_carriers(unknown))
+
+        # Built-in aliases of carriers that don't exist yet create the canonical name
+        new_names = {}
+        for name in missing:
+            if name not in self.carriers:
+                new_names.setdefault(DEFAULT_ALIASES.get(name, name), []).append(name)
+        new_carriers = [
+            Carrier(name=canonical, content_hash=carrier_content_hash(carrier_rows[names[0]]), **carrier_rows[names[0]])
+            for canonical, names in new_names.items()
+        ]
+        if new_carriers:
+            # Another importer may have created the same name meanwhile
+            Carrier.objects.bulk_create(new_carriers, ignore_conflicts=True)
+            self.created += len(new_carriers)
+            created = Carrier.objects.in_bulk(list(new_names), field_name='name')
+            catalog.log_changes('carrier', upserted=[carrier.pk for carrier in created.values()])
+            for canonical, names in new_names.items():
+                for name in names:
+                    self.carriers[name] = created[canonical]
+            remember_aliases({
+                name: created[canonical]
+                for canonical, names in new_names.items() for name in names if name != canonical
+            })
+
+            # bulk_create skips Carrier.save(), so locate new headquarters here
+            from .enrichment import locate_carrier_headquarters
+            located = locate_carrier_headquarters(list(created.values()))
+            if located:
+                Carrier.objects.bulk_update(located, list(Carrier.HEADQUARTERS_LOCATION_FIELDS))
+
+    def get(self, name):
+        return self.carriers.get(name)
+
+
+class JobWriter:
+    """
+    Buffers job inserts and updates and writes them with bulk_create /
+    bulk_update, one transaction per batch. Written jobs are left flagged
+    for the enrichment stage instead of being geocoded here.
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.pending_creates = []
+        self.pending_updates = {}
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    def create(self, label, job_data):
+        from .models import Job
+
+        job = Job(**job_data)
+        if job.zip_code:
+            job.zip_source = 'provided'
+        job.refresh_parsed_fields()
+        self.pending_creates.append((label, job))
+        if len(self.pending_creates) >= self.batch_size:
+            self.flush_creates()
+
+    def update(self, label, pk, job_data):
+        self.pending_updates[pk] = (label, job_data)
+        if len(self.pending_updates) >= self.batch_size:
+            self.flush_updates()
+
+    def flush(self):
+        # Updates first: rows whose job was deleted meanwhile are queued as creates
+        self.flush_updates()
+        self.flush_creates()
+
+    def flush_creates(self):
+        from .models import Job
+
+        if not self.pending_creates:
+            return
+        batch, self.pending_creates = self.pending_creates, []
+
+        try:
+            with transaction.atomic():
+                Job.objects.bulk_create([job for _, job in batch])
+                counters.refresh_carrier_counts({job.carrier_id for _, job in batch})
+                catalog.log_changes('job', upserted=[job.pk for _, job in batch])
+            self.created += len(batch)
+            rendering.cache_rendered([job for _, job in batch])
+        except Exception:
+            # Fall back to row-by-row so one bad row doesn't drop the batch
+            for label, job in batch:
+                try:
+                    job.pk = None
+                    job.save()
+                    self.created += 1
+                except Exception as e:
+                    self.errors.append(f'{label}: {str(e)}')
+
+    def flush_updates(self):
+        from django.utils import timezone
+        from .models import Job
+
+        if not self.pending_updates:
+            return
+        batch, self.pending_updates = self.pending_updates, {}
+
+        jobs = Job.objects.select_related('carrier').in_bulk(list(batch))
+        fields = {'updated_at', 'needs_enrichment'}
+        now = timezone.now()
+        for pk, (label, job_data) in batch.items():
+            job = jobs.get(pk)
+            if job is None:
+                # Deleted since the row was classified: the row still describes a job
+                self.create(label, job_data)
+                continue
+            for field, value in job_data.items():
+                if field != 'carrier':
+                    setattr(job, field, value)
+                    fields.add(field)
+            job.updated_at = now
+            fields.update(job.refresh_parsed_fields())
+            # A changed zip/state invalidates the stored coordinates
+            fields.update(job.reset_stale_location())
+            if job.zip_code and not job.zip_source:
+                job.zip_source = 'provided'
+                fields.add('zip_source')
+            # Location is resolved later by jobs.enrichment
+            job.needs_enrichment = job.needs_enrichment or job.location_missing()
+
+        try:
+            with transaction.atomic():
+                Job.objects.bulk_update(list(jobs.values()), sorted(fields))
+                # Updates can reactivate jobs
+                counters.refresh_carrier_counts({job.carrier_id for job in jobs.values()})
+                catalog.log_changes('job', upserted=list(jobs))
+            self.updated += len(jobs)
+            rendering.cache_rendered(jobs.values())
+        except Exception as e:
+            self.errors.extend(f'{batch[pk][0]}: {str(e)}' for pk in jobs)
@@ -0,0 +1,131 @@
+"""
+Django management command to recompute latitude/longitude for every job
+in one pass.
+
+All distinct job ZIPs and carrier headquarters ZIPs are resolved with a
+single vectorized lookup against the local ZIP table (falling back to
+geocode cache entries from the remote providers), joined back to the jobs
+in memory and written with one UPDATE per distinct location. Carrier
+headquarters coordinates are refreshed as well. Run it after refreshing
+the pgeocode dataset.
+
+Usage:
+    python manage.py backfill_coordinates
+    python manage.py backfill_coordinates --dry-run
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from jobs import catalog, geocode_cache
+from jobs.enrichment import clean_zip, locate_carrier_headquarters
+from jobs.models import Carrier, GeocodeCache, Job
+from jobs.utils import get_coordinates_for_zips
+
+UPDATE_CHUNK = 1000
+
+
+class Command(BaseCommand):
+    help = 'Recompute coordinates for all jobs from the local ZIP table in one pass'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many jobs would change without writing',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        rows = list(Job.objects.values_list(
+            'id', 'zip_code', 'carrier__headquarters_zip', 'latitude', 'longitude', 'location_source',
+            'needs_enrichment',
+        ))
+        zips = {clean_zip(z) for _, job_zip, hq_zip, *_ in rows for z in (job_zip, hq_zip) if z}
+        self.stdout.write(f'Resolving {len(zips)} distinct ZIPs for {len(rows)} jobs...')
+
+        coordinates = get_coordinates_for_zips(zips)
+        local_count = len(coordinates)
+
+        # ZIPs missing from the local table may have been resolved remotely before
+        remote = geocode_cache.get_many('zip', zips - coordinates.keys())
+        stale = []
+        for zip_code, entry in remote.items():
+            if entry.source == 'pgeocode':
+                stale.append(zip_code)
+            elif entry.found:
+                coordinates[zip_code] = (entry.latitude, entry.longitude, entry.state)
+
+        # Group jobs by their new (latitude, longitude, location_source)
+        groups = {}
+        unchanged = 0
+        for job_id, job_zip, hq_zip, lat, lon, source, flagged in rows:
+            target = (None, None, 'state_only')
+            for zip_code, tier in ((clean_zip(job_zip), 'job_zip'), (clean_zip(hq_zip), 'carrier_hq')):
+                if zip_code in coordinates:
+                    new_lat, new_lon, _ = coordinates[zip_code]
+                    target = (round(new_lat, 6), round(new_lon, 6), tier)
+                    break
+            current = (
+                round(float(lat), 6) if lat is not None else None,
+                round(float(lon), 6) if lon is not None else None,
+                source,
+            )
+            # Jobs located from their own ZIP are done; written below to clear the flag
+            if current == target and not (flagged and target[2] == 'job_zip'):
+                unchanged += 1
+            else:
+                groups.setdefault(target, []).append(job_id)
+
+        changed = sum(len(ids) for ids in groups.values())
+
+        carriers = list(
+            Carrier.objects.filter(Q(headquarters_zip__gt='') | Q(headquarters_latitude__isnull=False))
+            .only('id', 'headquarters_zip', *Carrier.HEADQUARTERS_LOCATION_FIELDS)
+        )
+
+        if not options['dry_run']:
+            now = timezone.now()
+            with transaction.atomic():
+                for (lat, lon, source), ids in groups.items():
+                    values = {'latitude': lat, 'longitude': lon, 'location_source': source, 'updated_at': now}
+                    if source == 'job_zip':
+                        # Located from its own ZIP: nothing left for enrich_jobs to do
+                        # (a ZIP without a source was given with the job)
+                        values['zip_source'] = Case(
+                            When(Q(zip_source__isnull=True) | Q(zip_source=''), then=Value('provided')),
+                            default=F('zip_source'),
+                        )
+                        values['needs_enrichment'] = False
+                    for start in range(0, len(ids), UPDATE_CHUNK):
+                        Job.objects.filter(id__in=ids[start:start + UPDATE_CHUNK]).update(**values)
+                if groups:
+                    catalog.log_changes('job', upserted=[pk for ids in groups.values() for pk in ids])
+                # Refresh cached local results so lookups match the new dataset
+                GeocodeCache.objects.filter(kind='zip', key__in=stale).delete()
+                geocode_cache.clear_local()
+                geocode_cache.put_many('zip', {
+                    zip_code: {'latitude': lat, 'longitude': lon, 'state': state, 'source': 'pgeocode'}
+                    for zip_code, (lat, lon, state) in coordinates.items()
+                    if zip_code not in remote
+                })
+                located = locate_carrier_headquarters(carriers)
+                Carrier.objects.bulk_update(located, list(Carrier.HEADQUARTERS_LOCATION_FIELDS))
+        else:
+            located = locate_carrier_headquarters(carriers)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write('\n' + '=' * 60)
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('[DRY RUN] No changes were made'))
+        self.stdout.write(self.style.SUCCESS(f'✓ Jobs updated: {changed}'))
+        self.stdout.write(f'  Jobs unchanged: {unchanged}')
+        self.stdout.write(f'  Carrier headquarters updated: {len(located)}')
+        self.stdout.write(
+            f'  ZIPs resolved: {local_count} local, {len(coordinates) - local_count} cached remote, '
+            f'{len(zips) - len(coordinates)} unknown'
+        )
+        self.stdout.write(f'  Time: {elapsed:.2f}s')
+        self.stdout.write('=' * 60)
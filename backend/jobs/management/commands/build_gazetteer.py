@@ -0,0 +1,26 @@
+"""
+Django management command to (re)build the bundled city/state -> ZIP
+gazetteer from the pgeocode US dataset.
+
+Usage:
+    python manage.py build_gazetteer
+"""
+from django.core.management.base import BaseCommand
+from jobs import gazetteer
+
+
+class Command(BaseCommand):
+    help = 'Build the offline city/state -> ZIP gazetteer from the pgeocode US dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=gazetteer.DATA_PATH,
+            help=f'Where to write the gazetteer (default: {gazetteer.DATA_PATH})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Loading pgeocode US dataset...')
+        index = gazetteer.build_index(gazetteer.rows_from_pgeocode())
+        gazetteer.write_index(index, options['output'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {len(index)} cities to {options["output"]}'))
@@ -0,0 +1,56 @@
+"""
+Django management command to fill in zip codes and coordinates for jobs
+flagged by Job.save() as needing enrichment.
+
+Usage:
+    python manage.py enrich_jobs
+    python manage.py enrich_jobs --all
+    python manage.py enrich_jobs --watch 30
+"""
+import time
+from django.core.management.base import BaseCommand
+from jobs import gazetteer
+from jobs.enrichment import enrich_jobs
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Resolve zip codes and coordinates for jobs that need enrichment'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-enrich every job, recomputing coordinates',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of jobs processed per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--watch',
+            type=int,
+            metavar='SECONDS',
+            help='Keep running as a worker, checking for new jobs every SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['all']:
+            count = enrich_jobs(Job.objects.all(), batch_size=batch_size, force=True)
+            self.stdout.write(self.style.SUCCESS(f'✓ Enriched {count} jobs'))
+            self.stdout.write(f'  Gazetteer: {gazetteer.format_stats()}')
+            return
+
+        while True:
+            count = enrich_jobs(batch_size=batch_size)
+            if count or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(f'✓ Enriched {count} jobs'))
+                self.stdout.write(f'  Gazetteer: {gazetteer.format_stats()}')
+                gazetteer.reset_stats()
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
@@ -0,0 +1,174 @@
+"""
+Django management command to resolve, over the network, the job and
+carrier locations that the local datasets (pgeocode and the gazetteer)
+could not resolve.
+
+Lookups run concurrently over a pooled HTTP session, rate limited and
+protected by a circuit breaker; results land in the geocode cache and the
+affected jobs are flagged for enrichment.
+
+Usage:
+    python manage.py geocode_backfill
+    python manage.py geocode_backfill --workers 16 --rate 10
+    python manage.py geocode_backfill --zip-url http://localhost:8001/us/{zip}
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from jobs import gazetteer, geocode_cache
+from jobs.models import Carrier, Job
+from jobs.remote_geocoder import CircuitOpenError, RemoteGeocoder, TransientError
+from jobs.utils import get_coordinates_for_zips
+
+LOCATION_RE = re.compile(r'([^,]+),\s*([A-Z]{2})')
+
+
+class Command(BaseCommand):
+    help = 'Resolve locally unknown ZIPs and "City, ST" locations through the remote geocoders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default: 8)')
+        parser.add_argument('--rate', type=float, default=5, help='Requests per second per run (default: 5)')
+        parser.add_argument('--retries', type=int, default=3, help='Retries per lookup (default: 3)')
+        parser.add_argument('--limit', type=int, help='Resolve at most this many keys')
+        parser.add_argument('--zip-url', help='ZIP lookup URL template containing {zip}')
+        parser.add_argument('--census-url', help='Census address geocoder URL')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report which keys would be looked up',
+        )
+
+    def collect_misses(self):
+        """
+        Return (zips, locations) that are neither in the local datasets nor
+        in the geocode cache. locations maps a gazetteer key to the
+        (city, state) pair and the raw strings that produced it.
+        """
+        zips = set(
+            z.strip()[:5] for z in Job.objects.exclude(zip_code__isnull=True)
+            .exclude(zip_code='').values_list('zip_code', flat=True).distinct()
+        )
+        zips |= set(
+            z.strip()[:5] for z in Carrier.objects.exclude(headquarters_zip__isnull=True)
+            .exclude(headquarters_zip='').values_list('headquarters_zip', flat=True).distinct()
+        )
+        zips = {z for z in zips if z.isdigit() and len(z) == 5}
+        uncached = zips - geocode_cache.get_many('zip', zips).keys()
+        # One vectorized pgeocode query; local hits are cached for the lookup paths
+        local = get_coordinates_for_zips(uncached)
+        if local:
+            geocode_cache.put_many('zip', {
+                z: {'latitude': lat, 'longitude': lng, 'state': state, 'source': 'pgeocode'}
+                for z, (lat, lng, state) in local.items()
+            })
+        zip_misses = sorted(uncached - local.keys())
+
+        locations = {}
+        raw_states = (
+            Job.objects.filter(Q(zip_code__isnull=True) | Q(zip_code=''))
+            .values_list('state', flat=True).distinct()
+        )
+        for raw in raw_states:
+            match = LOCATION_RE.match((raw or '').strip())
+            if not match:
+                continue
+            city, state = match.groups()
+            key = gazetteer.make_key(city, state)
+            entry = locations.setdefault(key, {'city': city, 'state': state, 'raw': []})
+            entry['raw'].append(raw)
+        cached = geocode_cache.get_many('location', locations)
+        location_misses = {
+            key: entry for key, entry in locations.items()
+            if key not in cached and gazetteer.lookup(entry['city'], entry['state']) is None
+        }
+        return zip_misses, location_misses
+
+    def handle(self, *args, **options):
+        zip_misses, location_misses = self.collect_misses()
+        tasks = [('zip', z) for z in zip_misses] + [('location', k) for k in sorted(location_misses)]
+        if options['limit']:
+            tasks = tasks[:options['limit']]
+
+        self.stdout.write(
+            f'Found {len(zip_misses)} unknown ZIPs and {len(location_misses)} unknown locations'
+        )
+        if options['dry_run'] or not tasks:
+            for kind, key in tasks:
+                self.stdout.write(f'  {kind}: {key}')
+            return
+
+        geocoder = RemoteGeocoder(
+            zip_url=options['zip_url'],
+            census_url=options['census_url'],
+            rate=options['rate'],
+            workers=options['workers'],
+            retries=options['retries'],
+        )
+
+        def resolve(kind, key):
+            if kind == 'zip':
+                return geocoder.resolve_zip(key)
+            entry = location_misses[key]
+            return geocoder.resolve_location(entry['city'], entry['state'])
+
+        results = {'zip': {}, 'location': {}}
+        resolved_zips = []
+        resolved_locations = []
+        resolved_location_keys = 0
+        not_found = 0
+        failed = 0
+        skipped = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(resolve, kind, key): (kind, key) for kind, key in tasks}
+            for future in as_completed(futures):
+                kind, key = futures[future]
+                try:
+                    result = future.result()
+                except CircuitOpenError:
+                    skipped += 1
+                    continue
+                except TransientError as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'✗ {kind} {key}: {e}'))
+                    continue
+
+                results[kind][key] = result
+                if result.get('latitude') is None and not result.get('zip_code'):
+                    not_found += 1
+                elif kind == 'zip':
+                    resolved_zips.append(key)
+                else:
+                    resolved_location_keys += 1
+                    resolved_locations.extend(location_misses[key]['raw'])
+
+        # One upsert per kind, on the main thread
+        for kind, entries in results.items():
+            if entries:
+                geocode_cache.put_many(kind, entries)
+
+        flagged = 0
+        if resolved_zips or resolved_locations:
+            flagged = Job.objects.filter(
+                Q(zip_code__in=resolved_zips)
+                | Q(carrier__headquarters_zip__in=resolved_zips)
+                | Q(state__in=resolved_locations)
+            ).update(needs_enrichment=True)
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Resolved: {len(resolved_zips)} ZIPs, {resolved_location_keys} locations'
+        ))
+        self.stdout.write(f'  Not found (cached as misses): {not_found}')
+        if failed:
+            self.stdout.write(self.style.ERROR(f'  Failed after retries: {failed}'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'  Skipped while a provider circuit was open: {skipped}'
+            ))
+        self.stdout.write(f'  Jobs flagged for enrichment: {flagged}')
+        if flagged:
+            self.stdout.write('  Run "python manage.py enrich_jobs" to apply the new locations')
+        self.stdout.write('=' * 60)
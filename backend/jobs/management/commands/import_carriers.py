@@ -7,6 +7,7 @@ Usage:
 
 from django.core.management.base import BaseCommand
 from jobs.models import Carrier
+from jobs.import_utils import carrier_content_hash
 import csv
 import os
 
@@ -40,6 +41,7 @@ class Command(BaseCommand):
         carriers_created = 0
         carriers_updated = 0
         carriers_skipped = 0
+        carriers_unchanged = 0
         errors = []
 
         try:
@@ -51,6 +53,9 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.ERROR('Missing required column: name'))
                     return
 
+                # Load stored carriers once; hashes decide which rows need writing
+                existing_carriers = Carrier.objects.in_bulk(field_name='name')
+
                 for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
                     try:
                         # Get carrier name
@@ -81,11 +86,16 @@ class Command(BaseCommand):
                             'benefit_other': row.get('benefit_other', '').strip() or None,
                         }
 
+                        content_hash = carrier_content_hash(carrier_data)
+                        carrier_data['content_hash'] = content_hash
+
                         # Check if carrier already exists
-                        existing_carrier = Carrier.objects.filter(name=carrier_name).first()
+                        existing_carrier = existing_carriers.get(carrier_name)
 
                         if existing_carrier:
-                            if update_existing:
+                            if existing_carrier.content_hash == content_hash:
+                                carriers_unchanged += 1
+                            elif update_existing:
                                 # Update existing carrier
                                 for key, value in carrier_data.items():
                                     setattr(existing_carrier, key, value)
@@ -98,6 +108,7 @@ class Command(BaseCommand):
                         else:
                             # Create new carrier
                             carrier = Carrier.objects.create(name=carrier_name, **carrier_data)
+                            existing_carriers[carrier_name] = carrier
                             carriers_created += 1
                             self.stdout.write(f'  ✅ Created: {carrier_name}')
 
@@ -117,6 +128,7 @@ class Command(BaseCommand):
         self.stdout.write(f'  Carriers created: {carriers_created}')
         self.stdout.write(f'  Carriers updated: {carriers_updated}')
         self.stdout.write(f'  Carriers skipped: {carriers_skipped}')
+        self.stdout.write(f'  Carriers unchanged: {carriers_unchanged}')
         
         if errors:
             self.stdout.write(self.style.WARNING(f'  Errors:          {len(errors)}'))
@@ -1,16 +1,42 @@
 """
 Django management command to import carriers from XLSX file.
-Preserves bold formatting by converting it to markdown-style **bold**.
+Preserves bold formatting (whole-cell bold and bold rich-text runs) by
+converting it to markdown-style **bold**.
+
+The workbook is streamed in read-only mode and carriers are written in
+batches, so large workbooks don't have to fit in memory. In read-only mode
+openpyxl keeps rich-text runs for shared strings (what Excel saves) but not
+for inline strings; use --full-load for workbooks written with inline rich text.
 
 Usage:
     python manage.py import_carriers_xlsx path/to/carriers.xlsx
+    python manage.py import_carriers_xlsx path/to/carriers.xlsx --update --batch-size 1000
 """
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from jobs import catalog
+from jobs.enrichment import locate_carrier_headquarters, reset_carrier_hq_locations
 from jobs.models import Carrier
+from jobs.import_utils import carrier_content_hash
+from openpyxl.cell.rich_text import CellRichText
 import openpyxl
 import os
 
+# Fields that may contain multi-line formatted text
+MULTI_LINE_FIELDS = ['benefit', 'description', 'presentation', 'pre_qualifications', 'app_process']
+
+
+def wrap_bold(text):
+    """Wrap text in ** markers, keeping surrounding whitespace outside them."""
+    stripped = text.strip()
+    if not stripped:
+        return text
+    start = text.index(stripped)
+    return f"{text[:start]}**{stripped}**{text[start + len(stripped):]}"
+
+
 class Command(BaseCommand):
     help = 'Import carriers from an XLSX file while preserving bold formatting'
 
@@ -25,32 +51,61 @@ class Command(BaseCommand):
             action='store_true',
             help='Update existing carriers instead of skipping them'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of carriers written per bulk insert/update (default: 500)'
+        )
+        parser.add_argument(
+            '--full-load',
+            action='store_true',
+            help='Load the whole workbook instead of streaming it (for workbooks with broken dimensions)'
+        )
 
     def process_cell(self, cell):
         """
-        Process an Excel cell. If it has rich text or bold formatting,
-        try to preserve it using markdown markers.
+        Process an Excel cell. Bold rich-text runs and whole-cell bold
+        are preserved using markdown markers.
         """
-        if cell.value is None:
+        value = cell.value
+        if value is None:
             return ""
-        
-        val = str(cell.value).strip()
+
+        if isinstance(value, CellRichText):
+            # Merge runs first so adjacent bold runs become one **...** span
+            parts = []
+            for run in value:
+                if isinstance(run, str):
+                    parts.append((False, run))
+                else:
+                    bold = bool(run.font and run.font.b)
+                    if parts and parts[-1][0] == bold:
+                        parts[-1] = (bold, parts[-1][1] + run.text)
+                    else:
+                        parts.append((bold, run.text))
+            val = "".join(wrap_bold(text) if bold else text for bold, text in parts).strip()
+        else:
+            val = str(value).strip()
         if not val:
             return ""
 
-        # Basic bold detection: if the whole cell is bold
-        if cell.font and cell.font.bold:
+        # Whole cell bold
+        if cell.font and cell.font.bold and not val.startswith('**'):
             return f"**{val}**"
-        
-        # Note: openpyxl doesn't support reading partial bolding (rich text) 
-        # as easily as it writes it, but this covers the primary use case
-        # (entire lines or headers being bold).
-        
+
         return val
 
+    def plain_value(self, cell):
+        value = cell.value
+        if value is None:
+            return None
+        return str(value).strip()
+
     def handle(self, *args, **options):
         xlsx_file = options['xlsx_file']
         update_existing = options['update']
+        batch_size = options['batch_size']
 
         if not os.path.exists(xlsx_file):
             self.stdout.write(self.style.ERROR(f'XLSX file not found: {xlsx_file}'))
@@ -59,66 +114,179 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'\n🏢 Starting carrier import from: {xlsx_file}\n'))
 
         try:
-            wb = openpyxl.load_workbook(xlsx_file, data_only=True)
+            wb = openpyxl.load_workbook(
+                xlsx_file,
+                read_only=not options['full_load'],
+                data_only=True,
+                rich_text=True,
+            )
             sheet = wb.active
-            
-            # Get headers
-            headers = [cell.value for cell in sheet[1]]
+
+            rows = sheet.iter_rows()
+            header_row = next(rows, None)
+            headers = [cell.value for cell in header_row] if header_row else []
             if 'name' not in headers:
                 self.stdout.write(self.style.ERROR('Missing required column: name'))
                 return
 
-            col_map = {name: i for i, name in enumerate(headers)}
-            
-            carriers_created = 0
-            carriers_updated = 0
+            name_idx = headers.index('name')
+
+            # Decide once per column how its cells are read
+            model_fields = {field.name for field in Carrier._meta.get_fields()}
+            columns = []
+            for i, field in enumerate(headers):
+                if not field or field == 'name':
+                    continue
+                if field not in model_fields:
+                    self.stdout.write(self.style.WARNING(f'  ⚠️  Ignoring unknown column: {field}'))
+                    continue
+                formatted = any(f in field for f in MULTI_LINE_FIELDS)
+                columns.append((i, field, self.process_cell if formatted else self.plain_value))
+
+            self.carriers_created = 0
+            # Ids, since a name repeated in the file can be written in two batches
+            self.updated_ids = set()
+            unchanged_names = set()
+            seen_names = set()
             errors = []
 
+            # Load stored carriers once; hashes decide which rows need writing.
+            # The table fields are loaded so re-parsing them doesn't query per carrier.
+            existing_carriers = Carrier.objects.only(
+                'id', 'name', 'content_hash', 'headquarters_zip',
+                *Carrier.HEADQUARTERS_LOCATION_FIELDS, *Carrier.TABLE_FIELDS,
+            ).in_bulk(field_name='name')
+            pending_creates = []
+            pending_updates = []
+
             # Iterate rows starting from the second one
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=2), start=2):
+            for row_idx, row in enumerate(rows, start=2):
                 try:
-                    name_cell = row[col_map['name']]
-                    carrier_name = str(name_cell.value or "").strip()
-                    
+                    if name_idx >= len(row):
+                        continue
+                    carrier_name = str(row[name_idx].value or "").strip()
+
                     if not carrier_name:
                         continue
 
-                    carrier_data = {}
-                    for field in headers:
-                        if field == 'name': continue
-                        cell = row[col_map[field]]
-                        
-                        # Special handling for potentially multi-line formatted fields
-                        multi_line_fields = ['benefit', 'description', 'presentation', 'pre_qualifications', 'app_process']
-                        if any(f in field for f in multi_line_fields):
-                            # We can't easily get rich text segments from openpyxl
-                            # but we can get the whole cell bold status
-                            carrier_data[field] = self.process_cell(cell)
-                        else:
-                            carrier_data[field] = str(cell.value).strip() if cell.value is not None else None
+                    carrier_data = {
+                        field: read(row[i]) if i < len(row) else None
+                        for i, field, read in columns
+                    }
+                    carrier_data['content_hash'] = carrier_content_hash(carrier_data)
 
-                    # Update or Create
-                    existing_carrier = Carrier.objects.filter(name=carrier_name).first()
+                    existing_carrier = existing_carriers.get(carrier_name)
+                    repeated = carrier_name in seen_names
+                    seen_names.add(carrier_name)
 
-                    if existing_carrier:
-                        if update_existing:
+                    if existing_carrier and (
+                        existing_carrier.pk is None or (repeated and existing_carrier in pending_updates)
+                    ):
+                        # Repeated name in this file, not written yet: the last row wins
+                        for key, value in carrier_data.items():
+                            setattr(existing_carrier, key, value)
+                    elif existing_carrier:
+                        if existing_carrier.content_hash == carrier_data['content_hash']:
+                            # Compared with what this run last wrote for a repeated name
+                            if not repeated:
+                                unchanged_names.add(carrier_name)
+                        elif update_existing:
                             for key, value in carrier_data.items():
                                 setattr(existing_carrier, key, value)
-                            existing_carrier.save()
-                            carriers_updated += 1
-                            self.stdout.write(f'  🔄 Updated: {carrier_name}')
-                        else:
+                            pending_updates.append(existing_carrier)
+                            unchanged_names.discard(carrier_name)
+                        elif not repeated:
                             self.stdout.write(self.style.WARNING(f'  ⏭️  Skipped: {carrier_name}'))
                     else:
-                        Carrier.objects.create(name=carrier_name, **carrier_data)
-                        carriers_created += 1
-                        self.stdout.write(f'  ✅ Created: {carrier_name}')
+                        carrier = Carrier(name=carrier_name, **carrier_data)
+                        # Later duplicates of this name update the pending carrier
+                        existing_carriers[carrier_name] = carrier
+                        pending_creates.append(carrier)
 
                 except Exception as e:
                     errors.append(f"Row {row_idx}: {str(e)}")
                     self.stdout.write(self.style.ERROR(f'  ❌ Error in row {row_idx}: {e}'))
 
-            self.stdout.write(f'\n📊 Summary: Created {carriers_created}, Updated {carriers_updated}, Errors {len(errors)}')
+                if len(pending_creates) >= batch_size:
+                    self.write_batch(pending_creates, [], errors)
+                    pending_creates = []
+                if len(pending_updates) >= batch_size:
+                    self.write_batch([], pending_updates, errors, [field for _, field, _ in columns])
+                    pending_updates = []
+
+            self.write_batch(pending_creates, pending_updates, errors, [field for _, field, _ in columns])
+            wb.close()
+
+            self.stdout.write(
+                f'\n📊 Summary: Created {self.carriers_created}, Updated {len(self.updated_ids)}, '
+                f'Unchanged {len(unchanged_names)}, Errors {len(errors)}'
+            )
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'\n❌ Fatal error: {str(e)}'))
+
+    def write_batch(self, creates, updates, errors, fields=()):
+        """Write one batch of new and changed carriers in a single transaction."""
+        # Bulk writes skip Carrier.save(), so parse the table fields and
+        # locate new or moved headquarters here. Updates keep their parsed
+        # tables unless the workbook has a table column.
+        tables_changed = bool(set(fields) & set(Carrier.TABLE_FIELDS))
+        for carrier in [*creates, *(updates if tables_changed else [])]:
+            carrier.refresh_parsed_tables()
+        hq_moved = [carrier for carrier in updates if carrier.has_changed('headquarters_zip')]
+        locate_carrier_headquarters([
+            carrier for carrier in [*creates, *updates]
+            if carrier in hq_moved or (carrier.headquarters_zip and carrier.headquarters_latitude is None)
+        ])
+        update_fields = list(dict.fromkeys([
+            *fields, *Carrier.HEADQUARTERS_LOCATION_FIELDS,
+            *(['parsed_tables'] if tables_changed else []), 'content_hash', 'updated_at',
+        ]))
+        try:
+            with transaction.atomic():
+                if creates:
+                    Carrier.objects.bulk_create(creates)
+                if updates:
+                    now = timezone.now()
+                    for carrier in updates:
+                        carrier.updated_at = now
+                    Carrier.objects.bulk_update(updates, update_fields)
+                    # Re-point the HQ-located jobs of carriers whose headquarters moved
+                    for carrier in hq_moved:
+                        reset_carrier_hq_locations(carrier)
+                catalog.log_changes('carrier', upserted=[carrier.pk for carrier in [*creates, *updates]])
+        except Exception:
+            # Fall back to row-by-row so one bad row doesn't drop the batch
+            creates, updates = self.save_each(creates, updates, update_fields, errors)
+
+        for carrier in updates:
+            carrier._snapshot_tracked_fields()
+        self.carriers_created += len(creates)
+        self.updated_ids.update(carrier.pk for carrier in updates)
+        for carrier in creates:
+            self.stdout.write(f'  ✅ Created: {carrier.name}')
+        for carrier in updates:
+            self.stdout.write(f'  🔄 Updated: {carrier.name}')
+
+    def save_each(self, creates, updates, update_fields, errors):
+        """
+        Save the carriers of a failed batch one at a time.
+
+        Returns:
+            tuple: (created carriers, updated carriers) that were saved
+        """
+        created, updated = [], []
+        for new, carriers in ((True, creates), (False, updates)):
+            for carrier in carriers:
+                try:
+                    with transaction.atomic():
+                        if new:
+                            carrier.pk = None
+                            carrier.save()
+                        else:
+                            carrier.save(update_fields=update_fields)
+                    (created if new else updated).append(carrier)
+                except Exception as e:
+                    errors.append(f'{carrier.name}: {str(e)}')
+                    self.stdout.write(self.style.ERROR(f'  ❌ Error saving {carrier.name}: {e}'))
+        return created, updated
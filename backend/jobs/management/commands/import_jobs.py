@@ -2,214 +2,211 @@
 Django management command to import jobs and carriers from CSV file.
 Supports all fields in the Job model and handles various CSV formats.
 
+Each job and carrier stores a content hash of its source row, so re-imports
+only touch rows whose content actually changed.
+
+A directory or glob pattern imports many files at once: files are parsed in
+a process pool, carriers are resolved by a single coordinator and jobs are
+written in batches.
+
 Usage:
     python manage.py import_jobs path/to/jobs.csv
+    python manage.py import_jobs path/to/jobs.csv --update --deactivate-vanished
+    python manage.py import_jobs path/to/drops/ --workers 8
+    python manage.py import_jobs "path/to/drops/*.csv"
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from django.core.management.base import BaseCommand
-from jobs.models import Job, Carrier
-import csv
+from django.db import connections, transaction
+from jobs import catalog, counters, gazetteer
+from jobs.models import Job
+from jobs.enrichment import enrich_jobs
+from jobs.import_utils import (
+    CarrierResolver, JobWriter, classify_by_hash, job_key, parse_job_file,
+)
+import glob
 import os
 
 
 class Command(BaseCommand):
-    help = 'Import jobs and carriers from a CSV file'
+    help = 'Import jobs and carriers from a CSV file, a directory of CSV files or a glob pattern'
 
     def add_arguments(self, parser):
         parser.add_argument(
             'csv_file',
             type=str,
-            help='Path to the CSV file to import'
+            help='Path to a CSV file, a directory of CSV files or a glob pattern'
         )
         parser.add_argument(
             '--update',
             action='store_true',
-            help='Update existing jobs instead of skipping them'
+            help='Update existing jobs whose content changed instead of skipping them'
+        )
+        parser.add_argument(
+            '--deactivate-vanished',
+            action='store_true',
+            help="Deactivate active jobs of the imported carriers that are no longer in the file(s)"
+        )
+        parser.add_argument(
+            '--enrich',
+            action='store_true',
+            help='Resolve zip codes and coordinates for the imported jobs right after the import'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of processes used to parse files (default: number of CPUs)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of jobs written per bulk insert/update (default: 500)'
+        )
+
+    def find_files(self, csv_file):
+        """Expand the csv_file argument into a sorted list of CSV paths."""
+        if os.path.isdir(csv_file):
+            return sorted(glob.glob(os.path.join(csv_file, '*.csv')))
+        if glob.has_magic(csv_file):
+            return sorted(path for path in glob.glob(csv_file) if os.path.isfile(path))
+        if os.path.exists(csv_file):
+            return [csv_file]
+
+        # Try root directory if not found in current
+        if not os.path.isabs(csv_file):
+            root_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', csv_file)
+            if os.path.exists(root_path):
+                return [root_path]
+        return []
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
         update_existing = options['update']
+        deactivate_vanished = options['deactivate_vanished']
+        workers = max(1, options['workers'])
+        verbosity = options['verbosity']
+
+        paths = self.find_files(csv_file)
+        if not paths:
+            self.stdout.write(self.style.ERROR(f'CSV file not found: {csv_file}'))
+            return
 
-        if not os.path.exists(csv_file):
-            # Try root directory if not found in current
-            if not os.path.isabs(csv_file):
-                root_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', csv_file)
-                if os.path.exists(root_path):
-                    csv_file = root_path
-                else:
-                    self.stdout.write(self.style.ERROR(f'CSV file not found: {csv_file}'))
-                    return
-            else:
-                self.stdout.write(self.style.ERROR(f'CSV file not found: {csv_file}'))
-                return
-
-        self.stdout.write(self.style.SUCCESS(f'\n📋 Starting import from: {csv_file}\n'))
-
-        # Read and process CSV
-        jobs_created = 0
-        jobs_updated = 0
-        jobs_skipped = 0
-        carriers_created = 0
+        self.stdout.write(self.style.SUCCESS(f'\n📋 Starting import from: {csv_file} ({len(paths)} file(s))\n'))
+
+        resolver = CarrierResolver()
+        writer = JobWriter(batch_size=options['batch_size'])
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
         errors = []
 
-        # Carrier mapping for consistency
-        carrier_mapping = {
-            'US Express': 'US Xpress',
-            'Swift': 'Swift Transportation'
-        }
+        # Stored jobs of every carrier seen so far, loaded once per carrier
+        lookup = {}
+        stored_ids = set()
+        loaded_carriers = set()
+        seen_keys = set()
+        seen_ids = set()
+
+        if len(paths) > 1 and workers > 1:
+            # Don't share the parent's database connection with forked workers
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(parse_job_file, paths, chunksize=max(1, len(paths) // (workers * 4)))
+        else:
+            executor = None
+            results = map(parse_job_file, paths)
 
         try:
-            with open(csv_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                
-                # Check for carrier identity column
-                carrier_col = 'carrier_name' if 'carrier_name' in reader.fieldnames else 'carrier'
-                title_col = 'title' if 'title' in reader.fieldnames else 'job_title'
-                
-                if carrier_col not in reader.fieldnames or title_col not in reader.fieldnames:
-                    self.stdout.write(self.style.ERROR(
-                        f'Missing required columns. Found: {", ".join(reader.fieldnames)}'
-                    ))
-                    return
-
-                for row_num, row in enumerate(reader, start=2):
-                    try:
-                        # Get or create carrier
-                        raw_carrier_name = row.get(carrier_col, '').strip()
-                        if not raw_carrier_name:
-                            errors.append(f'Row {row_num}: Missing carrier name')
-                            continue
-
-                        # Apply mapping
-                        carrier_name = carrier_mapping.get(raw_carrier_name, raw_carrier_name)
-
-                        carrier, created = Carrier.objects.get_or_create(
-                            name=carrier_name,
-                            defaults={
-                                'headquarters_zip': row.get('headquarters_zip', '').strip() or None,
-                                'headquarters_city': row.get('headquarters_city', '').strip() or None,
-                                'headquarters_state': row.get('headquarters_state', '').strip() or None,
-                                'description': row.get('carrier_description', '').strip() or None,
-                                'website': row.get('website', '').strip() or None,
-                                'contact_email': row.get('contact_email', '').strip() or None,
-                                'contact_phone': row.get('contact_phone', '').strip() or None,
-                                
-                                # Benefits
-                                'benefit_401k': row.get('benefit_401k', '').strip() or None,
-                                'benefit_disability_life': row.get('benefit_disability_life', '').strip() or None,
-                                'benefit_stock_purchase': row.get('benefit_stock_purchase', '').strip() or None,
-                                'benefit_medical_dental_vision': row.get('benefit_medical_dental_vision', '').strip() or None,
-                                'benefit_paid_vacation': row.get('benefit_paid_vacation', '').strip() or None,
-                                'benefit_prescription_drug': row.get('benefit_prescription_drug', '').strip() or None,
-                                'benefit_weekly_paycheck': row.get('benefit_weekly_paycheck', '').strip() or None,
-                                'benefit_driver_ranking_bonus': row.get('benefit_driver_ranking_bonus', '').strip() or None,
-                                'benefit_military_program': row.get('benefit_military_program', '').strip() or None,
-                                'benefit_tuition_program': row.get('benefit_tuition_program', '').strip() or None,
-                                'benefit_other': row.get('benefit_other', '').strip() or None,
-                            }
-                        )
-
-                        if created:
-                            carriers_created += 1
-                            self.stdout.write(f'  ✅ Created carrier: {carrier_name}')
-
-                        # Prepare job data
-                        job_title = row.get(title_col, '').strip()
-                        if not job_title:
-                            errors.append(f'Row {row_num}: Missing job title')
-                            continue
-
-                        # Build job data dictionary matching model fields
-                        job_data = {
-                            'carrier': carrier,
-                            'title': job_title[:200],
-                            'state': row.get('state', '').strip() or 'Unknown',
-                            'zip_code': row.get('zip_code', '').strip() or None,
-                            'hiring_radius_miles': int(row.get('hiring_radius_miles', 50) or 50),
-                            
-                            'pay_range': row.get('pay_range', '').strip() or None,
-                            'average_weekly_pay': row.get('average_weekly_pay', '').strip() or None,
-                            'salary': row.get('salary', '').strip() or None,
-                            'pay_type': row.get('pay_type', '').strip() or None,
-                            'short_haul_pay': row.get('short_haul_pay', '').strip() or None,
-                            'stop_pay': row.get('stop_pay', '').strip() or None,
-                            'bonus_offer': row.get('bonus_offer', '').strip() or None,
-                            
-                            'exact_home_time': row.get('exact_home_time', '').strip() or None,
-                            'home_time': row.get('home_time', '').strip() or None,
-                            
-                            'load_unload_type': row.get('load_unload_type', '').strip() or None,
-                            'unload_pay': row.get('unload_pay', '').strip() or None,
-                            
-                            'job_details': row.get('job_details', '').strip() or None,
-                            'account_overview': row.get('account_overview', '').strip() or None,
-                            'administrative_details': row.get('administrative_details', '').strip() or None,
-                            'description': row.get('description', '').strip() or None,
-                            
-                            'orientation_details': row.get('orientation_details', '').strip() or None,
-                            'orientation_table': row.get('orientation_table', '').strip() or None,
-                            
-                            'trainees_accepted': row.get('trainees_accepted', '').strip() or None,
-                            'account_type': row.get('account_type', '').strip() or None,
-                            'cameras': row.get('cameras', '').strip() or None,
-                            'driver_types': row.get('driver_types', '').strip() or None,
-                            'drug_test_type': row.get('drug_test_type', '').strip() or None,
-                            'experience_levels': row.get('experience_levels', '').strip() or None,
-                            'freight_types': row.get('freight_types', '').strip() or None,
-                            'sap_required': row.get('sap_required', '').strip() or None,
-                            'transmissions': row.get('transmissions', '').strip() or None,
-                            'states': row.get('states', '').strip() or None,
-                            
-                            'is_active': True,
-                        }
-
-                        # Find matching job
-                        # Using carrier, title, and state/zip for uniqueness
-                        query = Job.objects.filter(carrier=carrier, title=job_title)
-                        if job_data['state'] != 'Unknown':
-                            query = query.filter(state=job_data['state'])
-                        
-                        existing_job = query.first()
-
-                        if existing_job:
-                            if update_existing:
-                                for key, value in job_data.items():
-                                    if key != 'carrier':
-                                        setattr(existing_job, key, value)
-                                existing_job.save()
-                                jobs_updated += 1
-                                self.stdout.write(f'  🔄 Updated: {job_title}')
-                            else:
-                                jobs_skipped += 1
-                                self.stdout.write(self.style.WARNING(f'  ⏭️  Skipped (exists): {job_title}'))
-                        else:
-                            Job.objects.create(**job_data)
-                            jobs_created += 1
-                            self.stdout.write(f'  ✅ Created: {job_title}')
-
-                    except Exception as e:
-                        errors.append(f'Row {row_num}: {str(e)}')
-                        self.stdout.write(self.style.ERROR(f'  ❌ Error row {row_num}: {str(e)}'))
+            for result in results:
+                errors.extend(result['errors'])
+                if verbosity > 1:
+                    self.stdout.write(f'  📄 {result["path"]}: {len(result["rows"])} rows')
+
+                resolver.resolve({carrier_name: carrier_data for _, carrier_name, carrier_data, _ in result['rows']})
+
+                new_carrier_ids = {carrier.id for carrier in resolver.carriers.values()} - loaded_carriers
+                if new_carrier_ids:
+                    stored_jobs = (
+                        Job.objects.filter(carrier_id__in=new_carrier_ids)
+                        .order_by('-is_active', 'id')
+                        .values_list('id', 'carrier_id', 'title', 'state', 'content_hash', 'is_active')
+                    )
+                    for pk, carrier_id, title, state, content_hash, is_active in stored_jobs:
+                        # Inactive rows never compare equal, so reappearing jobs get reactivated
+                        stored = (pk, content_hash if is_active else None)
+                        lookup.setdefault(job_key(carrier_id, title, state), stored)
+                        # Rows imported without a state still match on carrier + title
+                        lookup.setdefault(job_key(carrier_id, title, 'Unknown'), stored)
+                        if is_active:
+                            stored_ids.add(pk)
+                    loaded_carriers |= new_carrier_ids
+
+                parsed = {}
+                for row_num, carrier_name, _, job_data in result['rows']:
+                    carrier = resolver.get(carrier_name)
+                    key = job_key(carrier.id, job_data['title'], job_data['state'])
+                    if key in seen_keys:
+                        errors.append(f'{result["path"]} row {row_num}: Duplicate of an earlier row')
                         continue
-
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'\n❌ Fatal error: {str(e)}'))
-            return
+                    seen_keys.add(key)
+                    parsed[key] = (f'{result["path"]} row {row_num}', dict(job_data, carrier=carrier))
+
+                incoming = {key: job_data['content_hash'] for key, (_, job_data) in parsed.items()}
+                existing = {key: lookup[key] for key in incoming if key in lookup}
+                classified = classify_by_hash(incoming, existing)
+                seen_ids.update(pk for pk, _ in existing.values())
+
+                for key in classified['new']:
+                    writer.create(*parsed[key])
+                for key in classified['changed']:
+                    if update_existing:
+                        label, job_data = parsed[key]
+                        writer.update(label, existing[key][0], job_data)
+                    else:
+                        counts['skipped'] += 1
+                for name in ('new', 'changed', 'unchanged'):
+                    counts[name] += len(classified[name])
+
+            writer.flush()
+        finally:
+            if executor:
+                executor.shutdown()
+
+        errors.extend(writer.errors)
+
+        vanished_ids = stored_ids - seen_ids
+        jobs_deactivated = 0
+        if deactivate_vanished and vanished_ids:
+            with transaction.atomic():
+                jobs_deactivated = Job.objects.filter(pk__in=vanished_ids).update(is_active=False)
+                counters.refresh_carrier_counts(loaded_carriers)
+                catalog.log_changes('job', upserted=vanished_ids)
+
+        jobs_enriched = None
+        if options['enrich']:
+            jobs_enriched = enrich_jobs(Job.objects.filter(carrier_id__in=loaded_carriers, needs_enrichment=True))
 
         # Print summary
         self.stdout.write('\n' + '='*60)
         self.stdout.write(self.style.SUCCESS('📊 Import Summary:'))
-        self.stdout.write(f'  Carriers created: {carriers_created}')
-        self.stdout.write(f'  Jobs created:     {jobs_created}')
-        self.stdout.write(f'  Jobs updated:     {jobs_updated}')
-        self.stdout.write(f'  Jobs skipped:     {jobs_skipped}')
+        self.stdout.write(f'  Files:            {len(paths)}')
+        self.stdout.write(f'  Carriers created: {resolver.created}')
+        self.stdout.write(f'  Jobs new:         {counts["new"]} ({writer.created} created)')
+        self.stdout.write(f'  Jobs changed:     {counts["changed"]} ({writer.updated} updated, {counts["skipped"]} skipped)')
+        self.stdout.write(f'  Jobs unchanged:   {counts["unchanged"]}')
+        self.stdout.write(f'  Jobs vanished:    {len(vanished_ids)} ({jobs_deactivated} deactivated)')
+        if jobs_enriched is not None:
+            self.stdout.write(f'  Jobs enriched:    {jobs_enriched}')
+            self.stdout.write(f'  Gazetteer:        {gazetteer.format_stats()}')
         self.stdout.write(f'  Errors:           {len(errors)}')
-        
+
         if errors:
             self.stdout.write('\n⚠️  First 5 errors:')
             for error in errors[:5]:
                 self.stdout.write(f'    - {error}')
-        
+
         self.stdout.write('='*60 + '\n')
 
+        if jobs_enriched is None and writer.created + writer.updated:
+            self.stdout.write("Run 'python manage.py enrich_jobs' to fill in zip codes and coordinates.\n")
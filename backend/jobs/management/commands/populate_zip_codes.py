@@ -1,14 +1,54 @@
 """
 Django management command to auto-populate missing zip codes for existing jobs.
+
+Jobs are streamed in id order through a server-side cursor with their
+carriers preloaded, zip extraction runs in a process pool, and results are
+written back per chunk with bulk_update on only the fields that changed.
+The last processed id is checkpointed after every chunk, so an interrupted
+run continues where it stopped with --resume.
+
+Usage:
+    python manage.py populate_zip_codes
+    python manage.py populate_zip_codes --force --workers 8
+    python manage.py populate_zip_codes --resume
 """
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from jobs import catalog
+from jobs.enrichment import LOCATION_RE, prefetch_geocodes
 from jobs.models import Job
-from jobs.zip_utils import auto_populate_zip_code
+from jobs.zip_utils import auto_populate_zip_code, geocode_location_to_zip
+
+DEFAULT_CHECKPOINT = os.path.join(settings.BASE_DIR, '.populate_zip_codes.checkpoint')
+
+
+def resolve_zip_codes(jobs, location_zips):
+    """
+    Worker entry point: run zip extraction for a slice of jobs.
+
+    Location strings were already resolved by the parent (location_zips),
+    so this never touches the database or the network.
+
+    Returns:
+        list: (job id, zip_code, source, radius) tuples
+    """
+    return [
+        (job.id, *auto_populate_zip_code(job, location_to_zip=location_zips.get))
+        for job in jobs
+    ]
 
 
 class Command(BaseCommand):
     help = 'Auto-populate missing zip codes for existing jobs using intelligent extraction'
-    
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--force',
@@ -20,63 +60,202 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be updated without making changes',
         )
-    
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of jobs processed per chunk (default: 1000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for zip extraction (default: CPU count)',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue after the last id recorded in the checkpoint file',
+        )
+        parser.add_argument(
+            '--after-id',
+            type=int,
+            default=0,
+            help='Only process jobs with an id greater than this',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=DEFAULT_CHECKPOINT,
+            help=f'Checkpoint file (default: {DEFAULT_CHECKPOINT})',
+        )
+
+    def read_checkpoint(self, path):
+        try:
+            with open(path) as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def write_checkpoint(self, path, last_id):
+        with open(path, 'w') as f:
+            f.write(str(last_id))
+
+    def resolve_locations(self, jobs, location_to_zip):
+        """Resolve the distinct 'City, ST' strings of a chunk in the parent process."""
+        prefetch_geocodes(jobs)
+        locations = {job.state for job in jobs if job.state and LOCATION_RE.match(job.state.strip())}
+        return {location: location_to_zip(location) for location in locations}
+
+    def process_chunk(self, chunk, location_to_zip, executor, workers):
+        location_zips = self.resolve_locations(chunk, location_to_zip)
+        if executor is None:
+            return resolve_zip_codes(chunk, location_zips)
+        size = -(-len(chunk) // workers)
+        slices = [chunk[i:i + size] for i in range(0, len(chunk), size)]
+        results = []
+        for part in executor.map(resolve_zip_codes, slices, [location_zips] * len(slices)):
+            results.extend(part)
+        return results
+
+    def apply_results(self, chunk, results, dry_run, verbosity):
+        """
+        Apply extraction results to a chunk. Returns (updated, failed).
+        Jobs are grouped by the set of fields that actually changed, and
+        each group is written with one bulk_update.
+        """
+        jobs = {job.id: job for job in chunk}
+        groups = {}
+        updated = 0
+        failed = 0
+
+        for job_id, zip_code, source, radius in results:
+            job = jobs[job_id]
+            if not zip_code:
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'✗ Could not find zip code for "{job.title}" '
+                        f'(Carrier: {job.carrier.name})'
+                    )
+                )
+                continue
+
+            updated += 1
+            new_values = {'zip_code': zip_code, 'zip_source': source}
+            if radius and source == 'extracted':
+                new_values['hiring_radius_miles'] = radius
+            changed = tuple(sorted(
+                field for field, value in new_values.items() if getattr(job, field) != value
+            ))
+
+            message = (
+                f'"{job.title}": {zip_code} ({source})'
+                + (f' with radius {radius} miles' if radius else '')
+            )
+            if dry_run:
+                if verbosity > 1 or changed:
+                    self.stdout.write(f'[DRY RUN] Would update {message}')
+                continue
+            if not changed:
+                continue
+
+            for field in changed:
+                setattr(job, field, new_values[field])
+            # Coordinates were derived from the old zip code
+            job.needs_enrichment = True
+            groups.setdefault(changed, []).append(job)
+            if verbosity > 1:
+                self.stdout.write(self.style.SUCCESS(f'✓ Updated {message}'))
+
+        if groups:
+            now = timezone.now()
+            with transaction.atomic():
+                for fields, group in groups.items():
+                    for job in group:
+                        job.updated_at = now
+                    Job.objects.bulk_update(group, [*fields, 'needs_enrichment', 'updated_at'])
+                catalog.log_changes('job', upserted=[job.pk for group in groups.values() for job in group])
+
+        return updated, failed
+
     def handle(self, *args, **options):
         force = options['force']
         dry_run = options['dry_run']
-        
+        batch_size = options['batch_size']
+        workers = max(1, options['workers'])
+        verbosity = options['verbosity']
+        checkpoint = options['checkpoint']
+
+        after_id = options['after_id']
+        if options['resume']:
+            after_id = max(after_id, self.read_checkpoint(checkpoint))
+            self.stdout.write(f'Resuming after job id {after_id}')
+
         if force:
             jobs = Job.objects.all()
             self.stdout.write(self.style.WARNING('Force mode: Processing ALL jobs'))
         else:
-            jobs = Job.objects.filter(zip_code__isnull=True) | Job.objects.filter(zip_code='')
-            self.stdout.write(f'Processing {jobs.count()} jobs without zip codes...')
-        
+            jobs = Job.objects.filter(Q(zip_code__isnull=True) | Q(zip_code=''))
+        jobs = jobs.filter(id__gt=after_id).select_related('carrier').order_by('id')
+
+        total = jobs.count()
+        self.stdout.write(f'Processing {total} jobs...')
+
+        location_to_zip = lru_cache(maxsize=None)(geocode_location_to_zip)
+        executor = None
+        if workers > 1 and total > batch_size:
+            # Don't share the parent's database connection with forked workers.
+            # The pool only forks on its first submit, so start the workers now,
+            # before the streaming cursor below reopens the connection.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers)
+            executor.submit(int, 0).result()
+
         updated_count = 0
         failed_count = 0
-        
-        for job in jobs:
-            zip_code, source, radius = auto_populate_zip_code(job)
-            
-            if zip_code:
-                if dry_run:
-                    self.stdout.write(
-                        f'[DRY RUN] Would update "{job.title}": '
-                        f'{zip_code} ({source})'
-                        + (f' with radius {radius} miles' if radius else '')
-                    )
-                else:
-                    job.zip_code = zip_code
-                    job.zip_source = source
-                    
-                    if radius and source == 'extracted':
-                        job.hiring_radius_miles = radius
-                    
-                    job.save()
-                    
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'✓ Updated "{job.title}": '
-                            f'{zip_code} ({source})'
-                            + (f' with radius {radius} miles' if radius else '')
-                        )
-                    )
-                
-                updated_count += 1
-            else:
-                failed_count += 1
-                self.stdout.write(
-                    self.style.ERROR(
-                        f'✗ Could not find zip code for "{job.title}" '
-                        f'(Carrier: {job.carrier.name})'
-                    )
-                )
-        
+        processed = 0
+        started = time.monotonic()
+
+        def run_chunk(chunk):
+            nonlocal updated_count, failed_count, processed
+            results = self.process_chunk(chunk, location_to_zip, executor, workers)
+            updated, failed = self.apply_results(chunk, results, dry_run, verbosity)
+            updated_count += updated
+            failed_count += failed
+            processed += len(chunk)
+            if not dry_run:
+                self.write_checkpoint(checkpoint, chunk[-1].id)
+
+            elapsed = time.monotonic() - started
+            rate = processed / elapsed if elapsed else 0
+            eta = timedelta(seconds=int((total - processed) / rate)) if rate else '?'
+            self.stdout.write(
+                f'[{processed}/{total}] {processed / total:.0%} · '
+                f'{rate:.0f} jobs/s · ETA {eta} · last id {chunk[-1].id}'
+            )
+
+        try:
+            chunk = []
+            # iterator() streams through a server-side cursor on PostgreSQL
+            for job in jobs.iterator(chunk_size=batch_size):
+                chunk.append(job)
+                if len(chunk) >= batch_size:
+                    run_chunk(chunk)
+                    chunk = []
+            if chunk:
+                run_chunk(chunk)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if not dry_run and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
         # Summary
         self.stdout.write('\n' + '='*60)
         if dry_run:
             self.stdout.write(self.style.WARNING('[DRY RUN] No changes were made'))
-        
+
         self.stdout.write(
             self.style.SUCCESS(f'Successfully processed: {updated_count}')
         )
@@ -88,3 +267,5 @@ class Command(BaseCommand):
                 '\nTip: Add headquarters zip codes to carriers in admin '
                 'to improve auto-population success rate.'
             )
+        if updated_count and not dry_run:
+            self.stdout.write('Run "python manage.py enrich_jobs" to refresh coordinates')
@@ -0,0 +1,55 @@
+"""
+Django management command to repair the denormalized job counters on
+carriers (active_jobs_count, open_jobs_count).
+
+All counts come from one aggregate query over the jobs table; only
+carriers whose stored counters differ are written, with one bulk UPDATE.
+
+Usage:
+    python manage.py recount_carrier_jobs
+    python manage.py recount_carrier_jobs --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.counters import COUNTERS, count_all
+from jobs.models import Carrier
+
+
+class Command(BaseCommand):
+    help = 'Recompute the active / open job counters of every carrier'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report carriers with wrong counters without writing',
+        )
+
+    def handle(self, *args, **options):
+        fields = list(COUNTERS)
+        with transaction.atomic():
+            counts = count_all()
+            carriers = Carrier.objects.select_for_update().only('id', 'name', *fields)
+            stale = []
+            for carrier in carriers:
+                expected = counts.get(carrier.id, dict.fromkeys(fields, 0))
+                if any(getattr(carrier, field) != expected[field] for field in fields):
+                    if options['verbosity'] > 1:
+                        stored = ', '.join(f'{field}={getattr(carrier, field)}' for field in fields)
+                        self.stdout.write(f'  🔧 {carrier.name}: {stored} -> {expected}')
+                    for field in fields:
+                        setattr(carrier, field, expected[field])
+                    stale.append(carrier)
+
+            if stale and not options['dry_run']:
+                Carrier.objects.bulk_update(stale, fields, batch_size=500)
+
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write(self.style.SUCCESS('📊 Carrier Counter Summary:'))
+        self.stdout.write(f'  Carriers checked: {len(carriers)}')
+        self.stdout.write(f'  Counters wrong:   {len(stale)}')
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('  Dry run: nothing written'))
+        else:
+            self.stdout.write(f'  Carriers fixed:   {len(stale)}')
+        self.stdout.write('='*60 + '\n')
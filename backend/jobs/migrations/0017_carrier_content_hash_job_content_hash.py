@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_job_hiring_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrier',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the imported source row (used to skip unchanged rows on re-import)', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the imported source row (used to skip unchanged rows on re-import)', max_length=64, null=True),
+        ),
+    ]
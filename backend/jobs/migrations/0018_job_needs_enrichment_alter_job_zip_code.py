@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_carrier_content_hash_job_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='needs_enrichment',
+            field=models.BooleanField(db_index=True, default=True, help_text='Zip code / coordinates still have to be filled in by the enrichment stage'),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='zip_code',
+            field=models.CharField(blank=True, help_text='Location zip code', max_length=10, null=True),
+        ),
+    ]
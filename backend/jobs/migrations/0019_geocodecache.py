@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_job_needs_enrichment_alter_job_zip_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('zip', 'ZIP code'), ('location', 'City, state')], max_length=10)),
+                ('key', models.CharField(help_text="ZIP code or normalized 'city|ST' key", max_length=200)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('zip_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('state', models.CharField(blank=True, max_length=2, null=True)),
+                ('source', models.CharField(blank=True, max_length=50, null=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Geocode cache entry',
+                'verbose_name_plural': 'Geocode cache',
+                'unique_together': {('kind', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_geocodecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrier',
+            name='headquarters_latitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='carrier',
+            name='headquarters_longitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+    ]
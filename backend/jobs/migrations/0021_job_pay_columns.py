@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:10
+
+from django.db import migrations, models
+
+PAY_FIELDS = ['cpm_min', 'cpm_max', 'weekly_pay_estimate', 'pay_type']
+
+
+def fill_pay_columns(apps, schema_editor):
+    from jobs.extraction import extract_job_facts
+
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.order_by('id').iterator(chunk_size=1000):
+        for field, value in extract_job_facts(job).pay_columns().items():
+            setattr(job, field, value)
+        batch.append(job)
+        if len(batch) >= 1000:
+            Job.objects.bulk_update(batch, PAY_FIELDS)
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, PAY_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_carrier_headquarters_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='cpm_max',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='cpm_min',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pay_type',
+            field=models.CharField(blank=True, choices=[('cpm', 'Cents per mile'), ('weekly', 'Weekly pay'), ('salary', 'Salary'), ('hourly', 'Hourly'), ('percentage', 'Percentage of load')], db_index=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='weekly_pay_estimate',
+            field=models.IntegerField(blank=True, db_index=True, help_text='Estimated weekly pay in dollars', null=True),
+        ),
+        migrations.RunPython(fill_pay_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.1 on 2026-10-19 17:25
+
+from django.db import migrations, models
+
+FACET_FIELDS = ['freight_types', 'driver_types', 'home_time', 'experience_months']
+
+
+def fill_facet_columns(apps, schema_editor):
+    from jobs.extraction import extract_job_facts
+
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.order_by('id').iterator(chunk_size=1000):
+        for field, value in extract_job_facts(job).facet_columns().items():
+            setattr(job, field, value)
+        batch.append(job)
+        if len(batch) >= 1000:
+            Job.objects.bulk_update(batch, FACET_FIELDS)
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, FACET_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_job_pay_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='driver_types',
+            field=models.CharField(blank=True, help_text="Comma-delimited driver types, e.g. ',company,team,'", max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='experience_months',
+            field=models.IntegerField(blank=True, db_index=True, help_text='Minimum experience required, in months', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='freight_types',
+            field=models.CharField(blank=True, help_text="Comma-delimited freight types, e.g. ',dry_van,reefer,'", max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='home_time',
+            field=models.CharField(blank=True, choices=[('daily', 'Home daily'), ('weekly', 'Home weekly'), ('biweekly', 'Home every two weeks'), ('otr', 'Over the road')], db_index=True, max_length=20, null=True),
+        ),
+        migrations.RunPython(fill_facet_columns, migrations.RunPython.noop),
+    ]
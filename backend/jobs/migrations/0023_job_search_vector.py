@@ -0,0 +1,78 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:40
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Triggers keep search_vector current for every write path, bulk ones included:
+# job text or carrier changes recompute it, and renaming a carrier touches its jobs.
+CREATE_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT name FROM jobs_carrier WHERE id = NEW.carrier_id), ''
+        )), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.job_details, '')), 'B') ||
+        setweight(to_tsvector('english', concat_ws(' ',
+            NEW.pay_details, NEW.equipment_details, NEW.key_disqualifiers, NEW.requirements_details
+        )), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_search_vector
+    BEFORE INSERT OR UPDATE OF title, carrier_id, job_details, pay_details,
+        equipment_details, key_disqualifiers, requirements_details
+    ON jobs_job FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update();
+
+CREATE OR REPLACE FUNCTION jobs_carrier_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    UPDATE jobs_job SET title = title WHERE carrier_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_carrier_search_vector
+    AFTER UPDATE OF name ON jobs_carrier FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION jobs_carrier_search_vector_update();
+
+UPDATE jobs_job SET title = title;
+
+CREATE INDEX jobs_job_search_vector_gin ON jobs_job USING gin (search_vector);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS jobs_job_search_vector_gin;
+DROP TRIGGER IF EXISTS jobs_carrier_search_vector ON jobs_carrier;
+DROP FUNCTION IF EXISTS jobs_carrier_search_vector_update();
+DROP TRIGGER IF EXISTS jobs_job_search_vector ON jobs_job;
+DROP FUNCTION IF EXISTS jobs_job_search_vector_update();
+"""
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_job_facet_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CREATE_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX jobs_carrier_name_trgm ON jobs_carrier USING gin (name gin_trgm_ops);
+CREATE INDEX jobs_carrieralias_alias_trgm ON jobs_carrieralias USING gin (alias gin_trgm_ops);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS jobs_carrieralias_alias_trgm;
+DROP INDEX IF EXISTS jobs_carrier_name_trgm;
+"""
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarrierAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text='Alternative name as it appears in imports', max_length=200)),
+                ('key', models.CharField(editable=False, help_text='Normalized alias (see normalize_name)', max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('carrier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.carrier')),
+            ],
+            options={
+                'verbose_name': 'Carrier alias',
+                'verbose_name_plural': 'Carrier aliases',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:10
+
+from django.db import migrations, models
+
+TEXT_SECTIONS = ('job_details', 'pay_details', 'equipment_details', 'key_disqualifiers', 'requirements_details')
+
+
+def fill_parsed_tables(apps, schema_editor):
+    from jobs.tables import parse_section_table, parse_table, parse_tables
+
+    Carrier = apps.get_model('jobs', 'Carrier')
+    carriers = list(Carrier.objects.only('id', 'presentation', 'pre_qualifications'))
+    for carrier in carriers:
+        carrier.parsed_tables = parse_tables(
+            {'presentation': carrier.presentation, 'pre_qualifications': carrier.pre_qualifications}, parse_table
+        )
+    Carrier.objects.bulk_update(carriers, ['parsed_tables'], batch_size=500)
+
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.only('id', *TEXT_SECTIONS).order_by('id').iterator(chunk_size=1000):
+        job.parsed_tables = parse_tables(
+            {section: getattr(job, section) for section in TEXT_SECTIONS}, parse_section_table
+        )
+        batch.append(job)
+        if len(batch) >= 1000:
+            Job.objects.bulk_update(batch, ['parsed_tables'])
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, ['parsed_tables'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0024_carrieralias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrier',
+            name='parsed_tables',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text="Field name -> {'columns', 'rows'} for the table fields that parse as tables"),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='parsed_tables',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text="Section name -> {'columns', 'rows'} for the sections that are pasted tables"),
+        ),
+        migrations.RunPython(fill_parsed_tables, migrations.RunPython.noop),
+    ]
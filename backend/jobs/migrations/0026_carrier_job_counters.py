@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-19 22:25
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_job_counters(apps, schema_editor):
+    Carrier = apps.get_model('jobs', 'Carrier')
+    Job = apps.get_model('jobs', 'Job')
+
+    def count(condition):
+        jobs = (
+            Job.objects.filter(condition, carrier=OuterRef('pk'))
+            .order_by().values('carrier').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(jobs, output_field=IntegerField()), Value(0))
+
+    Carrier.objects.update(
+        active_jobs_count=count(Q(is_active=True)),
+        open_jobs_count=count(Q(is_active=True, hiring_status='open')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0025_parsed_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrier',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='carrier',
+            name='open_jobs_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Active jobs open to hiring'),
+        ),
+        migrations.RunPython(fill_job_counters, migrations.RunPython.noop),
+    ]
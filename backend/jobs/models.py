@@ -1,7 +1,39 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 
 
-class Carrier(models.Model):
+class TrackedFieldsMixin:
+    """
+    Remembers the database values of TRACKED_FIELDS when an instance is
+    loaded or saved, so save() can tell which of them were changed.
+    """
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self):
+        self._loaded_values = {
+            field: self.__dict__[field] for field in self.TRACKED_FIELDS if field in self.__dict__
+        }
+
+    def has_changed(self, field, update_fields=None):
+        """Whether a tracked field differs from its last loaded/saved value."""
+        if update_fields is not None and field not in update_fields:
+            return False
+        loaded = getattr(self, '_loaded_values', {})
+        return field in loaded and loaded[field] != getattr(self, field)
+
+    def loaded_value(self, field):
+        """The last loaded/saved value of a tracked field (None if unknown)."""
+        return getattr(self, '_loaded_values', {}).get(field)
+
+
+class Carrier(TrackedFieldsMixin, models.Model):
     """
     Represents a trucking company/carrier with company-level information and benefits.
     """
@@ -40,11 +72,65 @@ class Carrier(models.Model):
     )
     headquarters_city = models.CharField(max_length=100, blank=True, null=True)
     headquarters_state = models.CharField(max_length=2, blank=True, null=True)
+    headquarters_latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    headquarters_longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     
+    # Presentation and pre-qualification tables parsed on save (see jobs.tables)
+    parsed_tables = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Field name -> {'columns', 'rows'} for the table fields that parse as tables"
+    )
+
+    # Job counters maintained by job writes (see jobs.counters)
+    active_jobs_count = models.PositiveIntegerField(default=0, editable=False)
+    open_jobs_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Active jobs open to hiring"
+    )
+
     # Metadata
     is_active = models.BooleanField(default=True, help_text="Whether this carrier is active")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Hash of the imported source row (used to skip unchanged rows on re-import)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    TRACKED_FIELDS = ('headquarters_zip',)
+
+    HEADQUARTERS_LOCATION_FIELDS = ('headquarters_latitude', 'headquarters_longitude', 'headquarters_state')
+
+    TABLE_FIELDS = ('presentation', 'pre_qualifications')
+
+    def refresh_parsed_tables(self):
+        """Re-parse the table fields into parsed_tables."""
+        from .tables import parse_tables
+        self.parsed_tables = parse_tables({field: getattr(self, field) for field in self.TABLE_FIELDS})
+
+    def save(self, *args, **kwargs):
+        from .enrichment import locate_carrier_headquarters, reset_carrier_hq_locations
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.TABLE_FIELDS):
+            self.refresh_parsed_tables()
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = set(update_fields) | {'parsed_tables'}
+        hq_changed = self.has_changed('headquarters_zip', update_fields)
+        if hq_changed or (self.headquarters_zip and self.headquarters_latitude is None):
+            # Local lookup only; unknown ZIPs are resolved by the enrichment stage
+            if locate_carrier_headquarters([self]) and update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.HEADQUARTERS_LOCATION_FIELDS)
+        super().save(*args, **kwargs)
+        if hq_changed:
+            # Re-point this carrier's HQ-located jobs in one UPDATE
+            reset_carrier_hq_locations(self)
+        self._snapshot_tracked_fields()
     
     def __str__(self):
         return self.name
@@ -55,7 +141,42 @@ class Carrier(models.Model):
         verbose_name_plural = "Carriers"
 
 
-class Job(models.Model):
+class CarrierAlias(models.Model):
+    """
+    Alternative spelling of a carrier name (e.g. "US Express" for US Xpress),
+    used by the carrier typeahead and by importers to resolve names.
+    """
+    alias = models.CharField(max_length=200, help_text="Alternative name as it appears in imports")
+    key = models.CharField(max_length=200, unique=True, editable=False, help_text="Normalized alias (see normalize_name)")
+    carrier = models.ForeignKey(Carrier, on_delete=models.CASCADE, related_name='aliases')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def clean(self):
+        from .carrier_lookup import normalize_name
+        if CarrierAlias.objects.filter(key=normalize_name(self.alias)).exclude(pk=self.pk).exists():
+            raise ValidationError({'alias': 'This alias is already in use.'})
+
+    def save(self, *args, **kwargs):
+        from .carrier_lookup import normalize_name
+        self.key = normalize_name(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} → {self.carrier.name}"
+
+    class Meta:
+        ordering = ['alias']
+        verbose_name = "Carrier alias"
+        verbose_name_plural = "Carrier aliases"
+
+
+class JobManager(models.Manager):
+    def get_queryset(self):
+        # The search vector is only read inside the database (see jobs.search)
+        return super().get_queryset().defer('search_vector')
+
+
+class Job(TrackedFieldsMixin, models.Model):
     """
     Represents a job posting from a carrier.
     """
@@ -71,7 +192,7 @@ class Job(models.Model):
     # ========== SECTION 1: BASIC INFORMATION ==========
     title = models.CharField(max_length=200, help_text="Job title/position")
     state = models.CharField(max_length=200, help_text="Primary state for the job")
-    zip_code = models.CharField(max_length=10, help_text="Location zip code")
+    zip_code = models.CharField(max_length=10, blank=True, null=True, help_text="Location zip code")
     hiring_radius_miles = models.IntegerField(default=50, help_text="Hiring radius in miles")
     
     # ========== SECTION 2: CONSOLIDATED FIELDS (1 Field Per Section) ==========
@@ -122,22 +243,166 @@ class Job(models.Model):
         help_text="Current hiring status of the job"
     )
 
+    # Pay figures and facets parsed from the text sections (see refresh_parsed_fields)
+    PAY_TYPE_CHOICES = [
+        ('cpm', 'Cents per mile'),
+        ('weekly', 'Weekly pay'),
+        ('salary', 'Salary'),
+        ('hourly', 'Hourly'),
+        ('percentage', 'Percentage of load'),
+    ]
+    cpm_min = models.DecimalField(max_digits=5, decimal_places=3, null=True, blank=True, db_index=True)
+    cpm_max = models.DecimalField(max_digits=5, decimal_places=3, null=True, blank=True, db_index=True)
+    weekly_pay_estimate = models.IntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Estimated weekly pay in dollars"
+    )
+    pay_type = models.CharField(max_length=20, choices=PAY_TYPE_CHOICES, blank=True, null=True, db_index=True)
+    freight_types = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True,
+        help_text="Comma-delimited freight types, e.g. ',dry_van,reefer,'"
+    )
+    driver_types = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True,
+        help_text="Comma-delimited driver types, e.g. ',company,team,'"
+    )
+    HOME_TIME_CHOICES = [
+        ('daily', 'Home daily'),
+        ('weekly', 'Home weekly'),
+        ('biweekly', 'Home every two weeks'),
+        ('otr', 'Over the road'),
+    ]
+    home_time = models.CharField(max_length=20, choices=HOME_TIME_CHOICES, blank=True, null=True, db_index=True)
+    experience_months = models.IntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Minimum experience required, in months"
+    )
+
+    # Sections that are pasted tables, parsed on save (see jobs.tables)
+    parsed_tables = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Section name -> {'columns', 'rows'} for the sections that are pasted tables"
+    )
+
     # Metadata & Tracking
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     location_source = models.CharField(max_length=50, blank=True, null=True)
     zip_source = models.CharField(max_length=50, blank=True, null=True)
+    needs_enrichment = models.BooleanField(
+        default=True,
+        db_index=True,
+        help_text="Zip code / coordinates still have to be filled in by the enrichment stage"
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     source_create_date = models.CharField(max_length=100, blank=True, null=True)
     source_modified_date = models.CharField(max_length=100, blank=True, null=True)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Hash of the imported source row (used to skip unchanged rows on re-import)"
+    )
+    # Maintained by database triggers and GIN-indexed on PostgreSQL (see jobs.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = JobManager()
+
+    TRACKED_FIELDS = ('zip_code', 'zip_source', 'state', 'is_active', 'hiring_status', 'carrier_id')
+
+    # Zip sources derived from the state field, invalidated when it changes
+    ZIP_SOURCES_FROM_STATE = ('geocoded', 'state_capital')
+
+    TEXT_SECTIONS = ('job_details', 'pay_details', 'equipment_details', 'key_disqualifiers', 'requirements_details')
+    PARSED_FIELDS = (
+        'cpm_min', 'cpm_max', 'weekly_pay_estimate', 'pay_type',
+        'freight_types', 'driver_types', 'home_time', 'experience_months', 'parsed_tables',
+    )
+
+    def refresh_parsed_fields(self):
+        """
+        Recompute the pay and facet columns and the section tables from
+        the text sections. Local parsing only (memoized per text), so it is
+        cheap enough for save().
+
+        Returns:
+            list: Names of the parsed fields
+        """
+        from .extraction import extract_job_facts
+        from .tables import parse_section_table, parse_tables
+        facts = extract_job_facts(self)
+        for field, value in {**facts.pay_columns(), **facts.facet_columns()}.items():
+            setattr(self, field, value)
+        self.parsed_tables = parse_tables(
+            {section: getattr(self, section) for section in self.TEXT_SECTIONS}, parse_section_table
+        )
+        return list(self.PARSED_FIELDS)
+
+    def reset_stale_location(self, update_fields=None):
+        """
+        Clear location data made stale by a change to zip_code or state
+        since the job was loaded, and flag the job for enrichment.
+
+        Returns:
+            list: Names of the fields that were modified
+        """
+        zip_changed = self.has_changed('zip_code', update_fields)
+        state_changed = self.has_changed('state', update_fields)
+        if not (zip_changed or state_changed):
+            return []
+
+        modified = ['latitude', 'longitude', 'location_source', 'needs_enrichment']
+        if zip_changed and not self.has_changed('zip_source', update_fields):
+            # Zip code supplied directly (admin edit, API or import)
+            self.zip_source = 'provided' if self.zip_code else None
+            modified.append('zip_source')
+        elif state_changed and not zip_changed and self.zip_source in self.ZIP_SOURCES_FROM_STATE:
+            self.zip_code = None
+            self.zip_source = None
+            modified += ['zip_code', 'zip_source']
+
+        self.latitude = None
+        self.longitude = None
+        self.location_source = None
+        self.needs_enrichment = True
+        return modified
+
+    def location_missing(self):
+        """Whether zip code or coordinates still have to be resolved."""
+        if not self.zip_code:
+            # A set location_source means enrichment already ran and found no zip
+            return not self.location_source
+        if not self.zip_source:
+            return True
+        # 'state_only' means geocoding already ran and found nothing better
+        return (not self.latitude or not self.longitude) and self.location_source != 'state_only'
+
+    def populate_location(self, location_to_zip=None, zip_to_coords=None):
+        """
+        Fill in missing zip code and coordinates.
+        This can hit external geocoding services, so it runs in the
+        enrichment stage (see jobs.enrichment), never inside save().
+        """
+        # Zip codes written in bulk (imports) skip save(), so they arrive without a source
+        if self.zip_code and not self.zip_source:
+            self.zip_source = 'provided'
 
-    def save(self, *args, **kwargs):
         # Auto-populate zip code if missing
-        if not self.zip_code or not self.zip_source:
+        if not self.zip_code:
             from .zip_utils import auto_populate_zip_code
-            zip_code, source, radius = auto_populate_zip_code(self)
+            zip_code, source, radius = auto_populate_zip_code(self, location_to_zip)
             
             if zip_code and not self.zip_code:
                 self.zip_code = zip_code
@@ -150,12 +415,26 @@ class Job(models.Model):
         # Auto-populate geocoding fields for distance-based search
         if not self.latitude or not self.longitude:
             from .geocoding import get_job_location
-            lat, lng, source = get_job_location(self)
+            lat, lng, source = get_job_location(self, zip_to_coords)
             self.latitude = lat
             self.longitude = lng
             self.location_source = source
-        
-        super().save(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        modified = self.reset_stale_location(update_fields)
+        if update_fields is None or set(update_fields) & set(self.TEXT_SECTIONS):
+            modified += self.refresh_parsed_fields()
+        # Location is filled in later by the batched enrichment stage
+        if self.location_missing():
+            self.needs_enrichment = True
+            modified.append('needs_enrichment')
+        if update_fields is not None and modified:
+            kwargs['update_fields'] = set(update_fields) | set(modified)
+        # The post_save handler refreshes the carrier job counters in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
     
     def __str__(self):
         return f"{self.title} at {self.carrier.name}"
@@ -165,3 +444,68 @@ class Job(models.Model):
         verbose_name = "Job"
         verbose_name_plural = "Jobs"
 
+
+
+class GeocodeCache(models.Model):
+    """
+    Persistent cache of geocoding results shared by every lookup path,
+    worker and import run. Rows without coordinates or ZIP are negative
+    entries for keys that could not be resolved; they expire after
+    GEOCODE_NEGATIVE_CACHE_TTL seconds.
+    """
+    KIND_CHOICES = [
+        ('zip', 'ZIP code'),
+        ('location', 'City, state'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=200, help_text="ZIP code or normalized 'city|ST' key")
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    zip_code = models.CharField(max_length=10, blank=True, null=True)
+    state = models.CharField(max_length=2, blank=True, null=True)
+    source = models.CharField(max_length=50, blank=True, null=True)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.kind}:{self.key}"
+
+    class Meta:
+        unique_together = ('kind', 'key')
+        verbose_name = "Geocode cache entry"
+        verbose_name_plural = "Geocode cache"
+
+
+class CatalogVersion(models.Model):
+    """
+    Single-row counter bumped on every write to the job catalog (see
+    jobs.catalog). Caches of catalog-wide data are keyed by it.
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
+
+
+class CatalogChange(models.Model):
+    """
+    Append-only log of job and carrier writes (see jobs.catalog). Each
+    entry carries the catalog version of the write, so clients can ask
+    for everything that changed since the version they hold.
+    """
+    KIND_CHOICES = [
+        ('job', 'Job'),
+        ('carrier', 'Carrier'),
+    ]
+    version = models.BigIntegerField(db_index=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'upserted'
+        return f"{self.kind} {self.object_id} {action} (version {self.version})"
+
+    class Meta:
+        ordering = ['version', 'id']
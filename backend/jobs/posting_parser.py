@@ -0,0 +1,135 @@
+"""
+Turn raw, pasted lane postings into Job field values.
+
+parse_posting() is pure Python (no Django models or settings at import
+time) so batches can be parsed in a pool of spawned worker processes.
+"""
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from .extraction import extract_facts, normalize_label
+
+# Batches smaller than this are parsed inline; the pool isn't worth it
+POOL_THRESHOLD = 20
+
+# Lines of dashes or equals signs separate postings in uploaded files
+SEPARATOR_RE = re.compile(r'^\s*(?:-{3,}|={3,})\s*$', re.MULTILINE)
+LABEL_RE = re.compile(r'^\s*([A-Za-z][A-Za-z0-9 /&()\'–-]{0,60}?)\s*:')
+
+# "Label:" keywords that route a line into one of the consolidated sections;
+# everything else stays in job_details
+SECTION_KEYWORDS = [
+    ('key_disqualifiers', re.compile(r'disqualif', re.IGNORECASE)),
+    ('pay_details', re.compile(r'pay|cpm|bonus|earnings|salary|compensation|mileage', re.IGNORECASE)),
+    ('equipment_details', re.compile(r'equipment|transmission|truck|tractor|trailer|camera|engine', re.IGNORECASE)),
+    ('requirements_details', re.compile(
+        r'experience|endorsement|drug|sap\b|trainee|states?$|requirement|cdl|driver type', re.IGNORECASE
+    )),
+]
+
+DEFAULT_RADIUS = 50
+
+_pool = None
+_pool_workers = 1
+_pool_lock = threading.Lock()
+
+
+def split_postings(text):
+    """Split an uploaded text file into individual postings."""
+    return [part.strip() for part in SEPARATOR_RE.split(text) if part.strip()]
+
+
+def _title(lines):
+    """The line after "Lane Information", else the first non-empty line."""
+    for i, line in enumerate(lines):
+        if 'Lane Information' in line:
+            following = next((l.strip() for l in lines[i + 1:] if l.strip()), None)
+            if following:
+                return following
+    return next((line.strip() for line in lines if line.strip()), 'New Job')
+
+
+def _sections(lines):
+    sections = {}
+    for line in lines:
+        section = 'job_details'
+        match = LABEL_RE.match(line)
+        if match:
+            label = normalize_label(match.group(1))
+            section = next(
+                (name for name, pattern in SECTION_KEYWORDS if pattern.search(label)), 'job_details'
+            )
+        sections.setdefault(section, []).append(line.rstrip())
+    return {name: '\n'.join(section_lines).strip() or None for name, section_lines in sections.items()}
+
+
+def parse_posting(raw_text):
+    """
+    Parse one raw posting.
+
+    Args:
+        raw_text (str): Pasted posting text
+
+    Returns:
+        dict: Job field values (without carrier)
+    """
+    text = raw_text.replace('\\n', '\n').strip()
+    lines = text.split('\n')
+    facts = extract_facts(text)
+    zip_code, radius = facts.zip_hint()
+
+    state = facts.field('Hub City') or facts.field('Location') or (facts.states[0] if facts.states else None)
+    fields = {
+        'title': _title(lines)[:200],
+        'state': (state or 'See Description')[:200],
+        'zip_code': zip_code,
+        'hiring_radius_miles': radius or DEFAULT_RADIUS,
+        'source_create_date': facts.field('Create Date'),
+        'source_modified_date': facts.field('Modified Date'),
+    }
+    # Title lines stay in the text so the sections keep the full posting
+    fields.update(_sections(lines))
+    return fields
+
+
+def _get_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            from django.conf import settings
+            _pool_workers = getattr(settings, 'JOB_PARSE_WORKERS', None) or os.cpu_count() or 1
+            # spawn, not fork: the web server process is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=get_context('spawn'))
+    return _pool
+
+
+def parse_chunk(texts):
+    """Parse a list of postings, returning the exception for any that fail."""
+    results = []
+    for text in texts:
+        try:
+            results.append(parse_posting(text))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def parse_postings(texts):
+    """
+    Parse many postings, in the worker pool for larger batches.
+
+    Returns:
+        list: One dict of fields, or an Exception, per posting (same order)
+    """
+    if len(texts) < POOL_THRESHOLD:
+        return parse_chunk(texts)
+
+    pool = _get_pool()
+    size = -(-len(texts) // _pool_workers)
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    results = []
+    for part in pool.map(parse_chunk, chunks):
+        results.extend(part)
+    return results
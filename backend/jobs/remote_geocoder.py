@@ -0,0 +1,200 @@
+"""
+Remote geocoding client used when a ZIP or "City, ST" isn't in the local
+datasets.
+
+One pooled requests.Session is shared by every thread. Calls are paced by
+a token bucket, retried with exponential backoff on transient failures,
+and cut off by a per-provider circuit breaker once a provider keeps
+failing. Provider URLs can be overridden (settings or constructor) so the
+client can be pointed at a local stand-in server.
+"""
+import threading
+import time
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+ZIP_URL = 'https://api.zippopotam.us/us/{zip}'
+CENSUS_URL = 'https://geocoding.geo.census.gov/geocoder/locations/address'
+
+_session = None
+_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=10):
+    """
+    Get or create the shared, connection-pooled HTTP session. The pool grows
+    to the largest pool_size asked for, so a caller running more threads
+    than an earlier one still gets a connection per thread.
+    """
+    global _session, _pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _pool_size:
+            # Requests in flight keep the adapter they started on
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _pool_size = pool_size
+    return _session
+
+
+class TransientError(Exception):
+    """A failure worth retrying (timeout, connection error, 429 or 5xx)."""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` calls per second on average,
+    with bursts of up to `capacity` calls.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures. While open, calls are
+    rejected until `cooldown` seconds have passed; then a single trial call
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold=5, cooldown=30):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+class RemoteGeocoder:
+    """
+    Resolve ZIP codes (Zippopotam.us) and "City, ST" pairs (US Census
+    geocoder) over HTTP.
+
+    Both resolve methods return a dict ready for geocode_cache.put(); an
+    empty result (no coordinates / ZIP) means the provider answered that the
+    key doesn't exist. TransientError or CircuitOpenError is raised when no
+    definitive answer could be obtained.
+    """
+
+    def __init__(self, zip_url=None, census_url=None, rate=5, workers=8,
+                 retries=3, backoff=0.5, timeout=5, breaker_threshold=5, breaker_cooldown=30):
+        self.zip_url = zip_url or getattr(settings, 'ZIP_GEOCODER_URL', ZIP_URL)
+        self.census_url = census_url or getattr(settings, 'CENSUS_GEOCODER_URL', CENSUS_URL)
+        self.session = get_session(pool_size=workers)
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.breakers = {
+            'zip': CircuitBreaker(breaker_threshold, breaker_cooldown),
+            'location': CircuitBreaker(breaker_threshold, breaker_cooldown),
+        }
+
+    def _get(self, kind, url, params=None):
+        """GET with rate limiting, retries and circuit breaking. Returns the response."""
+        breaker = self.breakers[kind]
+        for attempt in range(self.retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{kind} provider circuit is open")
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise TransientError(f"HTTP {response.status_code}")
+            except (requests.RequestException, TransientError) as e:
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise TransientError(str(e)) from e
+                time.sleep(self.backoff * (2 ** attempt))
+                continue
+            breaker.record_success()
+            return response
+
+    def resolve_zip(self, zip_code):
+        response = self._get('zip', self.zip_url.format(zip=zip_code))
+        if response.status_code == 200:
+            places = response.json().get('places') or []
+            if places:
+                place = places[0]
+                return {
+                    'latitude': float(place.get('latitude')),
+                    'longitude': float(place.get('longitude')),
+                    'state': place.get('state abbreviation'),
+                    'source': 'zippopotam',
+                }
+        return {'source': 'zippopotam'}
+
+    def resolve_location(self, city, state):
+        params = {
+            'city': city.strip(),
+            'state': state.strip(),
+            'benchmark': 'Public_AR_Current',
+            'format': 'json',
+        }
+        response = self._get('location', self.census_url, params=params)
+        matches = response.json().get('result', {}).get('addressMatches') if response.status_code == 200 else None
+        if matches:
+            return {
+                'zip_code': matches[0]['addressComponents'].get('zip'),
+                'state': state.strip().upper(),
+                'source': 'census',
+            }
+        return {'state': state.strip().upper(), 'source': 'census'}
@@ -0,0 +1,166 @@
+"""
+Ready-to-display job sections, cached per job version.
+
+The consolidated text sections are normalized once (literal "\\n"
+escapes, **bold** markers, bullets, "Label: value" pairs, headings and
+pasted tables) into a list of typed lines, following the rules of the
+Opportunities page renderer, which displays them as they are. Results are
+cached under the job id and updated_at, so an entry never has to be
+invalidated: any write that changes a section also moves updated_at.
+
+Entries live in the 'render' cache (settings.CACHES). When that cache is
+shared (Redis), they are written as jobs are saved or imported, so the
+detail and section endpoints don't render at all. A process-local cache
+is only filled on read: entries written by an import command would never
+be seen by the web workers.
+"""
+import re
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from .tables import split_cells, text_lines
+
+CACHE_KEY = 'jobs:render:{pk}:{stamp}'
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+BULLET_RE = re.compile(r'^[•*\- ]')
+LEADING_RE = re.compile(r'^[•*\-\s"\']+')
+TRAILING_RE = re.compile(r'["\'\s]+$')
+SENTENCE_END_RE = re.compile(r'[.?!]$')
+MAX_HEADING_LENGTH = 50
+
+
+def _is_heading(line, clean, is_bullet):
+    letters = re.sub(r'[^a-zA-Z]', '', clean)
+    caps = len(letters) > 2 and letters == letters.upper()
+    bold = line.startswith('**') and line.endswith('**')
+    return bold or caps or (not is_bullet and len(clean) < MAX_HEADING_LENGTH and not SENTENCE_END_RE.search(clean))
+
+
+def render_lines(text):
+    """
+    Normalize one section into display lines.
+
+    Returns:
+        list: Dicts with a 'type' of
+              'heading' ('cells'),
+              'pair' ('label', 'value') or
+              'text' ('text', 'bullet')
+    """
+    lines = text_lines(text)
+    delimiter = None
+    if lines and ':' not in lines[0]:
+        delimiter = next((d for d in ('|', ',', '\t') if d in lines[0]), None)
+
+    rendered = []
+    for index, line in enumerate(lines):
+        lowered = line.lower()
+        is_table_heading = (
+            ('category' in lowered and ('details' in lowered or 'value' in lowered))
+            or (index == 0 and delimiter and ':' not in line)
+        )
+        if is_table_heading:
+            cells = split_cells(line, delimiter) if delimiter else [line]
+            rendered.append({'type': 'heading', 'cells': cells})
+            continue
+
+        is_bullet = bool(BULLET_RE.match(line))
+        clean = TRAILING_RE.sub('', LEADING_RE.sub('', line)).replace('**', '')
+        if not clean:
+            continue
+
+        if delimiter and delimiter in line:
+            cells = split_cells(line, delimiter)
+            if len(cells) >= 2:
+                value = ' '.join(cells[1:]).replace('**', '')
+                rendered.append({'type': 'pair', 'label': cells[0], 'value': value})
+                continue
+
+        if ':' in clean:
+            label, value = clean.split(':', 1)
+            rendered.append({'type': 'pair', 'label': label.strip(), 'value': value.strip()})
+        elif _is_heading(line, clean, is_bullet):
+            rendered.append({'type': 'heading', 'cells': [clean]})
+        else:
+            rendered.append({'type': 'text', 'text': clean, 'bullet': is_bullet})
+    return rendered
+
+
+def render_sections(job):
+    """
+    Render every text section of a job. Sections stored as tables
+    (job.parsed_tables) are returned as {'type': 'table', 'columns', 'rows'},
+    the others as {'type': 'lines', 'lines'}; empty sections are None.
+    """
+    from .models import Job
+
+    sections = {}
+    for section in Job.TEXT_SECTIONS:
+        text = getattr(job, section)
+        table = (job.parsed_tables or {}).get(section)
+        if table:
+            sections[section] = {'type': 'table', 'columns': table['columns'], 'rows': table['rows']}
+        elif text and text_lines(text):
+            sections[section] = {'type': 'lines', 'lines': render_lines(text)}
+        else:
+            sections[section] = None
+    return sections
+
+
+def get_cache():
+    return caches['render']
+
+
+def cache_key(pk, updated_at):
+    return CACHE_KEY.format(pk=pk, stamp=int(updated_at.timestamp() * 1_000_000))
+
+
+def cache_rendered(jobs):
+    """Render and cache the sections of freshly written jobs (shared cache only)."""
+    cache = get_cache()
+    if isinstance(cache, LocMemCache):
+        return
+    entries = {cache_key(job.pk, job.updated_at): render_sections(job) for job in jobs if job.pk}
+    if entries:
+        cache.set_many(entries, CACHE_TIMEOUT)
+
+
+def rendered_sections(job):
+    """The cached sections of a loaded job, rendered and cached on a miss."""
+    cache = get_cache()
+    key = cache_key(job.pk, job.updated_at)
+    sections = cache.get(key)
+    if sections is None:
+        sections = render_sections(job)
+        cache.set(key, sections, CACHE_TIMEOUT)
+    return sections
+
+
+async def arendered_sections(job):
+    """Async variant of rendered_sections() for async views."""
+    cache = get_cache()
+    key = cache_key(job.pk, job.updated_at)
+    sections = await cache.aget(key)
+    if sections is None:
+        sections = render_sections(job)
+        await cache.aset(key, sections, CACHE_TIMEOUT)
+    return sections
+
+
+def rendered_section(pk, section):
+    """
+    One rendered section of a job. On a cache hit only the job's
+    updated_at is read from the database.
+
+    Returns:
+        tuple: (updated_at, rendered section), or (None, None) if the job does not exist
+    """
+    from .models import Job
+
+    updated_at = Job.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None, None
+    sections = get_cache().get(cache_key(pk, updated_at))
+    if sections is None:
+        job = Job.objects.only('id', 'updated_at', 'parsed_tables', *Job.TEXT_SECTIONS).get(pk=pk)
+        sections = rendered_sections(job)
+    return updated_at, sections[section]
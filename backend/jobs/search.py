@@ -0,0 +1,75 @@
+"""
+Full-text job search on PostgreSQL.
+
+Job.search_vector is a stored tsvector over the title, the carrier name
+and the five consolidated sections, kept up to date by database triggers
+(migration 0023) so bulk imports are covered too, and indexed with GIN.
+Searches return jobs ranked by relevance with highlighted snippets and
+can be limited to a distance from a driver's ZIP code in the same query.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, FloatField, TextField, Value
+from django.db.models.functions import ASin, Cast, Coalesce, Concat, Cos, Power, Radians, Sin, Sqrt
+
+SEARCH_CONFIG = 'english'
+EARTH_RADIUS_MILES = 3956
+
+HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_words': 30,
+    'min_words': 10,
+    'max_fragments': 2,
+    'fragment_delimiter': ' … ',
+}
+
+
+def distance_miles(latitude, longitude):
+    """
+    Haversine distance in miles from a point to each job, as a database
+    expression. Jobs without coordinates use their carrier's headquarters
+    (like filter_jobs_by_radius); jobs with neither evaluate to NULL.
+    """
+    job_lat = Radians(Cast(Coalesce('latitude', 'carrier__headquarters_latitude'), FloatField()))
+    job_lon = Radians(Cast(Coalesce('longitude', 'carrier__headquarters_longitude'), FloatField()))
+    lat = Radians(Value(float(latitude), output_field=FloatField()))
+    lon = Radians(Value(float(longitude), output_field=FloatField()))
+    a = Power(Sin((job_lat - lat) / 2), 2) + Cos(lat) * Cos(job_lat) * Power(Sin((job_lon - lon) / 2), 2)
+    return 2 * EARTH_RADIUS_MILES * ASin(Sqrt(a))
+
+
+def search_jobs(queryset, text, latitude=None, longitude=None, radius=None):
+    """
+    Full-text search over a job queryset.
+
+    Args:
+        queryset: Job QuerySet to search
+        text (str): Search terms (web search syntax: "quoted phrases", or, -exclude)
+        latitude, longitude: Driver location; when given, only jobs within
+                             radius miles (default: each job's hiring radius)
+                             are returned, annotated with distance_miles
+        radius (int): Search radius in miles
+
+    Returns:
+        QuerySet: Matching jobs ordered by rank (then distance), annotated
+                  with rank and snippet
+    """
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    jobs = queryset.filter(search_vector=query).annotate(rank=SearchRank(F('search_vector'), query))
+    ordering = ['-rank']
+
+    if latitude is not None and longitude is not None:
+        jobs = jobs.annotate(distance_miles=distance_miles(latitude, longitude))
+        max_distance = Value(radius) if radius else F('hiring_radius_miles')
+        jobs = jobs.filter(distance_miles__lte=max_distance)
+        ordering.append('distance_miles')
+
+    # Snippets come from the text sections (the title and carrier are shown anyway)
+    text_sections = Concat(
+        'job_details', Value('\n'), 'pay_details', Value('\n'), 'requirements_details', Value('\n'),
+        'equipment_details', Value('\n'), 'key_disqualifiers',
+        output_field=TextField(),
+    )
+    return jobs.annotate(
+        snippet=SearchHeadline(text_sections, query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS)
+    ).order_by(*ordering, '-created_at')
@@ -4,14 +4,12 @@ from .models import Carrier, Job
 
 class CarrierSerializer(serializers.ModelSerializer):
     """Serializer for Carrier model with all company and benefits information"""
-    active_jobs_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Carrier
         fields = '__all__'
-
-    def get_active_jobs_count(self, obj):
-        return obj.jobs.filter(is_active=True).count()
+        # Maintained by job writes (see jobs.counters)
+        read_only_fields = ['active_jobs_count', 'open_jobs_count']
 
 
 class JobSerializer(serializers.ModelSerializer):
@@ -25,5 +23,20 @@ class JobSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ['search_vector']
+        # Parsed from the text sections on save
+        read_only_fields = Job.PARSED_FIELDS
+
+
 
+class ParsedJobSerializer(serializers.ModelSerializer):
+    """Validates job fields parsed from raw postings (the carrier is resolved once per batch)"""
+
+    class Meta:
+        model = Job
+        fields = [
+            'title', 'state', 'zip_code', 'hiring_radius_miles',
+            'job_details', 'pay_details', 'equipment_details',
+            'key_disqualifiers', 'requirements_details',
+            'source_create_date', 'source_modified_date',
+        ]
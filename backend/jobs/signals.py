@@ -0,0 +1,46 @@
+"""
+Signal handlers for jobs and carriers saved or deleted one at a time:
+they log the change (bumping the catalog version), refresh the carrier
+job counters and cache the rendered job sections.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import catalog, counters, rendering
+from .models import Carrier, Job
+
+
+KINDS = {Job: 'job', Carrier: 'carrier'}
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Carrier)
+def catalog_saved(sender, instance, **kwargs):
+    catalog.log_changes(KINDS[sender], upserted=[instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Carrier)
+def catalog_deleted(sender, instance, **kwargs):
+    catalog.log_changes(KINDS[sender], deleted=[instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def cache_rendered_job(sender, instance, update_fields=None, **kwargs):
+    # Saves that leave the sections alone keep their cache entry
+    if update_fields is None or set(update_fields) & set(Job.TEXT_SECTIONS):
+        rendering.cache_rendered([instance])
+
+
+@receiver(post_save, sender=Job)
+def refresh_counts_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None:
+        # update_fields may name the carrier by field name or attname
+        update_fields = {f'{field}_id' if field == 'carrier' else field for field in update_fields}
+    if created or any(instance.has_changed(field, update_fields) for field in counters.COUNTED_FIELDS):
+        counters.refresh_carrier_counts({instance.carrier_id, instance.loaded_value('carrier_id')})
+
+
+@receiver(post_delete, sender=Job)
+def refresh_counts_on_delete(sender, instance, **kwargs):
+    # Deletes run in a transaction, so this is atomic with the delete
+    counters.refresh_carrier_counts({instance.carrier_id})
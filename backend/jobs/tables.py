@@ -0,0 +1,148 @@
+"""
+Parse pasted table text (carrier presentations, pre-qualifications and
+tabular job sections) into columns and rows.
+
+Parsing happens once on save (see Carrier.refresh_parsed_tables and
+Job.refresh_parsed_fields) and the result is stored in parsed_tables,
+so clients render and filter rows without re-splitting the raw text.
+The rules follow the table rendering of the Opportunities page.
+"""
+
+# Header line of presentation tables that has no delimiter itself
+PRESENTATION_HEADER = 'PRESENTATION TOPIC DESCRIPTION'
+
+DELIMITERS = ('|', '\t', ',')
+
+
+def text_lines(text):
+    """Non-empty, stripped lines (imports sometimes store newlines as a literal "\\n")."""
+    text = str(text).replace('\\n', '\n')
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def split_cells(line, delimiter):
+    """
+    Split one line into cells. Comma-separated lines honour double
+    quotes ("a, b" is one cell and "" is an escaped quote).
+    """
+    if delimiter != ',':
+        return [cell.strip() for cell in line.split(delimiter)]
+
+    cells = []
+    current = ''
+    in_quotes = False
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '"':
+            if in_quotes and line[i + 1:i + 2] == '"':
+                current += '"'
+                i += 1
+            else:
+                in_quotes = not in_quotes
+        elif char == ',' and not in_quotes:
+            cells.append(current.strip())
+            current = ''
+        else:
+            current += char
+        i += 1
+    cells.append(current.strip())
+    return [cell.removeprefix('"').removesuffix('"') for cell in cells]
+
+
+def detect_delimiter(lines):
+    """The delimiter of the first of the first three lines that has one."""
+    for line in lines[:3]:
+        for delimiter in DELIMITERS:
+            if delimiter in line:
+                return delimiter
+    return None
+
+
+def parse_table(text):
+    """
+    Parse pasted table text. The first row is the header; lines without
+    a delimiter (or starting with an empty cell) continue the last cell
+    of the previous row.
+
+    Args:
+        text (str): Raw field text
+
+    Returns:
+        dict: {'delimiter', 'columns', 'rows'} or None if the text is not a table
+    """
+    if not text:
+        return None
+    lines = text_lines(text)
+    if len(lines) <= 1:
+        return None
+
+    delimiter = detect_delimiter(lines)
+    if not delimiter and lines[0].upper() != PRESENTATION_HEADER:
+        return None
+
+    rows = []
+    for line in lines:
+        if delimiter and (delimiter in line or (delimiter == ',' and line.startswith('"'))):
+            cells = split_cells(line, delimiter)
+            if cells[0] == '' and rows:
+                last_row = rows[-1]
+                index = min(len(last_row), len(cells)) - 1
+                last_row[index] += '\n' + ' '.join(cells[1:])
+            else:
+                rows.append(cells)
+        elif rows:
+            rows[-1][-1] += '\n' + line
+        else:
+            rows.append([line])
+
+    return {'delimiter': delimiter, 'columns': rows[0], 'rows': rows[1:]}
+
+
+def parse_section_table(text):
+    """
+    Parse a job section if it is a pasted table. Sections are mostly
+    prose and "Label: value" lines, so a delimiter only counts when it is
+    on the first line, that line is not a "Label: value" line, and every
+    row has as many cells as the header (at least two).
+
+    Returns:
+        dict: Same shape as parse_table, or None
+    """
+    lines = text_lines(text) if text else []
+    if len(lines) <= 1 or ':' in lines[0]:
+        return None
+    if not any(delimiter in lines[0] for delimiter in DELIMITERS):
+        return None
+    table = parse_table(text)
+    if table is None or len(table['columns']) < 2 or not table['rows']:
+        return None
+    if any(len(row) != len(table['columns']) for row in table['rows']):
+        return None
+    return table
+
+
+def parse_tables(fields, parser=parse_table):
+    """
+    Parse several text fields.
+
+    Args:
+        fields (dict): field name -> raw text
+
+    Returns:
+        dict: field name -> table, for the fields that are tables
+    """
+    tables = {}
+    for field, text in fields.items():
+        table = parser(text)
+        if table is not None:
+            tables[field] = table
+    return tables
+
+
+def filter_rows(table, query):
+    """Rows of a parsed table with a cell containing query (case-insensitive)."""
+    query = (query or '').strip().lower()
+    if not query:
+        return table['rows']
+    return [row for row in table['rows'] if any(query in cell.lower() for cell in row)]
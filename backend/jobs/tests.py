@@ -1,3 +1,1105 @@
-from django.test import TestCase
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+import openpyxl
+import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.admin.sites import site
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from . import async_views, catalog, events, gazetteer, remote_geocoder, rendering
+from .admin import JobAdmin
+from .carrier_lookup import match_carriers, normalize_name, suggest_carriers
+from .enrichment import enrich_jobs
+from .extraction import extract_facts
+from .facets import count_jobs, count_queryset, facet_filters
+from .hiring import set_hiring_status
+from .import_utils import CarrierResolver, carrier_content_hash, classify_by_hash, compute_content_hash
+from .models import Carrier, CarrierAlias, CatalogChange, CatalogVersion, Job
+from .posting_parser import POOL_THRESHOLD, parse_chunk, parse_posting, parse_postings, split_postings
+from .remote_geocoder import CircuitOpenError, RemoteGeocoder, TokenBucket, TransientError
+from .search import distance_miles
+from .tables import filter_rows, parse_section_table, parse_table, split_cells
+from .utils import RADIUS_RESULTS_LIMIT, calculate_distance
+from .views import ChangesView
 
-# Create your tests here.
+
+class StubResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.data = data or {}
+
+    def json(self):
+        return self.data
+
+
+class StubSession:
+    """Stands in for the pooled session: replays responses (or raises exceptions) in order."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(url)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+ZIP_FOUND = StubResponse(200, {'places': [{'latitude': '40.75', 'longitude': '-73.99', 'state abbreviation': 'NY'}]})
+
+
+def stub_geocoder(session, **kwargs):
+    geocoder = RemoteGeocoder(zip_url='http://stub/us/{zip}', rate=1000, backoff=0, **kwargs)
+    geocoder.session = session
+    return geocoder
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_paces_calls_after_the_burst(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # 2 calls from the burst, the other 4 at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+
+class RemoteGeocoderTests(SimpleTestCase):
+    def test_retries_transient_failures(self):
+        session = StubSession(StubResponse(429), requests.ConnectionError(), ZIP_FOUND)
+        result = stub_geocoder(session, retries=2).resolve_zip('10001')
+        self.assertEqual(result['latitude'], 40.75)
+        self.assertEqual(result['state'], 'NY')
+        self.assertEqual(len(session.calls), 3)
+
+    def test_unknown_zip_is_a_definite_answer(self):
+        session = StubSession(StubResponse(404))
+        self.assertEqual(stub_geocoder(session).resolve_zip('00000'), {'source': 'zippopotam'})
+
+    def test_gives_up_after_retries(self):
+        session = StubSession(StubResponse(503))
+        with self.assertRaises(TransientError):
+            stub_geocoder(session, retries=1, breaker_threshold=10).resolve_zip('10001')
+        self.assertEqual(len(session.calls), 2)
+
+    def test_circuit_opens_and_recovers(self):
+        session = StubSession(requests.Timeout(), requests.Timeout(), ZIP_FOUND)
+        geocoder = stub_geocoder(session, retries=0, breaker_threshold=2, breaker_cooldown=0.1)
+        for _ in range(2):
+            with self.assertRaises(TransientError):
+                geocoder.resolve_zip('10001')
+
+        # Open: rejected without calling the provider
+        with self.assertRaises(CircuitOpenError):
+            geocoder.resolve_zip('10001')
+        self.assertEqual(len(session.calls), 2)
+        self.assertEqual(geocoder.breakers['zip'].state, 'open')
+        # The location provider has its own circuit
+        self.assertEqual(geocoder.breakers['location'].state, 'closed')
+
+        # Half-open after the cooldown: a successful trial call closes it
+        time.sleep(0.15)
+        self.assertEqual(geocoder.resolve_zip('10001')['latitude'], 40.75)
+        self.assertEqual(geocoder.breakers['zip'].state, 'closed')
+
+    def test_failed_trial_reopens_the_circuit(self):
+        session = StubSession(requests.Timeout())
+        geocoder = stub_geocoder(session, retries=0, breaker_threshold=1, breaker_cooldown=0.1)
+        with self.assertRaises(TransientError):
+            geocoder.resolve_zip('10001')
+        time.sleep(0.15)
+        with self.assertRaises(TransientError):
+            geocoder.resolve_zip('10001')
+        self.assertEqual(geocoder.breakers['zip'].state, 'open')
+
+
+class AsyncViewTests(TestCase):
+    """The async views answer with the same payloads as the DRF views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrier = Carrier.objects.create(name='Parity Freight', headquarters_zip='34266')
+        cls.job = Job.objects.create(
+            carrier=cls.carrier, title='OTR Driver', state='FL', zip_code='34266',
+            pay_details='$0.60 - $0.70 CPM', job_details='**Home weekly**',
+        )
+        Job.objects.create(carrier=cls.carrier, title='Local Driver', state='FL', hiring_status='full')
+
+    def assertSamePayload(self, view, path, *args):
+        expected = self.client.get(path).json()
+        self.assertTrue(expected)
+        response = async_to_sync(view)(AsyncRequestFactory().get(path), *args)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), expected)
+
+    def test_job_list(self):
+        self.assertSamePayload(async_views.job_list, '/api/jobs/')
+        self.assertSamePayload(async_views.job_list, '/api/jobs/?facets=1&hiring_status=open')
+        self.assertSamePayload(async_views.job_list, '/api/jobs/?zip_code=34269')
+        self.assertSamePayload(async_views.job_list, '/api/jobs/?zip_code=34269&facets=1&ordering=-cpm')
+
+    def test_job_list_errors_are_not_swallowed(self):
+        path = '/api/jobs/?zip_code=34269'
+        with mock.patch('jobs.views.filter_jobs_by_radius', side_effect=RuntimeError('geocoder down')):
+            with self.assertRaises(RuntimeError):
+                self.client.get(path)
+            with self.assertRaises(RuntimeError):
+                async_to_sync(async_views.job_list)(AsyncRequestFactory().get(path))
+
+    def test_job_list_rejects_invalid_params(self):
+        response = async_to_sync(async_views.job_list)(AsyncRequestFactory().get('/api/jobs/?min_cpm=abc'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), self.client.get('/api/jobs/?min_cpm=abc').json())
+
+    def test_job_detail(self):
+        self.assertSamePayload(async_views.job_detail, f'/api/jobs/{self.job.pk}/', self.job.pk)
+
+    def test_carrier_list(self):
+        self.assertSamePayload(async_views.carrier_list, '/api/carriers/')
+
+
+class ContentHashTests(SimpleTestCase):
+    def test_hash_ignores_column_order_whitespace_and_empty_columns(self):
+        self.assertEqual(
+            compute_content_hash({'title': 'Driver', 'state': 'FL'}),
+            compute_content_hash({'state': ' FL ', 'title': 'Driver', 'notes': ''}),
+        )
+        self.assertNotEqual(
+            compute_content_hash({'title': 'Driver', 'state': 'FL'}),
+            compute_content_hash({'title': 'Driver', 'state': 'GA'}),
+        )
+
+    def test_classify_by_hash(self):
+        incoming = {'a': 'h1', 'b': 'h2', 'c': 'h3'}
+        existing = {'a': (1, 'h1'), 'b': (2, 'old'), 'z': (3, 'h9')}
+        self.assertEqual(
+            classify_by_hash(incoming, existing),
+            {'new': ['c'], 'changed': ['b'], 'unchanged': ['a']},
+        )
+
+    def test_carrier_importers_agree_on_the_hash(self):
+        values = {'description': 'Regional freight', 'headquarters_zip': '34266', 'benefit_other': ''}
+        # The xlsx importer reads numbers as numbers and empty cells as None
+        self.assertEqual(
+            carrier_content_hash({'name': 'Acme', **values}),
+            carrier_content_hash({**values, 'headquarters_zip': 34266, 'benefit_other': None, 'content_hash': 'x'}),
+        )
+
+
+class CarrierImportHashTests(TestCase):
+    """A carrier written by one importer is unchanged for the others."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def import_csv(self):
+        path = os.path.join(self.tmp, 'carriers.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('name,description,headquarters_zip\nAcme Freight,Regional freight,34266\n')
+        out = io.StringIO()
+        call_command('import_carriers', path, '--update', stdout=out)
+        return out.getvalue()
+
+    def import_xlsx(self):
+        path = os.path.join(self.tmp, 'carriers.xlsx')
+        wb = openpyxl.Workbook()
+        wb.active.append(['name', 'description', 'headquarters_zip'])
+        wb.active.append(['Acme Freight', 'Regional freight', 34266])
+        wb.save(path)
+        out = io.StringIO()
+        call_command('import_carriers_xlsx', path, '--update', stdout=out)
+        return out.getvalue()
+
+    def test_csv_then_xlsx(self):
+        self.import_csv()
+        self.assertIn('Created 0, Updated 0, Unchanged 1', self.import_xlsx())
+
+    def test_job_import_then_csv(self):
+        resolver = CarrierResolver()
+        resolver.resolve({'Acme Freight': {'description': 'Regional freight', 'headquarters_zip': '34266'}})
+        self.assertIn('Carriers unchanged: 1', self.import_csv())
+
+
+def write_csv(directory, name, lines):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('carrier_name,title,state,pay_details\n' + ''.join(line + '\n' for line in lines))
+    return path
+
+
+class ImportJobsTests(TestCase):
+    """Multi-file import: one carrier resolution and one row per job across files."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def import_jobs(self, *args):
+        out = io.StringIO()
+        call_command('import_jobs', self.tmp, '--workers', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_files_share_carriers_and_skip_duplicate_rows(self):
+        write_csv(self.tmp, 'a.csv', ['Acme Freight,OTR Driver,FL,$0.60 CPM', 'Acme Freight,Local Driver,FL,'])
+        write_csv(self.tmp, 'b.csv', ['Acme Freight,OTR Driver,FL,$0.65 CPM', 'Beta Lines,OTR Driver,GA,'])
+
+        output = self.import_jobs()
+        self.assertIn('Carriers created: 2', output)
+        self.assertIn('b.csv row 2: Duplicate of an earlier row', output)
+        self.assertEqual(Carrier.objects.count(), 2)
+        # The first row of a duplicated job wins
+        self.assertEqual(
+            Job.objects.get(carrier__name='Acme Freight', title='OTR Driver').pay_details, '$0.60 CPM'
+        )
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_reimport_skips_unchanged_and_updates_changed_rows(self):
+        write_csv(self.tmp, 'a.csv', ['Acme Freight,OTR Driver,FL,$0.60 CPM'])
+        write_csv(self.tmp, 'b.csv', ['Acme Freight,Local Driver,FL,'])
+        self.import_jobs()
+
+        write_csv(self.tmp, 'a.csv', ['Acme Freight,OTR Driver,FL,$0.70 CPM'])
+        output = self.import_jobs('--update')
+        self.assertIn('Jobs changed:     1 (1 updated, 0 skipped)', output)
+        self.assertIn('Jobs unchanged:   1', output)
+        self.assertEqual(Job.objects.get(title='OTR Driver').pay_details, '$0.70 CPM')
+
+    def test_deactivate_vanished(self):
+        write_csv(self.tmp, 'a.csv', ['Acme Freight,OTR Driver,FL,', 'Acme Freight,Local Driver,FL,'])
+        self.import_jobs()
+        write_csv(self.tmp, 'a.csv', ['Acme Freight,OTR Driver,FL,'])
+        self.import_jobs('--deactivate-vanished')
+        self.assertFalse(Job.objects.get(title='Local Driver').is_active)
+        self.assertEqual(Carrier.objects.get().active_jobs_count, 1)
+
+
+def softr_listing(company, title, pay, states):
+    fields = [('_gicjcwgov', company), ('_nr67crtk9', title), ('_v1qt13aoq', f'Pay Details{pay}')]
+    fields += [('_e6sd7p6ya', state) for state in states]
+    body = ''.join(f'<div data-softr-field-id="{field_id}"><span>{text}</span></div>' for field_id, text in fields)
+    return f'<div role="listitem" data-testid="list-item"><div class="card">{body}</div></div>'
+
+
+class HtmlImportTests(TestCase):
+    """The streaming Softr page importer (import_jobs_from_html.py)."""
+
+    def setUp(self):
+        import import_jobs_from_html
+        self.importer = import_jobs_from_html
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.path = os.path.join(tmp, 'Job Search.html')
+        listings = [
+            softr_listing(f'Carrier {n % 3}', f'Dry Van {n} - Tampa, FL', f'${n} per week', ['FLGA'])
+            for n in range(20)
+        ]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(f'<html><body><div role="list">{"".join(listings)}</div></body></html>')
+
+    def parse(self, workers):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.importer.parse_html_file(self.path, workers)
+
+    def test_streams_every_listing(self):
+        jobs = self.parse(1)
+        self.assertEqual(len(jobs), 20)
+        self.assertEqual(jobs[3]['company'], 'Carrier 0')
+        self.assertEqual(jobs[3]['state'], 'Tampa, FL')
+        self.assertEqual(jobs[3]['pay_details'], '**Pay:** $3 per week')
+        self.assertIn('**States:** FL, GA', jobs[3]['requirements_details'])
+
+    def test_pool_returns_the_serial_result_in_file_order(self):
+        with mock.patch.object(self.importer, 'LISTING_CHUNK_SIZE', 3):
+            self.assertEqual(self.parse(2), self.parse(1))
+
+    def test_import_and_reimport(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.importer.import_jobs(self.path)
+        self.assertEqual(Job.objects.count(), 20)
+        self.assertEqual(Carrier.objects.count(), 3)
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.importer.import_jobs(self.path)
+        self.assertIn('Unchanged: 20 jobs', out.getvalue())
+
+
+class ImportCarriersXlsxTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def import_rows(self, rows, *args, headers=('name', 'description')):
+        path = os.path.join(self.tmp, 'carriers.xlsx')
+        wb = openpyxl.Workbook()
+        wb.active.append(list(headers))
+        for row in rows:
+            wb.active.append(list(row))
+        wb.save(path)
+        out = io.StringIO()
+        call_command('import_carriers_xlsx', path, '--update', *args, stdout=out)
+        return out.getvalue()
+
+    def test_repeated_names_write_the_last_row_once(self):
+        self.import_rows([('Acme Freight', 'a')])
+        output = self.import_rows([('Acme Freight', 'b'), ('Acme Freight', 'c')], '--batch-size', '1')
+        self.assertIn('Created 0, Updated 1, Unchanged 0', output)
+        self.assertEqual(Carrier.objects.get().description, 'c')
+
+        output = self.import_rows([('Acme Freight', 'c'), ('Acme Freight', 'c')])
+        self.assertIn('Created 0, Updated 0, Unchanged 1', output)
+
+    def test_updates_do_not_query_per_carrier(self):
+        names = [f'Carrier {n}' for n in range(8)]
+        self.import_rows([(name, 'Table: old') for name in names[:2]] + [(name, 'x') for name in names[2:]])
+
+        def update_queries(count):
+            with CaptureQueriesContext(connection) as queries:
+                self.import_rows([(name, 'new') for name in names[:count]])
+            return len(queries)
+
+        self.assertEqual(update_queries(2), update_queries(8))
+
+    def test_failed_batch_falls_back_to_row_by_row(self):
+        with mock.patch.object(Carrier.objects, 'bulk_create', side_effect=IntegrityError('batch')):
+            output = self.import_rows([('Acme Freight', 'a'), ('Beta Lines', 'b')])
+        self.assertIn('Created 2', output)
+        self.assertEqual(Carrier.objects.count(), 2)
+
+
+class EnrichJobsTests(TestCase):
+    """Saves only flag jobs; enrich_jobs resolves them inline."""
+
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Acme Freight')
+
+    def test_save_flags_and_enrich_resolves(self):
+        job = Job.objects.create(carrier=self.carrier, title='Driver', state='FL', zip_code='34266')
+        job.refresh_from_db()
+        self.assertTrue(job.needs_enrichment)
+        self.assertIsNone(job.latitude)
+
+        self.assertEqual(enrich_jobs(), 1)
+        job.refresh_from_db()
+        self.assertFalse(job.needs_enrichment)
+        self.assertEqual(job.location_source, 'job_zip')
+        self.assertEqual(job.zip_source, 'provided')
+        self.assertIsNotNone(job.latitude)
+        # Nothing left to do
+        self.assertEqual(enrich_jobs(), 0)
+
+    def test_zipless_job_takes_the_headquarters_zip(self):
+        carrier = Carrier.objects.create(name='Beta Lines', headquarters_zip='34269')
+        job = Job.objects.create(carrier=carrier, title='Driver', state='Unknown')
+        enrich_jobs(Job.objects.filter(pk=job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.zip_code, job.zip_source), ('34269', 'carrier_hq'))
+        carrier.refresh_from_db()
+        self.assertEqual(job.latitude, carrier.headquarters_latitude)
+        self.assertFalse(job.needs_enrichment)
+
+    def test_transient_failures_stay_flagged(self):
+        # 10001 is not in the local ZIP table, so it goes to the remote provider
+        job = Job.objects.create(carrier=self.carrier, title='Driver', state='NY', zip_code='10001')
+        with mock.patch('jobs.geocoding.get_session', return_value=StubSession(requests.ConnectionError())):
+            self.assertEqual(enrich_jobs(), 0)
+        job.refresh_from_db()
+        self.assertTrue(job.needs_enrichment)
+
+        # A definite "unknown ZIP" is cached and settles the job
+        with mock.patch('jobs.geocoding.get_session', return_value=StubSession(StubResponse(404))):
+            self.assertEqual(enrich_jobs(), 1)
+        job.refresh_from_db()
+        self.assertFalse(job.needs_enrichment)
+        self.assertEqual(job.location_source, 'state_only')
+
+    def test_admin_action_only_queues(self):
+        job = Job.objects.create(carrier=self.carrier, title='Driver', state='FL', zip_code='34266')
+        enrich_jobs()
+        admin = JobAdmin(Job, site)
+        with mock.patch.object(admin, 'message_user'), mock.patch('jobs.enrichment.enrich_jobs') as enrich:
+            admin.enrich_selected(None, Job.objects.filter(pk=job.pk))
+        enrich.assert_not_called()
+        job.refresh_from_db()
+        self.assertTrue(job.needs_enrichment)
+
+
+class GazetteerTests(TestCase):
+    def test_normalizes_city_names(self):
+        self.assertEqual(gazetteer.make_key(' St. Louis ', 'mo'), 'saint louis|MO')
+        self.assertEqual(gazetteer.normalize_city('Ft Myers'), 'fort myers')
+
+    def test_representative_zip_is_closest_to_the_centroid(self):
+        index = gazetteer.build_index([
+            ('00001', 'Springfield', 'IL', 39.0, -89.0),
+            ('00002', 'Springfield', 'IL', 39.5, -89.5),
+            ('00003', 'Springfield', 'IL', 40.0, -90.0),
+            ('00004', 'Nowhere', 'IL', None, None),
+        ])
+        self.assertEqual(index, {'springfield|IL': ('00002', 39.5, -89.5)})
+
+    def test_reads_the_dataset_file_pgeocode_caches(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        with open(os.path.join(tmp, 'US.txt'), 'w', encoding='utf-8') as f:
+            f.write('country_code,postal_code,place_name,state_name,state_code,latitude,longitude\n')
+            f.write('US,501,Holtsville,New York,NY,40.8154,-73.0451\n')
+            f.write('US,99999,Nowhere,Alaska,AK,,\n')
+        with mock.patch('pgeocode.STORAGE_DIR', tmp):
+            rows = list(gazetteer.rows_from_pgeocode())
+        self.assertEqual(rows, [('00501', 'Holtsville', 'NY', 40.8154, -73.0451)])
+
+    def test_enrichment_counts_each_lookup_once(self):
+        carrier = Carrier.objects.create(name='Acme Freight')
+        job = Job.objects.create(carrier=carrier, title='Driver', state='Tampa, FL')
+        unknown = Job.objects.create(carrier=carrier, title='Driver', state='Smallville, FL')
+        no_match = StubResponse(200, {'result': {'addressMatches': []}})
+        gazetteer.reset_stats()
+        with mock.patch('jobs.zip_utils.get_session', return_value=StubSession(no_match)):
+            self.assertEqual(enrich_jobs(), 2)
+        job.refresh_from_db()
+        self.assertEqual((job.zip_code, job.zip_source), ('33601', 'geocoded'))
+        unknown.refresh_from_db()
+        self.assertEqual((unknown.zip_code, unknown.needs_enrichment), (None, False))
+        self.assertEqual(gazetteer.stats, {'hits': 1, 'misses': 1})
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Zippopotam.us API."""
+
+    flaky = {}
+
+    def do_GET(self):
+        zip_code = self.path.rsplit('/', 1)[-1]
+        if zip_code == 'slow':
+            time.sleep(0.5)
+        if self.flaky.get(zip_code, 0) > 0:
+            self.flaky[zip_code] -= 1
+            return self.reply(503, {})
+        if zip_code != '10001':
+            return self.reply(404, {})
+        self.reply(200, ZIP_FOUND.data)
+
+    def reply(self, status_code, data):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RemoteGeocoderHttpTests(SimpleTestCase):
+    """The pooled requests client against a stand-in server on localhost."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.zip_url = f'http://127.0.0.1:{cls.server.server_port}/us/{{zip}}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def geocoder(self, **kwargs):
+        return RemoteGeocoder(zip_url=self.zip_url, rate=1000, backoff=0, **kwargs)
+
+    def test_status_handling(self):
+        geocoder = self.geocoder()
+        self.assertEqual(geocoder.resolve_zip('10001')['state'], 'NY')
+        self.assertEqual(geocoder.resolve_zip('00000'), {'source': 'zippopotam'})
+
+    def test_retries_server_errors(self):
+        StandInHandler.flaky['10001'] = 2
+        self.assertEqual(self.geocoder(retries=2).resolve_zip('10001')['latitude'], 40.75)
+        StandInHandler.flaky['10001'] = 2
+        with self.assertRaises(TransientError):
+            self.geocoder(retries=1).resolve_zip('10001')
+        StandInHandler.flaky.clear()
+
+    def test_timeout_is_transient(self):
+        with self.assertRaises(TransientError):
+            self.geocoder(retries=0, timeout=0.1).resolve_zip('slow')
+
+    def test_pool_grows_for_more_workers(self):
+        with mock.patch.object(remote_geocoder, '_session', None), mock.patch.object(remote_geocoder, '_pool_size', 0):
+            session = remote_geocoder.get_session(pool_size=2)
+            self.assertIs(remote_geocoder.get_session(pool_size=32), session)
+            self.assertEqual(self.pool_size(session), 32)
+            remote_geocoder.get_session(pool_size=4)
+            self.assertEqual(self.pool_size(session), 32)
+
+    @staticmethod
+    def pool_size(session):
+        return session.get_adapter('http://example.com').poolmanager.connection_pool_kw['maxsize']
+
+
+POSTING = """Lane Information
+Dry Van OTR - Tampa, FL
+Must Live Within 75 miles of 34266
+Hiring Area Zip Codes: 33601, 33602
+Pay Range: $0.55 - $0.65 CPM
+Weekly Mileage: 2,500 - 3,000
+Home Time: Home weekly
+Freight Types: Dry Van, Reefer
+Driver Types: Company Drivers
+Experience Requirements: First Seat
+Experience Levels: 6 months
+States: FL, GA, AL
+Equipment: 2024 Freightliner Cascadia
+Disqualifiers: DUI in 5 years
+"""
+
+
+class ExtractionTests(SimpleTestCase):
+    def test_extracts_every_fact_in_one_pass(self):
+        facts = extract_facts(POSTING)
+        self.assertEqual(facts.zip_hint(), ('34266', 75))
+        self.assertEqual(facts.hiring_area_zips, ('33601', '33602'))
+        self.assertEqual(facts.states, ('FL', 'GA', 'AL'))
+        self.assertEqual(facts.field('pay range'), '$0.55 - $0.65 CPM')
+        self.assertEqual(facts.pay_columns(), {
+            'cpm_min': Decimal('0.55'), 'cpm_max': Decimal('0.65'),
+            # Midpoint CPM times the average weekly miles
+            'weekly_pay_estimate': 1650, 'pay_type': 'cpm',
+        })
+        self.assertEqual(facts.facet_columns(), {
+            'freight_types': ',dry_van,reefer,', 'driver_types': ',company,',
+            'home_time': 'weekly', 'experience_months': 6,
+        })
+
+    def test_results_are_memoized(self):
+        self.assertIs(extract_facts(POSTING), extract_facts(POSTING))
+
+    def test_experience_from_any_experience_label(self):
+        self.assertEqual(extract_facts('Experience: 1 year').experience_months, 12)
+        self.assertEqual(extract_facts('Experience Requirements: Trainees welcome').experience_months, 0)
+        facts = extract_facts('Experience Requirements: First Seat\nExperience Levels: 3 Months')
+        self.assertEqual(facts.experience_months, 3)
+        self.assertEqual(extract_facts('Experience: First Seat').experience, 'First Seat')
+
+    def test_weekly_pay_ignores_other_dollar_figures(self):
+        facts = extract_facts('Weekly Pay: $1,200 - $1,500\nStop Pay: $150\nNight differential $.06 CPM')
+        self.assertEqual(facts.pay_columns(), {
+            'cpm_min': None, 'cpm_max': None, 'weekly_pay_estimate': 1350, 'pay_type': 'weekly',
+        })
+
+    def test_zip_hint_falls_back_to_hiring_area_then_any_zip(self):
+        self.assertEqual(extract_facts('Hiring Area Zip Codes: 33601, 33602').zip_hint(), ('33601', None))
+        self.assertEqual(extract_facts('Terminal near 34266').zip_hint(), ('34266', None))
+        self.assertEqual(extract_facts('').zip_hint(), (None, None))
+
+
+class PostingParserTests(SimpleTestCase):
+    def test_parse_posting(self):
+        fields = parse_posting(POSTING)
+        self.assertEqual(fields['title'], 'Dry Van OTR - Tampa, FL')
+        self.assertEqual((fields['state'], fields['zip_code'], fields['hiring_radius_miles']), ('FL', '34266', 75))
+        self.assertEqual(fields['pay_details'], 'Pay Range: $0.55 - $0.65 CPM\nWeekly Mileage: 2,500 - 3,000')
+        self.assertEqual(fields['key_disqualifiers'], 'Disqualifiers: DUI in 5 years')
+        self.assertIn('Experience Levels: 6 months', fields['requirements_details'])
+
+    def test_split_postings(self):
+        self.assertEqual(split_postings('first\n---\n\nsecond\n=====\n'), ['first', 'second'])
+
+    def test_pool_matches_inline_parsing(self):
+        texts = [POSTING.replace('34266', f'{34000 + n}') for n in range(POOL_THRESHOLD + 5)]
+        self.assertEqual(parse_postings(texts), parse_chunk(texts))
+
+
+class BatchParseJobsTests(TestCase):
+    url = '/api/jobs/parse/batch/'
+
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Acme Freight')
+
+    def post(self, **data):
+        return self.client.post(self.url, data, content_type='application/json')
+
+    def test_dry_run_validates_without_creating(self):
+        response = self.post(postings=[POSTING, '  ', {'raw_text': POSTING, 'carrier_id': 999999}],
+                             carrier_id=self.carrier.pk, dry_run=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['summary'], {'valid': 1, 'invalid': 2})
+        self.assertEqual([result['index'] for result in data['results']], [0, 1, 2])
+        self.assertEqual(data['results'][0]['fields']['zip_code'], '34266')
+        self.assertEqual(data['results'][2]['errors'], {'carrier_id': ['Carrier not found.']})
+        self.assertFalse(Job.objects.exists())
+
+    def test_creates_valid_postings_together(self):
+        response = self.post(postings=[POSTING, POSTING.replace('Tampa', 'Arcadia')], carrier_id=self.carrier.pk)
+        self.assertEqual(response.status_code, 201)
+        ids = [result['id'] for result in response.json()['results']]
+        job = Job.objects.get(pk=ids[0])
+        self.assertEqual((job.carrier, job.zip_code, job.cpm_min), (self.carrier, '34266', Decimal('0.550')))
+        self.assertTrue(job.needs_enrichment)
+        self.carrier.refresh_from_db()
+        self.assertEqual(self.carrier.active_jobs_count, 2)
+
+    def test_file_upload(self):
+        upload = SimpleUploadedFile('postings.txt', f'{POSTING}\n---\n{POSTING}'.encode())
+        response = self.client.post(self.url, {'file': upload, 'carrier_id': self.carrier.pk, 'dry_run': '1'})
+        self.assertEqual(response.json()['summary'], {'valid': 2})
+
+    def test_requires_postings(self):
+        self.assertEqual(self.post(carrier_id=self.carrier.pk).status_code, 400)
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrier = Carrier.objects.create(name='Facet Freight')
+        cls.other = Carrier.objects.create(name='Other Freight')
+        # Arcadia, FL: inside the radius of a driver at 34266
+        for n in range(RADIUS_RESULTS_LIMIT + 5):
+            Job.objects.create(
+                carrier=cls.carrier if n % 5 else cls.other, title=f'Dry Van {n}', state='FL',
+                zip_code='34266', latitude=27.2, longitude=-81.86,
+                job_details='Freight Type: Reefer, Dry Van' if n % 2 else 'Freight Type: Dry Van',
+            )
+
+    def test_facet_filters(self):
+        jobs = Job.objects.filter(facet_filters({'freight_type': 'reefer', 'carrier': str(self.carrier.pk)}))
+        self.assertEqual(jobs.count(), 22)
+        self.assertEqual(Job.objects.filter(facet_filters({'freight_type': 'dry_van,reefer'})).count(), 55)
+        with self.assertRaises(ValueError):
+            facet_filters({'freight_type': 'hazmat'})
+        with self.assertRaises(ValueError):
+            facet_filters({'carrier': 'acme'})
+
+    def test_count_queryset_matches_count_jobs(self):
+        queryset = Job.objects.select_related('carrier')
+        facets = count_queryset(queryset)
+        self.assertEqual(facets, count_jobs(queryset))
+        self.assertEqual(
+            [(entry['value'], entry['count']) for entry in facets['freight_type']],
+            [('dry_van', 55), ('reefer', 27)],
+        )
+        self.assertEqual(facets['carrier'][0], {'value': self.carrier.pk, 'label': 'Facet Freight', 'count': 44})
+
+    def test_radius_facets_count_every_match(self):
+        data = self.client.get('/api/jobs/?zip_code=34266&facets=1').json()
+        self.assertEqual(len(data['results']), RADIUS_RESULTS_LIMIT)
+        self.assertEqual(sum(entry['count'] for entry in data['facets']['carrier']), 55)
+        self.assertEqual(len(self.client.get('/api/jobs/?zip_code=34266').json()), RADIUS_RESULTS_LIMIT)
+
+
+class JobSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrier = Carrier.objects.create(name='Search Freight')
+        cls.near = Job.objects.create(
+            carrier=cls.carrier, title='Reefer Driver', state='FL', latitude=27.2, longitude=-81.86,
+            job_details='Refrigerated loads, home weekly', hiring_radius_miles=100,
+        )
+        cls.far = Job.objects.create(
+            carrier=cls.carrier, title='Flatbed Driver', state='GA', latitude=33.75, longitude=-84.39,
+            job_details='Flatbed loads, tarping required', hiring_radius_miles=100,
+        )
+
+    def test_distance_expression_matches_haversine(self):
+        jobs = Job.objects.annotate(distance=distance_miles(27.2, -81.86)).order_by('distance')
+        self.assertEqual(list(jobs), [self.near, self.far])
+        self.assertAlmostEqual(jobs[0].distance, 0, places=3)
+        self.assertAlmostEqual(jobs[1].distance, calculate_distance(27.2, -81.86, 33.75, -84.39), places=0)
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/jobs/search/?q=%20').status_code, 400)
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'PostgreSQL runs the search')
+    def test_other_databases_are_not_supported(self):
+        self.assertEqual(self.client.get('/api/jobs/search/?q=reefer').status_code, 501)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Full-text search requires PostgreSQL')
+    def test_ranked_search_with_radius(self):
+        results = self.client.get('/api/jobs/search/?q=loads').json()
+        self.assertEqual({result['id'] for result in results}, {self.near.pk, self.far.pk})
+        results = self.client.get('/api/jobs/search/?q=refrigerated').json()
+        self.assertEqual([result['id'] for result in results], [self.near.pk])
+        self.assertIn('<mark>', results[0]['snippet'])
+        self.assertEqual(self.client.get('/api/jobs/search/?q=loads -tarping').json()[0]['id'], self.near.pk)
+        results = self.client.get('/api/jobs/search/?q=loads&zip_code=34266').json()
+        self.assertEqual([result['id'] for result in results], [self.near.pk])
+
+
+class CarrierLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.werner = Carrier.objects.create(name='Werner Enterprises')
+        cls.xpress = Carrier.objects.create(name='US Xpress')
+        cls.prime = Carrier.objects.create(name='Prime Inc')
+        cls.carrier_1 = Carrier.objects.create(name='Carrier 1')
+        Carrier.objects.create(name='Western Express', is_active=False)
+        CarrierAlias.objects.create(alias='Werner Trucking', carrier=cls.werner)
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name('Werner Enterprises, Inc.'), 'werner enterprises')
+        self.assertEqual(normalize_name('C.R. England  LLC'), 'c r england')
+        self.assertEqual(normalize_name(None), '')
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'PostgreSQL uses trigram matching')
+    def test_suggest_falls_back_to_prefix_matching(self):
+        matches = suggest_carriers('we')
+        # One entry per carrier (its name and alias both match); inactive carriers are left out
+        self.assertEqual(matches, [(self.werner, 'Werner Enterprises', 1.0)])
+        self.assertEqual([carrier for carrier, _, _ in suggest_carriers('xpress')], [self.xpress])
+        self.assertEqual(suggest_carriers('xpress')[0][2], 0.5)
+        self.assertEqual(suggest_carriers('  '), [])
+
+    def test_suggest_endpoint(self):
+        response = self.client.get('/api/carriers/suggest/?q=pri')
+        self.assertEqual(
+            response.json(), [{'id': self.prime.pk, 'name': 'Prime Inc', 'matched': 'Prime Inc', 'score': 1.0}]
+        )
+        self.assertEqual(self.client.get('/api/carriers/suggest/?q=pri&limit=x').status_code, 400)
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'PostgreSQL uses trigram matching')
+    def test_match_carriers_learns_aliases(self):
+        names = ['Werner Trucking', 'US Express', 'Prime, Inc.', 'Carrier 10', 'Unknown Lines']
+        found = match_carriers(names)
+        self.assertEqual(found, {'Werner Trucking': self.werner, 'US Express': self.xpress, 'Prime, Inc.': self.prime})
+        self.assertEqual(
+            set(CarrierAlias.objects.values_list('key', 'carrier')),
+            {('werner trucking', self.werner.pk), ('us express', self.xpress.pk), ('prime', self.prime.pk)},
+        )
+        # Learned names now resolve from the alias table alone
+        with self.assertNumQueries(1):
+            found = match_carriers(['US Express', 'Prime, Inc.'])
+        self.assertEqual(found, {'US Express': self.xpress, 'Prime, Inc.': self.prime})
+
+
+class TableParsingTests(TestCase):
+    def test_split_cells_honours_quotes(self):
+        self.assertEqual(
+            split_cells('"Smith, J",Driver,"5 ""years"" OTR"', ','), ['Smith, J', 'Driver', '5 "years" OTR']
+        )
+        self.assertEqual(split_cells('a |  b|', '|'), ['a', 'b', ''])
+
+    def test_parse_table_continues_cells(self):
+        table = parse_table('Topic | Description\nOrientation | 3 days\nin Dallas\nPay | 60 cpm\n | paid weekly')
+        self.assertEqual(table, {
+            'delimiter': '|',
+            'columns': ['Topic', 'Description'],
+            'rows': [['Orientation', '3 days\nin Dallas'], ['Pay', '60 cpm\npaid weekly']],
+        })
+        self.assertEqual(parse_table('Topic\tNotes\\nSafety\tVideo')['rows'], [['Safety', 'Video']])
+
+    def test_parse_table_rejects_plain_text(self):
+        self.assertIsNone(parse_table(''))
+        self.assertIsNone(parse_table('Topic | Description'))
+        self.assertIsNone(parse_table('Home weekly\nNo touch freight'))
+
+    def test_parse_section_table_only_accepts_regular_tables(self):
+        self.assertEqual(parse_section_table('Item | Value\nPay | 60 cpm')['rows'], [['Pay', '60 cpm']])
+        self.assertIsNone(parse_section_table('Pay: 60 cpm\nHome | weekly'))
+        self.assertIsNone(parse_section_table('Item | Value\nPay | 60 cpm | weekly'))
+        self.assertIsNone(parse_section_table('Home weekly, no touch\nGreat benefits'))
+
+    def test_tables_are_parsed_on_save_and_filtered(self):
+        carrier = Carrier.objects.create(
+            name='Table Freight', presentation='Topic | Notes\nOrientation | Dallas\nPay | Weekly'
+        )
+        self.assertEqual(carrier.parsed_tables['presentation']['columns'], ['Topic', 'Notes'])
+        response = self.client.get(f'/api/carriers/{carrier.pk}/tables/presentation/?q=dallas').json()
+        self.assertEqual((response['rows'], response['count'], response['total']), ([['Orientation', 'Dallas']], 1, 2))
+        self.assertEqual(self.client.get(f'/api/carriers/{carrier.pk}/tables/notes/').status_code, 400)
+
+        job = Job.objects.create(carrier=carrier, title='Team', pay_details='Type | Rate\nSolo | 60 cpm\nTeam | 70 cpm')
+        response = self.client.get(f'/api/jobs/{job.pk}/tables/pay_details/?q=team').json()
+        self.assertEqual(response['rows'], [['Team', '70 cpm']])
+        self.assertEqual(filter_rows(job.parsed_tables['pay_details'], ' '), [['Solo', '60 cpm'], ['Team', '70 cpm']])
+
+
+class RenderingTests(TestCase):
+    def setUp(self):
+        rendering.get_cache().clear()
+
+    def test_render_lines(self):
+        text = '**BENEFITS**\n• Home weekly\\nPay: **60 cpm**\n- Health insurance.\nNo touch freight, drop and hook.'
+        self.assertEqual(rendering.render_lines(text), [
+            {'type': 'heading', 'cells': ['BENEFITS']},
+            {'type': 'text', 'text': 'Home weekly', 'bullet': True},
+            {'type': 'pair', 'label': 'Pay', 'value': '60 cpm'},
+            {'type': 'text', 'text': 'Health insurance.', 'bullet': True},
+            {'type': 'text', 'text': 'No touch freight, drop and hook.', 'bullet': False},
+        ])
+
+    def test_render_lines_with_a_delimited_header(self):
+        self.assertEqual(rendering.render_lines('Item | Value\nPay | **60 cpm**'), [
+            {'type': 'heading', 'cells': ['Item', 'Value']},
+            {'type': 'pair', 'label': 'Pay', 'value': '60 cpm'},
+        ])
+
+    def test_sections_are_cached_per_version(self):
+        carrier = Carrier.objects.create(name='Render Freight')
+        job = Job.objects.create(
+            carrier=carrier, title='OTR', pay_details='Type | Rate\nSolo | 60 cpm', job_details='Pay: 60 cpm',
+        )
+        sections = rendering.rendered_sections(job)
+        self.assertEqual(
+            sections['pay_details'], {'type': 'table', 'columns': ['Type', 'Rate'], 'rows': [['Solo', '60 cpm']]}
+        )
+        self.assertEqual(sections['job_details']['lines'], [{'type': 'pair', 'label': 'Pay', 'value': '60 cpm'}])
+        self.assertIsNone(sections['key_disqualifiers'])
+
+        # A warm entry is served after reading only updated_at
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/jobs/{job.pk}/sections/job_details/')
+        self.assertEqual(response.json()['rendered'], sections['job_details'])
+
+        job.job_details = 'Home: weekly'
+        job.save()
+        rendered = self.client.get(f'/api/jobs/{job.pk}/sections/job_details/').json()['rendered']
+        self.assertEqual(rendered['lines'], [{'type': 'pair', 'label': 'Home', 'value': 'weekly'}])
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/sections/notes/').status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/999999/sections/job_details/').status_code, 404)
+
+
+class CarrierCounterTests(TestCase):
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Counted Freight')
+        self.other = Carrier.objects.create(name='Other Freight')
+
+    def assertCounts(self, carrier, active, open_):
+        carrier.refresh_from_db()
+        self.assertEqual((carrier.active_jobs_count, carrier.open_jobs_count), (active, open_))
+
+    def test_saves_and_deletes_move_the_counters(self):
+        job = Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        self.assertCounts(self.carrier, 1, 1)
+
+        job.hiring_status = 'full'
+        job.save()
+        self.assertCounts(self.carrier, 1, 0)
+
+        job.carrier = self.other
+        job.save()
+        self.assertCounts(self.carrier, 0, 0)
+        self.assertCounts(self.other, 1, 0)
+
+        job.is_active = False
+        job.save(update_fields=['is_active'])
+        self.assertCounts(self.other, 0, 0)
+
+        Job.objects.create(carrier=self.other, title='Driver', state='FL')
+        job.delete()
+        self.assertCounts(self.other, 1, 1)
+
+    def test_carrier_list_reads_the_counters(self):
+        Job.objects.create(carrier=self.carrier, title='Driver', state='FL', hiring_status='full')
+        with self.assertNumQueries(1):
+            carriers = {carrier['name']: carrier for carrier in self.client.get('/api/carriers/').json()}
+        self.assertEqual(
+            (carriers['Counted Freight']['active_jobs_count'], carriers['Counted Freight']['open_jobs_count']), (1, 0)
+        )
+
+    def test_recount_repairs_drift(self):
+        Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        Carrier.objects.update(active_jobs_count=7, open_jobs_count=7)
+        call_command('recount_carrier_jobs', stdout=io.StringIO())
+        self.assertCounts(self.carrier, 1, 1)
+        self.assertCounts(self.other, 0, 0)
+
+
+class HiringStatusTests(TestCase):
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Hiring Freight')
+        self.jobs = [
+            Job.objects.create(carrier=self.carrier, title='Driver', state='FL', latitude=27.2, longitude=-81.86)
+            for _ in range(3)
+        ]
+
+    def test_set_hiring_status_updates_counters_and_log(self):
+        start = catalog.current_version()
+        first_two = Job.objects.filter(carrier=self.carrier).order_by('id').values('id')[:2]
+        changed, version = set_hiring_status(Job.objects.filter(pk__in=first_two), 'full')
+        self.assertEqual((changed, version), (2, catalog.current_version()))
+        self.assertGreater(version, start)
+        self.carrier.refresh_from_db()
+        self.assertEqual((self.carrier.active_jobs_count, self.carrier.open_jobs_count), (3, 1))
+        self.assertEqual(catalog.changes_since(start)[1]['job']['upserted'], {self.jobs[0].pk, self.jobs[1].pk})
+        # Unchanged jobs are left alone
+        self.assertEqual(set_hiring_status(Job.objects.all(), 'full')[0], 1)
+        self.assertEqual(set_hiring_status(Job.objects.all(), 'full'), (0, catalog.current_version()))
+
+    def test_status_endpoint(self):
+        job = self.jobs[0]
+        def patch(pk, hiring_status):
+            return self.client.patch(
+                f'/api/jobs/{pk}/status/', {'hiring_status': hiring_status}, content_type='application/json'
+            )
+
+        response = patch(job.pk, 'full')
+        self.assertEqual(response.json(), {'id': job.pk, 'hiring_status': 'full', 'version': catalog.current_version()})
+        job.refresh_from_db()
+        # The save hooks don't run, so the resolved location is kept
+        self.assertEqual((job.hiring_status, job.latitude), ('full', Decimal('27.2')))
+        self.assertEqual(patch(999999, 'full').status_code, 404)
+        self.assertEqual(patch(job.pk, 'x').status_code, 400)
+
+    def test_bulk_status_endpoint(self):
+        def post(**data):
+            return self.client.post('/api/jobs/status/', data, content_type='application/json')
+
+        self.assertEqual(post(hiring_status='full', ids=[self.jobs[0].pk]).json()['updated'], 1)
+        self.assertEqual(post(hiring_status='full', carrier=self.carrier.pk).json()['updated'], 2)
+        self.assertEqual(Job.objects.filter(hiring_status='full').count(), 3)
+        self.assertEqual(post(hiring_status='full').status_code, 400)
+        self.assertEqual(post(hiring_status='full', ids=[1], carrier=self.carrier.pk).status_code, 400)
+        self.assertEqual(post(hiring_status='full', ids='1,2').status_code, 400)
+
+
+class ChangesSinceTests(TestCase):
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Synced Freight')
+
+    def test_last_change_per_object_wins(self):
+        start = catalog.current_version()
+        job = Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        kept = Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        job_id = job.pk
+        job.delete()
+
+        version, changes = catalog.changes_since(start)
+        self.assertEqual(version, catalog.current_version())
+        self.assertEqual(changes['job'], {'upserted': {kept.pk}, 'deleted': {job_id}})
+        self.assertEqual(catalog.changes_since(version)[1]['job'], {'upserted': set(), 'deleted': set()})
+
+    def test_first_write_creates_the_version(self):
+        CatalogVersion.objects.all().delete()
+        self.assertEqual(catalog.current_version(), 0)
+        self.assertEqual(catalog.bump_version(), 1)
+        self.assertEqual(catalog.bump_version(), 2)
+
+    def test_losing_the_race_to_create_the_version_still_bumps(self):
+        CatalogVersion.objects.all().delete()
+        # Another writer creates the row between our UPDATE and get_or_create
+        create = CatalogVersion.objects.get_or_create
+
+        def racing_get_or_create(**kwargs):
+            CatalogVersion.objects.create(pk=catalog.VERSION_PK, version=1)
+            return create(**kwargs)
+
+        with mock.patch.object(CatalogVersion.objects, 'get_or_create', racing_get_or_create):
+            self.assertEqual(catalog.bump_version(), 2)
+
+    def test_versions_ahead_of_the_catalog_reset(self):
+        self.assertEqual(catalog.changes_since(catalog.current_version() + 1)[1], None)
+
+    def test_versions_older_than_the_log_reset(self):
+        Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        start = catalog.current_version()
+        Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        # Pruned log: only entries after start remain
+        CatalogChange.objects.filter(version__lte=start).delete()
+
+        self.assertIsNotNone(catalog.changes_since(start)[1])
+        self.assertIsNone(catalog.changes_since(start - 1)[1])
+
+    def test_too_many_changes_reset(self):
+        start = catalog.current_version()
+        for _ in range(3):
+            Job.objects.create(carrier=self.carrier, title='Driver', state='FL')
+        self.assertFalse(self.client.get(f'/api/changes/?since={start}').json()['reset'])
+        with mock.patch.object(ChangesView, 'MAX_CHANGES', 2):
+            self.assertTrue(self.client.get(f'/api/changes/?since={start}').json()['reset'])
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.carrier = Carrier.objects.create(name='Streamed Freight')
+
+    def create_job(self, **fields):
+        return Job.objects.create(carrier=self.carrier, title='Driver', state='FL', **fields)
+
+    def test_build_event(self):
+        job = self.create_job(hiring_status='full')
+        self.assertEqual(events.build_event(5, [job.pk, 999999], [7]), {
+            'version': 5,
+            'jobs': [{'id': job.pk, 'carrier_id': self.carrier.pk, 'hiring_status': 'full', 'is_active': True}],
+            'deleted': [7, 999999],
+        })
+        self.assertIsNone(events.build_event(5, [], []))
+        with mock.patch.object(events, 'MAX_EVENT_JOBS', 1):
+            self.assertEqual(events.build_event(5, [1, 2], []), {'version': 5, 'reload': True})
+
+    def test_catch_up(self):
+        start = catalog.current_version()
+        kept, deleted = self.create_job(), self.create_job()
+        deleted_id = deleted.pk
+        deleted.delete()
+        current, event = events.catch_up(start)
+        self.assertEqual(current, catalog.current_version())
+        self.assertEqual(([job['id'] for job in event['jobs']], event['deleted']), ([kept.pk], [deleted_id]))
+        # A version the change log can't account for
+        self.assertEqual(events.catch_up(current + 1), (current, {'version': current, 'reload': True}))
+
+    @mock.patch.object(events, 'HEARTBEAT_SECONDS', 0.01)
+    def test_stream_catches_up_and_fills_gaps(self):
+        start = catalog.current_version()
+        self.create_job()
+
+        async def read():
+            stream = events.event_stream(start)
+            chunks = [await anext(stream), await anext(stream)]
+            # Two writes; only the second is published in this process
+            await sync_to_async(self.create_job)()
+            job = await sync_to_async(self.create_job)()
+            version = await catalog.acurrent_version()
+            published = await sync_to_async(events.build_event)(version, [job.pk], [])
+            events.broadcaster.publish(published)
+            chunks.append(await anext(stream))
+            # Events that follow on are passed through as they are
+            events.broadcaster.publish({'version': version + 1, 'jobs': [], 'deleted': [5]})
+            chunks += [await anext(stream), await anext(stream)]
+            await stream.aclose()
+            return version, chunks
+
+        version, chunks = async_to_sync(read)()
+        self.assertEqual(chunks[0], f'retry: {events.RETRY_MILLISECONDS}\n\n')
+        self.assertTrue(chunks[1].startswith(f'id: {start + 1}\nevent: jobs\n'))
+        # The gap is filled from the change log with both writes
+        self.assertTrue(chunks[2].startswith(f'id: {version}\nevent: jobs\n'))
+        self.assertEqual(len(json.loads(chunks[2].split('data: ')[1])['jobs']), 2)
+        self.assertEqual(
+            chunks[3], f'id: {version + 1}\nevent: jobs\ndata: {{"version":{version + 1},"jobs":[],"deleted":[5]}}\n\n'
+        )
+        self.assertEqual(chunks[4], ': heartbeat\n\n')
+        self.assertFalse(events.broadcaster.has_subscribers())
+
+    def test_new_clients_get_the_current_version(self):
+        async def read():
+            stream = events.event_stream()
+            chunks = [await anext(stream), await anext(stream)]
+            await stream.aclose()
+            return chunks
+
+        version = catalog.current_version()
+        self.assertEqual(async_to_sync(read)()[1], f'id: {version}\nevent: ready\ndata: {{"version": {version}}}\n\n')
+
+    def test_stream_requires_asgi(self):
+        self.assertEqual(self.client.get('/api/jobs/events/').status_code, 501)
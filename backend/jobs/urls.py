@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CarrierViewSet, JobList, JobDetail, ParseAndCreateJobView
+from .views import CarrierViewSet, ChangesView, JobList, JobDetail, JobSearchView, JobSectionView, JobStatusView, JobBulkStatusView, JobTableView, ParseAndCreateJobView, BatchParseJobsView, job_events
 
 # Router for viewsets
 router = DefaultRouter()
@@ -8,8 +9,27 @@ router.register(r'carriers', CarrierViewSet, basename='carrier')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('changes/', ChangesView.as_view(), name='changes'),
     path('jobs/', JobList.as_view(), name='job-list'),
     path('jobs/<int:pk>/', JobDetail.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/status/', JobStatusView.as_view(), name='job-status'),
+    path('jobs/status/', JobBulkStatusView.as_view(), name='job-status-bulk'),
+    path('jobs/<int:pk>/sections/<str:section>/', JobSectionView.as_view(), name='job-section'),
+    path('jobs/<int:pk>/tables/<str:section>/', JobTableView.as_view(), name='job-table'),
+    path('jobs/events/', job_events, name='job-events'),
+    path('jobs/search/', JobSearchView.as_view(), name='job-search'),
     path('jobs/parse/', ParseAndCreateJobView.as_view(), name='job-parse-create'),
+    path('jobs/parse/batch/', BatchParseJobsView.as_view(), name='job-parse-batch'),
 ]
 
+
+if settings.ASYNC_API_VIEWS:
+    from . import async_views
+
+    # Ahead of the router and the sync views; other methods fall through to those views
+    urlpatterns = [
+        path('carriers/', async_views.carrier_list, name='carrier-list'),
+        path('jobs/', async_views.job_list, name='job-list'),
+        path('jobs/<int:pk>/', async_views.job_detail, name='job-detail'),
+        path('jobs/search/', async_views.job_search, name='job-search'),
+    ] + urlpatterns
@@ -1,6 +1,7 @@
 """
 Geocoding and distance calculation utilities for job location filtering.
 """
+from functools import lru_cache
 from math import radians, cos, sin, asin, sqrt
 import pgeocode
 
@@ -29,16 +30,64 @@ def get_coordinates_from_zip(zip_code):
     if not zip_code:
         return None, None
     
-    nomi = get_geocoder()
-    location = nomi.query_postal_code(str(zip_code).strip())
+    from . import geocode_cache
+    clean_zip = str(zip_code).strip()
+    cached = geocode_cache.get('zip', clean_zip)
+    if cached and cached.found:
+        return cached.latitude, cached.longitude
     
+    local = _query_local_zip(clean_zip)
+    if local:
+        lat, lon, state = local
+        geocode_cache.put('zip', clean_zip, lat, lon, state=state, source='pgeocode')
+        return lat, lon
+    
+    # Not cached as a miss here: geocode_zip may still resolve it remotely
+    return None, None
+
+
+@lru_cache(maxsize=20000)
+def _query_local_zip(zip_code):
+    """
+    One pgeocode lookup. The dataset doesn't change while the process runs,
+    so misses are memoized too.
+
+    Returns:
+        tuple: (latitude, longitude, state_code) or None
+    """
+    location = get_geocoder().query_postal_code(zip_code)
     if location is not None and not location.empty:
         lat = location.get('latitude')
         lon = location.get('longitude')
         if lat and lon and not (str(lat) == 'nan' or str(lon) == 'nan'):
-            return float(lat), float(lon)
+            state = location.get('state_code')
+            return float(lat), float(lon), state if isinstance(state, str) else None
+    return None
+
+
+def get_coordinates_for_zips(zip_codes):
+    """
+    Look up many US zip codes in one vectorized query against the local
+    pgeocode table.
     
-    return None, None
+    Args:
+        zip_codes (iterable): 5-digit US zip codes
+        
+    Returns:
+        dict: zip_code -> (latitude, longitude, state_code) for every zip found
+    """
+    zip_codes = sorted({str(z).strip()[:5] for z in zip_codes if z})
+    if not zip_codes:
+        return {}
+    
+    locations = get_geocoder().query_postal_code(zip_codes)
+    found = locations.dropna(subset=['latitude', 'longitude'])
+    return {
+        zip_code: (float(lat), float(lon), state if isinstance(state, str) else None)
+        for zip_code, lat, lon, state in zip(
+            found['postal_code'], found['latitude'], found['longitude'], found['state_code']
+        )
+    }
 
 
 def calculate_distance(lat1, lon1, lat2, lon2):
@@ -70,7 +119,11 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     return round(miles, 1)
 
 
-def filter_jobs_by_radius(driver_zip, jobs_queryset, max_radius=250):
+# Matches returned by a radius search
+RADIUS_RESULTS_LIMIT = 50
+
+
+def filter_jobs_by_radius(driver_zip, jobs_queryset, max_radius=250, keep_order=False, limit=RADIUS_RESULTS_LIMIT):
     """
     Filter and sort jobs using a flexible multi-tier strategy:
     1. Distance Match (In Radius): Jobs within their specific hiring radius or 250 miles.
@@ -81,6 +134,10 @@ def filter_jobs_by_radius(driver_zip, jobs_queryset, max_radius=250):
         driver_zip (str): Driver's zip code
         jobs_queryset: Django QuerySet of Job objects
         max_radius (int): Maximum default search radius in miles (default: 250)
+        keep_order (bool): Within a match tier keep the queryset's order
+                           (e.g. a pay sort done in SQL) instead of sorting by distance
+        limit (int): Number of best matches to return (None returns every match,
+                     e.g. to count facets over all of them)
         
     Returns:
         list: List of dicts with job data, distance, and location_source information
@@ -96,30 +153,29 @@ def filter_jobs_by_radius(driver_zip, jobs_queryset, max_radius=250):
         if not driver_state:
             return []
     else:
-        # Get driver's state for state-level matching
-        nomi = get_geocoder()
-        driver_location = nomi.query_postal_code(str(driver_zip).strip())
-        driver_state = driver_location.get('state_code') if driver_location is not None else None
+        # Get driver's state for state-level matching (cached alongside the coordinates)
+        from . import geocode_cache
+        cached = geocode_cache.get('zip', str(driver_zip).strip())
+        driver_state = cached.state if cached else None
+        if not driver_state:
+            nomi = get_geocoder()
+            driver_location = nomi.query_postal_code(str(driver_zip).strip())
+            driver_state = driver_location.get('state_code') if driver_location is not None else None
     
     all_scored_jobs = []
     
     for job in jobs_queryset:
-        # Use pre-populated geocoding fields if available
+        # Use pre-populated geocoding fields; jobs that haven't been
+        # enriched yet use their carrier's HQ or only take part in
+        # state-level matching
         job_lat = job.latitude
         job_lon = job.longitude
         location_source = job.location_source
-        
-        # If job doesn't have geocoded coordinates, try to populate them
-        if (job_lat is None or job_lon is None) and location_source != 'state_only':
-            from .geocoding import get_job_location
-            job_lat, job_lon, location_source = get_job_location(job)
-            
-            # Update the job model with coordinates for future use
-            if job_lat and job_lon:
-                job.latitude = job_lat
-                job.longitude = job_lon
-                job.location_source = location_source
-                job.save(update_fields=['latitude', 'longitude', 'location_source'])
+        if job_lat is None and job.carrier.headquarters_latitude is not None:
+            # Not enriched yet: fall back to the carrier's stored HQ location
+            job_lat = job.carrier.headquarters_latitude
+            job_lon = job.carrier.headquarters_longitude
+            location_source = 'carrier_hq'
 
         distance = None
         if driver_lat is not None and job_lat is not None:
@@ -176,7 +232,11 @@ def filter_jobs_by_radius(driver_zip, jobs_queryset, max_radius=250):
     # Sorting: 
     # 1. Priority (Distance < Proximity-In-State < Proximity-Out-State < State Match)
     # 2. Distance (closest first)
-    all_scored_jobs.sort(key=lambda x: (x['priority'], x['distance_miles'] if x['distance_miles'] is not None else 9999))
+    if keep_order:
+        # Stable sort: the queryset order is kept within each tier
+        all_scored_jobs.sort(key=lambda x: x['priority'])
+    else:
+        all_scored_jobs.sort(key=lambda x: (x['priority'], x['distance_miles'] if x['distance_miles'] is not None else 9999))
     
     # Return top results (e.g., top 50 to keep it relevant)
-    return all_scored_jobs[:50]
+    return all_scored_jobs[:limit]
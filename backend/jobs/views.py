@@ -1,10 +1,54 @@
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework import generics, viewsets, status
 from rest_framework.response import Response
+from decimal import Decimal
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.db.models import F, Q
+from . import catalog, counters, rendering
 from .models import Carrier, Job
-from .serializers import CarrierSerializer, JobSerializer
+from .serializers import CarrierSerializer, JobSerializer, ParsedJobSerializer
 import re
-from .utils import filter_jobs_by_radius
+from .utils import RADIUS_RESULTS_LIMIT, filter_jobs_by_radius, get_coordinates_from_zip
+from .search import search_jobs
+from .carrier_lookup import suggest_carriers
+from .hiring import set_hiring_status
+from .events import event_stream
+from .facets import catalog_counts, count_jobs, count_queryset, facet_filters
+from .tables import filter_rows
+from .posting_parser import parse_posting, parse_postings, split_postings
+
+
+def table_rows_response(parsed_tables, field, fields, query):
+    """
+    Filtered rows of one parsed table field (see jobs.tables).
+
+    Args:
+        parsed_tables (dict): The object's parsed_tables
+        field (str): Requested field
+        fields: Fields that can hold tables
+        query (str): Case-insensitive text a cell of each row must contain
+
+    Returns:
+        Response: {'field', 'columns', 'rows', 'count', 'total'}; rows is empty
+                  when the field is not a table
+    """
+    if field not in fields:
+        return Response(
+            {"error": f"field must be one of: {', '.join(fields)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    table = parsed_tables.get(field) or {'columns': [], 'rows': []}
+    rows = filter_rows(table, query)
+    return Response({
+        'field': field,
+        'columns': table['columns'],
+        'rows': rows,
+        'count': len(rows),
+        'total': len(table['rows']),
+    })
 
 
 class CarrierViewSet(viewsets.ModelViewSet):
@@ -15,52 +59,400 @@ class CarrierViewSet(viewsets.ModelViewSet):
     queryset = Carrier.objects.filter(is_active=True)
     serializer_class = CarrierSerializer
 
+    SUGGEST_LIMIT = 10
+
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Carrier name typeahead: /api/carriers/suggest/?q=wer
+        Matches carrier names and known aliases, best first.
+        """
+        try:
+            limit = min(int(request.query_params.get('limit') or self.SUGGEST_LIMIT), 25)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+        matches = suggest_carriers(request.query_params.get('q', ''), limit)
+        return Response([
+            {'id': carrier.id, 'name': carrier.name, 'matched': matched, 'score': round(score, 3)}
+            for carrier, matched, score in matches
+        ])
+
+    @action(detail=True, methods=['get'], url_path=r'tables/(?P<field>[a-z_]+)')
+    def tables(self, request, pk=None, field=None):
+        """
+        Rows of a parsed presentation / pre-qualification table:
+        /api/carriers/<id>/tables/presentation/?q=orientation
+        """
+        parsed_tables = self.get_queryset().filter(pk=pk).values_list('parsed_tables', flat=True).first()
+        if parsed_tables is None:
+            return Response({"error": "Carrier not found."}, status=status.HTTP_404_NOT_FOUND)
+        return table_rows_response(parsed_tables, field, Carrier.TABLE_FIELDS, request.query_params.get('q'))
+
 
 class JobList(generics.ListCreateAPIView):
     serializer_class = JobSerializer
 
+    # ordering param -> indexed pay column (jobs without the figure sort last)
+    PAY_ORDERING = {
+        'cpm': F('cpm_max').asc(nulls_last=True),
+        '-cpm': F('cpm_max').desc(nulls_last=True),
+        'weekly_pay': F('weekly_pay_estimate').asc(nulls_last=True),
+        '-weekly_pay': F('weekly_pay_estimate').desc(nulls_last=True),
+    }
+
+    @classmethod
+    def pay_filters(cls, params):
+        """
+        Translate the pay query params into queryset filters.
+        A CPM range matches jobs whose advertised range overlaps it.
+
+        Raises:
+            ValueError: On a non-numeric amount or unknown pay type/ordering
+        """
+        def number(name, convert):
+            try:
+                return convert(params[name])
+            except (ValueError, ArithmeticError):
+                raise ValueError(f'{name} must be a number')
+
+        filters = Q()
+        if params.get('min_cpm'):
+            filters &= Q(cpm_max__gte=number('min_cpm', Decimal))
+        if params.get('max_cpm'):
+            filters &= Q(cpm_min__lte=number('max_cpm', Decimal))
+        if params.get('min_weekly_pay'):
+            filters &= Q(weekly_pay_estimate__gte=number('min_weekly_pay', int))
+        if params.get('max_weekly_pay'):
+            filters &= Q(weekly_pay_estimate__lte=number('max_weekly_pay', int))
+        if params.get('pay_type'):
+            pay_types = params['pay_type'].split(',')
+            valid = {choice for choice, _ in Job.PAY_TYPE_CHOICES}
+            if not valid.issuperset(pay_types):
+                raise ValueError(f"pay_type must be one of: {', '.join(sorted(valid))}")
+            filters &= Q(pay_type__in=pay_types)
+        ordering = params.get('ordering')
+        if ordering and ordering not in cls.PAY_ORDERING:
+            raise ValueError(f"ordering must be one of: {', '.join(cls.PAY_ORDERING)}")
+        return filters, ordering
+
+    @classmethod
+    def filtered_queryset(cls, params):
+        """
+        The active jobs matching the pay and facet query params, in pay
+        order if one was requested.
+
+        Returns:
+            tuple: (queryset, whether any filter applies, ordering param)
+
+        Raises:
+            ValueError: On an invalid query param
+        """
+        filters, ordering = cls.pay_filters(params)
+        filters &= facet_filters(params)
+        # Every serialized job nests its carrier
+        queryset = Job.objects.filter(filters, is_active=True).select_related('carrier')
+        if ordering:
+            queryset = queryset.order_by(cls.PAY_ORDERING[ordering], '-created_at')
+        return queryset, bool(filters), ordering
+
+    @staticmethod
+    def facets_requested(params):
+        return params.get('facets', '').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def radius_matches(driver_zip, queryset, ordering, with_facets):
+        """Match jobs to a driver's zip code (see filter_jobs_by_radius)."""
+        return filter_jobs_by_radius(
+            driver_zip, queryset, keep_order=bool(ordering),
+            # Facets count every match, not just the page returned
+            limit=None if with_facets else RADIUS_RESULTS_LIMIT
+        )
+
+    @staticmethod
+    def radius_data(matches, request, with_facets):
+        """
+        Response data for radius matches: the best matches serialized with
+        their distance and location information, and facet counts over all
+        of them if requested.
+        """
+        results = []
+        for job_data in matches[:RADIUS_RESULTS_LIMIT]:
+            job_dict = JobSerializer(job_data['job'], context={'request': request}).data
+            job_dict['distance_miles'] = job_data['distance_miles']
+            job_dict['location_source'] = job_data['location_source']
+            job_dict['match_type'] = job_data['match_type']
+            results.append(job_dict)
+        if with_facets:
+            return {'results': results, 'facets': count_jobs(job_data['job'] for job_data in matches)}
+        return results
+
     def list(self, request, *args, **kwargs):
         """
         List jobs, optionally filtered by driver's zip code and hiring radius.
         Query params:
             - zip_code: Driver's zip code for location-based filtering
+            - min_cpm / max_cpm: CPM range, e.g. 0.55
+            - min_weekly_pay / max_weekly_pay: Estimated weekly pay in dollars
+            - pay_type: cpm, weekly, salary, hourly or percentage (comma-separated)
+            - ordering: cpm, -cpm, weekly_pay or -weekly_pay
+            - freight_type, driver_type, home_time, hiring_status, carrier:
+              Facet values (comma-separated, any of them matches)
+            - max_experience_months: Driver's experience; hides jobs requiring more
+            - facets: If set, respond with {"results", "facets"} (counts per facet value)
+        Pay filters and sorting run in the database; with a zip code the
+        pay order applies within each match tier.
         """
+        params = request.query_params
         try:
-            driver_zip = request.query_params.get('zip_code')
-            
-            if driver_zip:
-                # Filter jobs by hiring radius with multi-tier location strategy
-                queryset = Job.objects.filter(is_active=True)
-                filtered_jobs = filter_jobs_by_radius(driver_zip, queryset)
-                
-                # Serialize with distance and location information
-                results = []
-                for job_data in filtered_jobs:
-                    job_dict = JobSerializer(job_data['job'], context={'request': request}).data
-                    job_dict['distance_miles'] = job_data['distance_miles']
-                    job_dict['location_source'] = job_data['location_source']
-                    job_dict['match_type'] = job_data['match_type']
-                    results.append(job_dict)
-                
-                return Response(results)
-            else:
-                # Return all active jobs without distance filtering
-                queryset = Job.objects.filter(is_active=True)
-                serializer = self.get_serializer(queryset, many=True)
-                return Response(serializer.data)
-        except Exception as e:
-            # Log the error and return empty list
-            print(f"Error in JobList.list: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return Response([])
+            queryset, filtered, ordering = self.filtered_queryset(params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        with_facets = self.facets_requested(params)
+        driver_zip = params.get('zip_code')
+        if driver_zip:
+            # Filter jobs by hiring radius with multi-tier location strategy
+            matches = self.radius_matches(driver_zip, queryset, ordering, with_facets)
+            return Response(self.radius_data(matches, request, with_facets))
+
+        # Return all active jobs without distance filtering
+        serializer = self.get_serializer(queryset, many=True)
+        if with_facets:
+            # Unfiltered counts come from the per-version cache
+            facets = count_queryset(queryset) if filtered else catalog_counts()
+            return Response({'results': serializer.data, 'facets': facets})
+        return Response(serializer.data)
+
+
+
+class JobSearchView(APIView):
+    """
+    Full-text search over job titles, carrier names and job text.
+    Query params:
+        - q: Search terms ("quoted phrases", or, -exclude)
+        - zip_code: Driver's zip code; only jobs within reach are returned
+        - radius: Search radius in miles (default: each job's hiring radius)
+        - limit: Maximum number of results (default 50, at most 200)
+    Results are ranked by relevance and include a highlighted snippet.
+    """
+    MAX_LIMIT = 200
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if connection.vendor != 'postgresql':
+            return Response(
+                {"error": "Full-text search requires PostgreSQL."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        try:
+            radius = int(request.query_params['radius']) if request.query_params.get('radius') else None
+            limit = min(int(request.query_params.get('limit') or 50), self.MAX_LIMIT)
+        except ValueError:
+            return Response({"error": "radius and limit must be numbers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        latitude = longitude = None
+        driver_zip = request.query_params.get('zip_code')
+        if driver_zip:
+            latitude, longitude = get_coordinates_from_zip(driver_zip)
+            if latitude is None:
+                return Response({"error": "Unknown zip code."}, status=status.HTTP_400_BAD_REQUEST)
 
+        queryset = Job.objects.filter(is_active=True).select_related('carrier')
+        jobs = search_jobs(queryset, text, latitude, longitude, radius)[:limit]
+
+        results = []
+        for job in jobs:
+            job_dict = JobSerializer(job, context={'request': request}).data
+            job_dict['rank'] = job.rank
+            job_dict['snippet'] = job.snippet
+            job_dict['distance_miles'] = round(job.distance_miles, 1) if driver_zip else None
+            results.append(job_dict)
+        return Response(results)
 
 
 class JobDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.all()
+    """
+    Job detail. Responses include 'rendered': the text sections normalized
+    for display, served from the render cache (see jobs.rendering).
+    """
+    queryset = Job.objects.select_related('carrier')
     serializer_class = JobSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        data = self.get_serializer(job).data
+        data['rendered'] = rendering.rendered_sections(job)
+        return Response(data)
+
+
+def hiring_status_param(data):
+    """
+    The requested hiring status.
+
+    Raises:
+        ValueError: If it is missing or unknown
+    """
+    choices = dict(Job.HIRING_STATUS_CHOICES)
+    if data.get('hiring_status') not in choices:
+        raise ValueError(f"hiring_status must be one of: {', '.join(choices)}")
+    return data['hiring_status']
+
+
+class JobStatusView(APIView):
+    """
+    Set one job's hiring status: PATCH /api/jobs/<id>/status/ {"hiring_status": "full"}
+    A single UPDATE without the serializer or save hooks; returns only
+    id, hiring_status and the catalog version.
+    """
+    def patch(self, request, pk):
+        try:
+            hiring_status = hiring_status_param(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        jobs = Job.objects.filter(pk=pk)
+        updated, version = set_hiring_status(jobs, hiring_status)
+        if not updated and not jobs.exists():
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'id': pk, 'hiring_status': hiring_status, 'version': version})
+
+
+class JobBulkStatusView(APIView):
+    """
+    Set the hiring status of many jobs in one statement:
+    POST /api/jobs/status/
+        {"hiring_status": "full", "ids": [1, 2, 3]}   or
+        {"hiring_status": "full", "carrier": 7}       (all jobs of the carrier)
+    Returns the number of jobs changed and the catalog version.
+    """
+    def post(self, request):
+        try:
+            hiring_status = hiring_status_param(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        ids = request.data.get('ids')
+        carrier_id = request.data.get('carrier')
+        if (ids is None) == (carrier_id is None):
+            return Response({"error": "Provide either ids or carrier."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            if ids is not None:
+                if not isinstance(ids, list):
+                    raise ValueError
+                jobs = Job.objects.filter(pk__in=[int(pk) for pk in ids])
+            else:
+                jobs = Job.objects.filter(carrier_id=int(carrier_id))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "ids must be a list of job ids and carrier a carrier id."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        updated, version = set_hiring_status(jobs, hiring_status)
+        return Response({'hiring_status': hiring_status, 'updated': updated, 'version': version})
+
+
+class ChangesView(APIView):
+    """
+    Incremental sync: GET /api/changes/?since=<version>
+    Returns the jobs and carriers created, updated or deleted after the
+    given catalog version, with compact payloads for the upserted ones,
+    plus the version to pass as since next time. "reset": true means the
+    client is too far behind (or ahead) and must refetch the catalog.
+    """
+    MAX_CHANGES = 5000
+
+    PAYLOAD_FIELDS = {
+        'job': (
+            'id', 'carrier_id', 'title', 'state', 'zip_code', 'hiring_radius_miles',
+            'hiring_status', 'is_active', 'cpm_min', 'cpm_max', 'weekly_pay_estimate',
+            'pay_type', 'updated_at',
+        ),
+        'carrier': ('id', 'name', 'is_active', 'headquarters_zip', 'updated_at'),
+    }
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', ''))
+        except ValueError:
+            return Response({"error": "since must be a catalog version."}, status=status.HTTP_400_BAD_REQUEST)
+
+        version, changes = catalog.changes_since(since)
+        total = sum(len(ids) for kind in (changes or {}).values() for ids in kind.values())
+        if changes is None or total > self.MAX_CHANGES:
+            return Response({'version': version, 'reset': True})
+
+        models = {'job': Job, 'carrier': Carrier}
+        data = {'version': version, 'reset': False}
+        for kind, ids in changes.items():
+            upserted = list(
+                models[kind].objects.filter(pk__in=ids['upserted'])
+                .order_by('id').values(*self.PAYLOAD_FIELDS[kind])
+            )
+            # Upserted rows that are gone by now were deleted
+            found = {row['id'] for row in upserted}
+            data[f'{kind}s'] = {
+                'upserted': upserted,
+                'deleted': sorted(ids['deleted'] | (ids['upserted'] - found)),
+            }
+        return Response(data)
+
+
+async def job_events(request):
+    """
+    Server-sent events of job changes (hiring status, activation, new and
+    deleted jobs): GET /api/jobs/events/
+    Reconnecting clients send Last-Event-ID (EventSource does this itself)
+    and receive everything they missed. Served under ASGI only.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "The event stream requires the ASGI server (jobstream_backend.asgi)."},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_version = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse({"error": "Last-Event-ID must be a catalog version."}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(event_stream(last_version), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class JobSectionView(APIView):
+    """
+    One text section of a job, ready to display:
+    /api/jobs/<id>/sections/pay_details/
+    Served from the render cache without loading the job when it is warm.
+    """
+    def get(self, request, pk, section):
+        if section not in Job.TEXT_SECTIONS:
+            return Response(
+                {"error": f"section must be one of: {', '.join(Job.TEXT_SECTIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        updated_at, rendered = rendering.rendered_section(pk, section)
+        if updated_at is None:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'id': pk, 'section': section, 'updated_at': updated_at, 'rendered': rendered})
+
+
+class JobTableView(APIView):
+    """
+    Rows of a job section that is a pasted table:
+    /api/jobs/<id>/tables/pay_details/?q=team
+    Only the parsed table is loaded, not the raw section text.
+    """
+    def get(self, request, pk, section):
+        parsed_tables = Job.objects.filter(pk=pk).values_list('parsed_tables', flat=True).first()
+        if parsed_tables is None:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return table_rows_response(parsed_tables, section, Job.TEXT_SECTIONS, request.query_params.get('q'))
+
 
 class ParseAndCreateJobView(APIView):
     """
@@ -79,56 +471,10 @@ class ParseAndCreateJobView(APIView):
         try:
             carrier = Carrier.objects.get(id=carrier_id)
             
-            # Basic parsing logic
-            lines = raw_text.replace('\\n', '\n').split('\n')
-            data = {}
-            
-            # 1. Extract Title (usually the first non-empty line after "Lane Information" or at top)
-            title = "New Job"
-            for i, line in enumerate(lines):
-                if "Lane Information" in line and i + 1 < len(lines):
-                    next_line = lines[i+1].trim() if hasattr(lines[i+1], 'trim') else lines[i+1].strip()
-                    if next_line:
-                        title = next_line
-                        break
-            
-            # 2. Extract Fields using Key: Value pattern
-            field_map = {
-                r'Experience Required': 'experience_required',
-                r'Home Time': 'home_time',
-                r'Average Weekly Pay': 'average_weekly_pay',
-                r'Pay Range': 'pay_range',
-                r'Hub City': 'state',
-                r'Hiring Area Zip Code': 'zip_code',
-                r'Trainees Accepted': 'trainees_accepted',
-                r'Create Date': 'source_create_date',
-                r'Modified Date': 'source_modified_date',
-            }
-            
-            job_fields = {
-                'carrier': carrier,
-                'title': title,
-                'description': raw_text,
-                'is_active': True
-            }
-            
-            for line in lines:
-                for pattern, model_field in field_map.items():
-                    if pattern in line and ':' in line:
-                        value = line.split(':', 1)[1].strip()
-                        
-                        # Handle boolean fields
-                        if model_field in ['trainees_accepted', 'teams_accepted', 'owner_operators_accepted', 'leadership_approval_required']:
-                            job_fields[model_field] = value.upper() == 'YES'
-                        else:
-                            job_fields[model_field] = value
-            
-            # Ensure required fields that might be missing from simple parse
-            if not job_fields.get('state'): job_fields['state'] = "See Description"
-            if not job_fields.get('zip_code'): job_fields['zip_code'] = "00000"
+            job_fields = parse_posting(raw_text)
             
             # Create the job
-            job = Job.objects.create(**job_fields)
+            job = Job.objects.create(carrier=carrier, is_active=True, **job_fields)
             
             return Response(JobSerializer(job).data, status=status.HTTP_201_CREATED)
             
@@ -137,3 +483,106 @@ class ParseAndCreateJobView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class BatchParseJobsView(APIView):
+    """
+    API endpoint to parse many raw postings at once and create their jobs.
+
+    Accepts JSON or multipart data:
+        - postings: list of raw texts, or of {"raw_text", "carrier_id"} objects
+        - file: text file of postings separated by lines of dashes (---)
+        - carrier_id: default carrier for postings that don't name one
+        - dry_run: only parse and validate, don't create anything
+
+    Every posting gets a result entry (same order as submitted). Valid
+    postings are inserted together in one transaction.
+    """
+    MAX_POSTINGS = 500
+
+    def collect_postings(self, request):
+        default_carrier = request.data.get('carrier_id')
+        postings = []
+        items = request.data.get('postings') or []
+        if isinstance(items, str):
+            items = [items]
+        for item in items:
+            if isinstance(item, dict):
+                postings.append((item.get('raw_text') or '', item.get('carrier_id') or default_carrier))
+            else:
+                postings.append((str(item), default_carrier))
+
+        upload = request.FILES.get('file')
+        if upload:
+            text = upload.read().decode('utf-8-sig', errors='replace')
+            postings.extend((posting, default_carrier) for posting in split_postings(text))
+        return postings
+
+    def post(self, request, *args, **kwargs):
+        dry_run = str(request.data.get('dry_run', request.query_params.get('dry_run', ''))).lower() in ('1', 'true', 'yes')
+        postings = self.collect_postings(request)
+
+        if not postings:
+            return Response(
+                {"error": "Provide postings or a file of postings."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(postings) > self.MAX_POSTINGS:
+            return Response(
+                {"error": f"At most {self.MAX_POSTINGS} postings per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        carrier_ids = {carrier_id for _, carrier_id in postings if carrier_id}
+        carriers = Carrier.objects.in_bulk([cid for cid in carrier_ids if str(cid).isdigit()])
+        parsed = parse_postings([raw_text for raw_text, _ in postings])
+
+        results = []
+        to_create = []
+        for index, ((raw_text, carrier_id), fields) in enumerate(zip(postings, parsed)):
+            result = {'index': index}
+            results.append(result)
+            if not raw_text.strip():
+                result.update(status='invalid', errors={'raw_text': ['This field may not be blank.']})
+                continue
+            if isinstance(fields, Exception):
+                result.update(status='error', errors={'raw_text': [f'Could not parse: {fields}']})
+                continue
+            result['fields'] = fields
+
+            carrier = carriers.get(int(carrier_id)) if str(carrier_id or '').isdigit() else None
+            errors = {}
+            if carrier is None:
+                errors['carrier_id'] = ['Carrier not found.' if carrier_id else 'This field is required.']
+            serializer = ParsedJobSerializer(data=fields)
+            if not serializer.is_valid():
+                errors.update(serializer.errors)
+            if errors:
+                result.update(status='invalid', errors=errors)
+                continue
+
+            result['status'] = 'valid' if dry_run else 'created'
+            if not dry_run:
+                job = Job(carrier=carrier, is_active=True, **serializer.validated_data)
+                job.refresh_parsed_fields()
+                to_create.append((result, job))
+
+        if to_create:
+            try:
+                with transaction.atomic():
+                    # Location is filled in by the enrichment stage (needs_enrichment defaults to True)
+                    created = Job.objects.bulk_create([job for _, job in to_create])
+                    counters.refresh_carrier_counts({job.carrier_id for job in created})
+                    catalog.log_changes('job', upserted=[job.pk for job in created])
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            for (result, _), job in zip(to_create, created):
+                result['id'] = job.pk
+            rendering.cache_rendered(created)
+
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        return Response(
+            {'dry_run': dry_run, 'summary': summary, 'results': results},
+            status=status.HTTP_201_CREATED if to_create else status.HTTP_200_OK
+        )
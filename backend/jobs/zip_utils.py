@@ -2,7 +2,9 @@
 Zip code extraction and auto-population utilities for jobs.
 """
 import re
-import requests
+from .remote_geocoder import get_session
+from . import gazetteer, geocode_cache
+from .extraction import extract_facts, extract_job_facts
 
 
 # State capital zip codes as fallback
@@ -23,7 +25,8 @@ STATE_CAPITAL_ZIPS = {
 def extract_zip_from_description(description):
     """
     Extract zip code from job description text.
-    Prioritizes "Must Live Within X miles of ZIPCODE" pattern.
+    Prioritizes "Must Live Within X miles of ZIPCODE" pattern, then
+    "Hiring Area Zip Code(s)", then any 5-digit zip code in the text.
     
     Args:
         description (str): Job description text
@@ -34,33 +37,14 @@ def extract_zip_from_description(description):
     if not description:
         return None, None
     
-    # Pattern 1: "Must Live Within: 25 miles of 33982"
-    must_live_pattern = r'Must Live Within[:\s]+(\d+)\s*miles?\s*of\s*(\d{5})'
-    match = re.search(must_live_pattern, description, re.IGNORECASE)
-    if match:
-        radius = int(match.group(1))
-        zip_code = match.group(2)
-        return zip_code, radius
-    
-    # Pattern 2: "Hiring Area Zip Code(s): 34269"
-    hiring_area_pattern = r'Hiring Area Zip Code\(s\)[:\s]+(\d{5})'
-    match = re.search(hiring_area_pattern, description, re.IGNORECASE)
-    if match:
-        return match.group(1), None
-    
-    # Pattern 3: Any 5-digit zip code in the text
-    zip_pattern = r'\b(\d{5})\b'
-    match = re.search(zip_pattern, description)
-    if match:
-        return match.group(1), None
-    
-    return None, None
+    return extract_facts(description).zip_hint()
 
 
 def geocode_location_to_zip(location_string):
     """
     Convert location string (e.g., "Arcadia, FL") to zip code.
-    Uses US Census Geocoding API (free, no API key needed).
+    Uses the offline gazetteer first and only falls back to the
+    US Census Geocoding API (free, no API key needed) for unknown cities.
     
     Args:
         location_string (str): Location in format "City, ST"
@@ -78,6 +62,15 @@ def geocode_location_to_zip(location_string):
     
     city, state = match.groups()
     
+    local = gazetteer.lookup(city, state)
+    if local:
+        return local[0]
+    
+    key = gazetteer.make_key(city, state)
+    cached = geocode_cache.get('location', key)
+    if cached:
+        return cached.zip_code
+    
     url = "https://geocoding.geo.census.gov/geocoder/locations/address"
     params = {
         'city': city.strip(),
@@ -87,19 +80,22 @@ def geocode_location_to_zip(location_string):
     }
     
     try:
-        response = requests.get(url, params=params, timeout=5)
+        response = get_session().get(url, params=params, timeout=5)
         data = response.json()
         
         if data.get('result', {}).get('addressMatches'):
             address = data['result']['addressMatches'][0]
             zip_code = address['addressComponents'].get('zip')
+            geocode_cache.put('location', key, zip_code=zip_code, state=state, source='census')
             return zip_code
+        # No match: cache the miss so the Census API isn't asked again until it expires
+        geocode_cache.put('location', key, state=state, source='census')
     except Exception as e:
         print(f"Geocoding error for '{location_string}': {e}")
         return None
 
 
-def auto_populate_zip_code(job):
+def auto_populate_zip_code(job, location_to_zip=None):
     """
     Auto-populate zip code for a job using multiple strategies.
     
@@ -111,28 +107,22 @@ def auto_populate_zip_code(job):
     
     Args:
         job: Job model instance
+        location_to_zip: Optional replacement for geocode_location_to_zip
+                         (e.g. a memoized version used by batch enrichment)
         
     Returns:
         tuple: (zip_code, source, hiring_radius) or (None, None, None)
     """
     
     # Strategy 1: Extract from consolidated fields (highest priority)
-    all_text = " ".join(filter(None, [
-        job.job_details,
-        job.pay_details,
-        job.equipment_details,
-        job.key_disqualifiers,
-        job.requirements_details
-    ]))
-    
-    if all_text:
-        zip_code, radius = extract_zip_from_description(all_text)
-        if zip_code:
-            return zip_code, 'extracted', radius
+    facts = extract_job_facts(job)
+    zip_code, radius = facts.zip_hint()
+    if zip_code:
+        return zip_code, 'extracted', radius
     
     # Strategy 2: Geocode from state field
     if job.state:
-        zip_code = geocode_location_to_zip(job.state)
+        zip_code = (location_to_zip or geocode_location_to_zip)(job.state)
         if zip_code:
             return zip_code, 'geocoded', None
     
@@ -144,6 +134,8 @@ def auto_populate_zip_code(job):
     state_to_check = None
     if job.state and len(job.state.strip()) == 2:
         state_to_check = job.state.strip().upper()
+    elif facts.states:
+        state_to_check = facts.states[0]
     elif job.requirements_details:
         # Check requirements_details for a 2-letter state code at the start or in common patterns
         match = re.search(r'\b([A-Z]{2})\b', job.requirements_details)
@@ -3,6 +3,11 @@ ASGI config for jobstream_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server (e.g. ``uvicorn jobstream_backend.asgi:application``).
+That enables the async API views (see jobs.async_views) and the job change
+stream at /api/jobs/events/ (see jobs.events), which keeps connections open
+and is not available under WSGI.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -12,5 +17,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobstream_backend.settings')
+# Async views for the job list, search, detail and carrier list (see jobs.async_views)
+os.environ.setdefault('ASYNC_API_VIEWS', '1')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
@@ -99,6 +101,36 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Geocoding cache: how long "could not resolve" results are remembered (seconds)
+GEOCODE_NEGATIVE_CACHE_TTL = 60 * 60 * 24 * 7
+
+# Caches. 'render' holds the rendered job sections (jobs.rendering), one entry
+# per job. Set RENDER_CACHE_URL (redis://...) to share it between the web
+# workers and the import commands, which fill it as they write jobs (needs the
+# redis package). Without it each process keeps its own copy, filled on read.
+RENDER_CACHE_URL = os.environ.get('RENDER_CACHE_URL')
+RENDER_CACHE_MAX_ENTRIES = int(os.environ.get('RENDER_CACHE_MAX_ENTRIES', 50000))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'render': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': RENDER_CACHE_URL,
+        'KEY_PREFIX': 'jobstream',
+    } if RENDER_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'jobs-render',
+        # Sized to hold the whole catalog, so entries aren't culled
+        'OPTIONS': {'MAX_ENTRIES': RENDER_CACHE_MAX_ENTRIES},
+    },
+}
+
+# Serve the read-heavy API endpoints with async views (jobs.async_views).
+# Enabled by jobstream_backend/asgi.py; under WSGI they would run in a thread per request anyway.
+ASYNC_API_VIEWS = os.environ.get('ASYNC_API_VIEWS', '') == '1'
+
 # Add CORS permission
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_HEADERS = [
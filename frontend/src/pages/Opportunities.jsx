@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import searchIcon from '../images/search.svg';
 import jobDetailsIcon from '../images/jobdetails.svg';
@@ -20,13 +20,21 @@ const Opportunities = () => {
     const [openDropdownId, setOpenDropdownId] = useState(null);
     const [carrierSearchQuery, setCarrierSearchQuery] = useState('');
     const [carrierInfoPanel, setCarrierInfoPanel] = useState(null);
+    // Current values for the event stream handlers, which are set up once
+    const jobsRef = useRef(jobs);
+    const searchZipRef = useRef(searchZip);
+    useEffect(() => {
+        jobsRef.current = jobs;
+        searchZipRef.current = searchZip;
+    }, [jobs, searchZip]);
 
     const toggleExpand = (jobId) => {
         setExpandedJobId(expandedJobId === jobId ? null : jobId);
     };
 
-    const fetchJobs = async (driverZip = '') => {
-        setLoading(true);
+    const fetchJobs = async (driverZip = '', background = false) => {
+        // Background refreshes keep the current board on screen
+        if (!background) setLoading(true);
         setError(null);
         try {
             let url = API_URL;
@@ -42,7 +50,7 @@ const Opportunities = () => {
             console.error('Error fetching jobs:', err);
             setError('Technical issue connecting to the job board. Please try again later.');
         } finally {
-            setLoading(false);
+            if (!background) setLoading(false);
         }
     };
 
@@ -51,9 +59,16 @@ const Opportunities = () => {
         fetchJobs(zipCode.trim());
     };
 
-    const handleViewDetails = (job) => {
+    const handleViewDetails = async (job) => {
         setSelectedJob(job);
         setActiveTab('description');
+        // The detail endpoint adds the sections pre-rendered by the backend
+        try {
+            const response = await axios.get(`${API_URL}${job.id}/`);
+            setSelectedJob(prev => prev && prev.id === job.id ? { ...prev, rendered: response.data.rendered } : prev);
+        } catch (err) {
+            console.error('Error fetching job details:', err);
+        }
     };
 
     const handleClearSearch = () => {
@@ -66,7 +81,7 @@ const Opportunities = () => {
         e.stopPropagation(); // Prevent opening details modal if badge is clicked
         const newStatus = job.hiring_status === 'full' ? 'open' : 'full';
         try {
-            await axios.patch(`${API_URL}${job.id}/`, { hiring_status: newStatus });
+            await axios.patch(`${API_URL}${job.id}/status/`, { hiring_status: newStatus });
             setJobs(prevJobs => prevJobs.map(j =>
                 j.id === job.id ? { ...j, hiring_status: newStatus } : j
             ));
@@ -75,7 +90,43 @@ const Opportunities = () => {
         }
     };
 
-    const renderGenericTable = (text, filterQuery = '') => {
+    // Rows as parsed by the backend (carrier.parsed_tables) or by renderGenericTable;
+    // the first row is the header
+    const renderTableRows = (rows, filterQuery = '') => {
+        // FILTER ROWS based on query
+        const filteredRows = filterQuery
+            ? rows.filter(row => row.some(cell => cell.toLowerCase().includes(filterQuery.toLowerCase())))
+            : rows;
+
+        if (filteredRows.length === 0 && filterQuery) {
+            return (
+                <div className="no-search-results" style={{ padding: '2rem', textAlign: 'center', color: 'var(--text-light)', border: '1px dashed var(--border)', borderRadius: '8px' }}>
+                    No matches found for "{filterQuery}"
+                </div>
+            );
+        }
+
+        return (
+            <div className="premium-table-wrapper">
+                <table className="premium-data-table">
+                    <tbody>
+                        {filteredRows.map((row, idx) => (
+                            <tr key={idx} className="table-data-row">
+                                {row.map((cell, i) => (
+                                    <td key={i} className={idx === 0 ? "table-header-cell" : "table-value-cell"}>
+                                        {renderFormattedText(cell, true)}
+                                    </td>
+                                ))}
+                            </tr>
+                        ))}
+                    </tbody>
+                </table>
+            </div>
+        );
+    };
+
+    const renderGenericTable = (text, filterQuery = '', parsedTable = null) => {
+        if (parsedTable) return renderTableRows([parsedTable.columns, ...parsedTable.rows], filterQuery);
         if (!text) return null;
         let processedText = String(text).replace(/\\n/g, '\n');
         const lines = processedText.split('\n').map(l => l.trim()).filter(l => l.length > 0);
@@ -151,36 +202,7 @@ const Opportunities = () => {
                 }
             }
 
-            // FILTER ROWS based on query
-            const filteredRows = filterQuery
-                ? rows.filter(row => row.some(cell => cell.toLowerCase().includes(filterQuery.toLowerCase())))
-                : rows;
-
-            if (filteredRows.length === 0 && filterQuery) {
-                return (
-                    <div className="no-search-results" style={{ padding: '2rem', textAlign: 'center', color: 'var(--text-light)', border: '1px dashed var(--border)', borderRadius: '8px' }}>
-                        No matches found for "{filterQuery}"
-                    </div>
-                );
-            }
-
-            return (
-                <div className="premium-table-wrapper">
-                    <table className="premium-data-table">
-                        <tbody>
-                            {filteredRows.map((row, idx) => (
-                                <tr key={idx} className="table-data-row">
-                                    {row.map((cell, i) => (
-                                        <td key={i} className={idx === 0 ? "table-header-cell" : "table-value-cell"}>
-                                            {renderFormattedText(cell, true)}
-                                        </td>
-                                    ))}
-                                </tr>
-                            ))}
-                        </tbody>
-                    </table>
-                </div>
-            );
+            return renderTableRows(rows, filterQuery);
         }
 
         return renderFormattedText(text);
@@ -500,6 +522,59 @@ const Opportunities = () => {
         );
     };
 
+    // Sections as rendered by the backend (see jobs/rendering.py): typed lines, or a
+    // parsed table. Until the detail response arrives the raw text is rendered instead.
+    const renderSection = (section) => {
+        if (!selectedJob.rendered) return renderKeyDataTable(selectedJob[section]);
+        const rendered = selectedJob.rendered[section];
+        if (!rendered) return null;
+
+        const lines = rendered.type === 'table'
+            ? [
+                { type: 'heading', cells: rendered.columns },
+                ...rendered.rows.map(cells => ({ type: 'pair', label: cells[0], value: cells.slice(1).join(' ') })),
+            ]
+            : rendered.lines;
+
+        return (
+            <div className="premium-table-wrapper">
+                <table className="premium-data-table">
+                    <tbody>
+                        {lines.map((line, index) => {
+                            if (line.type === 'heading') {
+                                return (
+                                    <tr key={index} className="table-header-row">
+                                        {line.cells.map((cell, i) => (
+                                            <td key={i} className="table-header-cell" colSpan={line.cells.length === 1 ? "2" : "1"}>
+                                                {cell}
+                                            </td>
+                                        ))}
+                                    </tr>
+                                );
+                            }
+                            if (line.type === 'pair') {
+                                return (
+                                    <tr key={index} className="table-data-row">
+                                        <td className="table-label-cell">{line.label}</td>
+                                        <td className="table-value-cell">{renderFormattedText(line.value, true)}</td>
+                                    </tr>
+                                );
+                            }
+                            return (
+                                <tr key={index} className="table-data-row">
+                                    <td colSpan="2" className="table-full-cell">
+                                        {line.bullet && <span className="bullet-dot">•</span>}
+                                        {renderFormattedText(line.text, true)}
+                                    </td>
+                                </tr>
+                            );
+                        })}
+                    </tbody>
+                </table>
+            </div>
+        );
+    };
+
     const renderFormattedText = (text, forceNormal = false) => {
         if (!text) return null;
 
@@ -576,6 +651,29 @@ const Opportunities = () => {
         fetchJobs();
     }, []);
 
+    // Live hiring status / activation changes from other recruiters
+    // (EventSource reconnects by itself and resumes from the last event id)
+    useEffect(() => {
+        const source = new EventSource(`${API_URL}events/`);
+        source.addEventListener('jobs', (e) => {
+            const { jobs: changed, deleted } = JSON.parse(e.data);
+            // New or reactivated jobs: reload the board so they appear with the current search
+            const onBoard = new Set(jobsRef.current.map(j => j.id));
+            if (changed.some(j => j.is_active && !onBoard.has(j.id))) {
+                fetchJobs(searchZipRef.current, true);
+                return;
+            }
+            const byId = new Map(changed.map(j => [j.id, j]));
+            const removed = new Set([...deleted, ...changed.filter(j => !j.is_active).map(j => j.id)]);
+            setJobs(prevJobs => prevJobs
+                .filter(j => !removed.has(j.id))
+                .map(j => byId.has(j.id) ? { ...j, hiring_status: byId.get(j.id).hiring_status } : j)
+            );
+        });
+        source.addEventListener('reload', () => fetchJobs(searchZipRef.current, true));
+        return () => source.close();
+    }, []);
+
     // Close dropdown when clicking outside
     useEffect(() => {
         const handleClickOutside = () => {
@@ -736,25 +834,25 @@ const Opportunities = () => {
                                 <div className="tab-pane-container">
                                     {activeTab === 'description' && (
                                         <div className="job-summary-container">
-                                            {renderKeyDataTable(selectedJob.job_details)}
+                                            {renderSection('job_details')}
                                         </div>
                                     )}
 
                                     {activeTab === 'pay' && (
                                         <div className="job-summary-container">
-                                            {renderKeyDataTable(selectedJob.pay_details)}
+                                            {renderSection('pay_details')}
                                         </div>
                                     )}
 
                                     {activeTab === 'equipment' && (
                                         <div className="job-summary-container">
-                                            {renderKeyDataTable(selectedJob.equipment_details)}
+                                            {renderSection('equipment_details')}
                                         </div>
                                     )}
 
                                     {activeTab === 'disqualifiers' && (
                                         <div className="job-summary-container">
-                                            {renderKeyDataTable(selectedJob.key_disqualifiers)}
+                                            {renderSection('key_disqualifiers')}
                                         </div>
                                     )}
 
@@ -797,7 +895,7 @@ const Opportunities = () => {
 
                                     {activeTab === 'requirements' && (
                                         <div className="job-summary-container">
-                                            {renderKeyDataTable(selectedJob.requirements_details)}
+                                            {renderSection('requirements_details')}
                                         </div>
                                     )}
 
@@ -883,12 +981,12 @@ const Opportunities = () => {
                                     <div className="lane-section">
                                         {carrierInfoPanel.type === 'presentation' && carrierInfoPanel.job.carrier?.presentation && (
                                             <div className="lane-section-content">
-                                                {renderGenericTable(carrierInfoPanel.job.carrier.presentation, carrierSearchQuery)}
+                                                {renderGenericTable(carrierInfoPanel.job.carrier.presentation, carrierSearchQuery, carrierInfoPanel.job.carrier.parsed_tables?.presentation)}
                                             </div>
                                         )}
                                         {carrierInfoPanel.type === 'pre_qualifications' && carrierInfoPanel.job.carrier?.pre_qualifications && (
                                             <div className="lane-section-content">
-                                                {renderGenericTable(carrierInfoPanel.job.carrier.pre_qualifications, carrierSearchQuery)}
+                                                {renderGenericTable(carrierInfoPanel.job.carrier.pre_qualifications, carrierSearchQuery, carrierInfoPanel.job.carrier.parsed_tables?.pre_qualifications)}
                                             </div>
                                         )}
                                         {carrierInfoPanel.type === 'app_process' && carrierInfoPanel.job.carrier?.app_process && (